@@ -13,4 +13,43 @@ NUMS = list('0123456789')
 
 VAR_ALLOWED = ALPHA + NUMS + ['_']
 
-MAX_RECURSION_DEPTH = 2048
\ No newline at end of file
+# Set versions of the character groups above for the lexer, which tests
+# membership once per character of the source
+
+WHITESPACE_CHARS = frozenset(WHITESPACE)
+QUOTE_CHARS = frozenset(QUOTES)
+OPENING_CHARS = frozenset(OPENING_GROUPINGS)
+CLOSING_CHARS = frozenset(CLOSING_GROUPINGS)
+NEWLINE_CHARS = frozenset(NEWLINES)
+SEPARATOR_CHARS = frozenset(",;")
+
+# Characters that end a free type token, even without whitespace
+
+FREE_TYPE_END_CHARS = WHITESPACE_CHARS | OPENING_CHARS | CLOSING_CHARS | SEPARATOR_CHARS
+
+MAX_RECURSION_DEPTH = 2048
+
+# Python recursion limit used while compiling or running code recursively
+# (as the closure and bytecode evaluators do), which needs several
+# Python frames for every level of nesting in a script
+
+DEEP_RECURSION_LIMIT = 100000
+
+# Number of iterations a loop runs on the evaluation stack before
+# the tiered evaluator compiles it (see `TieredEvaluator`)
+
+HOT_LOOP_THRESHOLD = 1000
+
+# Shortest list that's stored as a packed array of numbers (see `ListValue`)
+# Shorter lists (like most argument lists) aren't worth packing
+
+PACKED_LIST_MIN_LENGTH = 16
+
+# Default limit for how deeply groups can be nested in the parser
+
+MAX_NESTING_DEPTH = 4096
+
+# Should be increased whenever a change to the parser or AST classes
+# makes previously cached ASTs invalid
+
+AST_CACHE_VERSION = 2
\ No newline at end of file
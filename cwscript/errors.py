@@ -54,6 +54,13 @@ class CWMiscError (CWError):
 
         super().__init__("Error", message, line)
 
+# Raised by an engine for code it can't compile,
+# so that the code can be run by another engine instead
+
+class UnsupportedError (Exception):
+
+    pass
+
 # A special error that will be caught by the evaluator
 # and raised as an exception the user can catch
 
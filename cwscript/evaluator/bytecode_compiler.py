@@ -0,0 +1,570 @@
+from operator import add, sub, mul, lt, gt, le, ge, eq, ne
+
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.parser.ast import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+
+# Compiles the AST into a flat list of instructions for `BytecodeEvaluator`
+# Every expression pushes exactly one value onto the operand stack, like
+# request_value() produces exactly one value for its operation
+
+# Each instruction is a tuple of (opcode, argument, line), where the line is where
+# errors are reported, the same as the line of the operation that would be on
+# top of the stack in `CodeEvaluator`
+
+# Loops, short-circuit operators and if statements are compiled into jumps
+# `break`, `continue` and returning from an object are resolved at compile time
+# into jumps that also drop anything their enclosing expressions had pushed
+# Exceptions use a table of handlers for each try/catch instead
+
+# Built-in operations are run through their _finish() (or evaluate_and_check()
+# for single-step operations), using one instance created per node at compile time
+
+LOAD_CONST = 0
+LOAD_LOCAL = 1
+LOAD_VARIABLE = 2
+LOAD_REFERENCE = 3
+CHECK_TYPE = 4
+POP = 5
+JUMP = 6
+JUMP_IF_FALSE = 7
+JUMP_OUT = 8
+TO_BOOL = 9
+BUILD_LIST = 10
+CALL_OPERATION = 11
+RUN_OPERATION = 12
+BINARY_OPERATION = 13
+COMPARE = 14
+STORE_LOCAL = 15
+COMPOUND_LOCAL = 16
+FOR_SETUP = 17
+FOR_NEXT = 18
+FOR_END = 19
+BIND_ERROR = 20
+NEW_OBJECT = 21
+END_OBJECT = 22
+CALL_FUNCTION = 23
+RETURN = 24
+END_FUNCTION = 25
+THROW = 26
+INVALID = 27
+INVALID_IN_FUNCTION = 28
+HALT = 29
+TAIL_CALL = 30
+
+OPCODE_NAMES = [
+	'LOAD_CONST', 'LOAD_LOCAL', 'LOAD_VARIABLE', 'LOAD_REFERENCE', 'CHECK_TYPE', 'POP', 'JUMP',
+	'JUMP_IF_FALSE', 'JUMP_OUT', 'TO_BOOL', 'BUILD_LIST', 'CALL_OPERATION', 'RUN_OPERATION',
+	'BINARY_OPERATION', 'COMPARE', 'STORE_LOCAL', 'COMPOUND_LOCAL', 'FOR_SETUP', 'FOR_NEXT',
+	'FOR_END', 'BIND_ERROR', 'NEW_OBJECT', 'END_OBJECT', 'CALL_FUNCTION', 'RETURN', 'END_FUNCTION',
+	'THROW', 'INVALID', 'INVALID_IN_FUNCTION', 'HALT', 'TAIL_CALL'
+]
+
+# How many values each instruction adds to (or removes from) the operand stack
+# Instructions that take a variable number of values aren't listed
+
+_STACK_EFFECTS = {
+	LOAD_CONST: 1, LOAD_LOCAL: 1, LOAD_VARIABLE: 1, LOAD_REFERENCE: 1, CHECK_TYPE: 0, POP: -1,
+	JUMP: 0, JUMP_IF_FALSE: -1, JUMP_OUT: 0, TO_BOOL: 0, RUN_OPERATION: 1, BINARY_OPERATION: -1,
+	COMPARE: -1, STORE_LOCAL: 0, COMPOUND_LOCAL: 0, FOR_SETUP: -1, FOR_NEXT: 0, FOR_END: 0,
+	BIND_ERROR: -1, NEW_OBJECT: 1, END_OBJECT: 0, CALL_FUNCTION: -1, RETURN: -1, END_FUNCTION: -1,
+	THROW: -1, INVALID: 0, INVALID_IN_FUNCTION: 0, HALT: -1, TAIL_CALL: -2
+}
+
+_SINGLE_STEP_OPERATIONS = frozenset([
+	LocalScopeStatement, GlobalScopeStatement, FunctionStatement, LambdaStatement, RNGGetStatement,
+	RNGResetStatement, RandomFloatStatement, PiStatement, EulerStatement
+])
+
+_ARITHMETIC = {
+	OperatorAdd: add,
+	OperatorSubtract: sub,
+	OperatorMultiply: mul
+}
+
+_COMPARISONS = {
+	OperatorLess: lt,
+	OperatorGreater: gt,
+	OperatorLessEqual: le,
+	OperatorGreaterEqual: ge,
+	OperatorEqual: eq,
+	OperatorUnequal: ne
+}
+
+_COMPOUND_ASSIGNMENTS = {
+	OperatorAssignAdd: add,
+	OperatorAssignSubtract: sub,
+	OperatorAssignMultiply: mul
+}
+
+# A compiled statement or function body
+# Handlers are (start, end, target, depth, objects): exceptions raised by instructions
+# in [start, end) jump to `target` after the operand stack is cut back to `depth`
+# and any scopes from objects created since the frame started beyond `objects` are removed
+# Inner handlers come before outer ones
+
+class Bytecode:
+
+	def __init__(self, instructions, handlers):
+
+		self.instructions = instructions
+		self.handlers = handlers
+
+# Where `break` and `continue` go
+
+class _LoopContext:
+
+	def __init__(self, depth):
+
+		self.depth = depth
+		self.continues = []
+		self.breaks = []
+
+# `break` and `continue` can't pass through try/catch or objects
+# Objects also catch `return`, jumping to the end of their body
+
+class _BarrierContext:
+
+	def __init__(self, line):
+
+		self.line = line
+
+class _ObjectContext (_BarrierContext):
+
+	def __init__(self, line, depth):
+
+		super().__init__(line)
+		self.depth = depth
+		self.returns = []
+
+class BytecodeCompiler:
+
+	def __init__(self, evaluator):
+
+		self._evaluator = evaluator
+
+	# Top-level statements are compiled separately, so they can be run one at a time
+
+	def compile_statement(self, node):
+
+		self._start(False)
+		self._compile(node, ScriptValue, True, node.get_line())
+		self._emit(HALT, None, node.get_line())
+		return Bytecode(self._instructions, self._handlers)
+
+	# Function bodies finish with a null value unless they return something else
+	# `line` is the line of the call, which is where errors in the body itself are reported
+
+	def compile_function(self, body, line):
+
+		self._start(True)
+		self._compile(body, ScriptValue, True, line)
+		self._emit(END_FUNCTION, None, line)
+		return Bytecode(self._instructions, self._handlers)
+
+	def _start(self, in_function):
+
+		self._instructions = []
+		self._handlers = []
+		self._contexts = []
+		self._depth = 0
+		self._objects = 0
+		self._in_function = in_function
+
+	# Adds an instruction and returns its index, so jumps can be patched once their target is known
+	# `effect` overrides the stack effect for instructions that take a variable number of values
+
+	def _emit(self, opcode, arg, line, effect = None):
+
+		self._instructions.append((opcode, arg, line))
+		self._depth += _STACK_EFFECTS[opcode] if (effect is None) else effect
+		return len(self._instructions) - 1
+
+	def _patch(self, index, arg):
+
+		opcode, _, line = self._instructions[index]
+		self._instructions[index] = (opcode, arg, line)
+
+	def _patch_jumps(self, indices, target, depth):
+
+		for index in indices:
+			self._patch(index, (target, depth))
+
+	# Only needed when the output isn't always of the requested type
+
+	def _check_type(self, output_type, value_type, line):
+
+		if (not issubclass(output_type, value_type)):
+			self._emit(CHECK_TYPE, value_type, line)
+
+	# `line` is the line of the operation requesting the value,
+	# which is where errors are reported if the node isn't an operation
+
+	def _compile(self, node, value_type, eval_vars, line):
+
+		if (isinstance(node, ASTOperation)):
+			operation = node.get_operation()
+			if (operation in _OPERATION_COMPILERS):
+				_OPERATION_COMPILERS[operation](self, node, value_type, eval_vars)
+			elif (operation in _SINGLE_STEP_OPERATIONS):
+				prototype = node.evaluate(self._evaluator, value_type, eval_vars)
+				self._emit(RUN_OPERATION, prototype.evaluate_and_check, node.get_line())
+			elif (issubclass(operation, StackBasicOperation)):
+				self._compile_basic(node, value_type, eval_vars)
+			else:
+				raise RuntimeError(f"Bytecode compiler does not support {operation.__name__}")
+			return
+
+		dtype = node.get_dtype()
+		if (dtype == ASTNode.TYPE_BLOCK):
+			self._compile_block(node, value_type)
+		elif (dtype == ASTNode.TYPE_LIST):
+			self._compile_list(node, value_type)
+		elif (dtype == ASTNode.TYPE_VARIABLE):
+			self._compile_variable(node, value_type, eval_vars, line)
+		else:
+			value = node.evaluate(self._evaluator, ScriptValue, True)
+			self._emit(LOAD_CONST, value, line)
+			self._check_type(type(value), value_type, line)
+
+	# VALUES
+
+	def _compile_variable(self, node, value_type, eval_vars, line):
+
+		is_global, fields = node.get_value()
+		if (not eval_vars):
+			self._emit(LOAD_REFERENCE, (is_global, fields), line)
+			self._check_type(VariableValue, value_type, line)
+			return
+		if (not is_global and len(fields) == 1):
+			self._emit(LOAD_LOCAL, fields[0], line)
+		else:
+			self._emit(LOAD_VARIABLE, (is_global, fields), line)
+		self._check_type(ScriptValue, value_type, line)
+
+	# A block reports the line of the last statement it ran
+
+	def _compile_block(self, node, value_type):
+
+		for child in node.get_value():
+			self._compile(child, ScriptValue, True, child.get_line())
+			self._emit(POP, None, child.get_line())
+		line = node.get_value()[-1].get_line() if (node.get_value()) else node.get_line()
+		self._emit(LOAD_CONST, NullValue(self._evaluator), line)
+		self._check_type(NullValue, value_type, line)
+
+	def _compile_list(self, node, value_type):
+
+		line = node.get_line()
+		for child in node.get_value():
+			self._compile(child, ScriptValue, True, line)
+		count = len(node.get_value())
+		self._emit(BUILD_LIST, count, line, 1 - count)
+		self._check_type(ListValue, value_type, line)
+
+	# OPERATIONS
+
+	def _compile_args(self, node, prototype):
+
+		requests = prototype.get_arg_requests()
+		for request in requests:
+			self._compile(node.get_args()[request.name], request.value_type, request.eval_vars, node.get_line())
+		return len(requests)
+
+	def _compile_basic(self, node, value_type, eval_vars):
+
+		prototype = node.evaluate(self._evaluator, value_type, eval_vars)
+		count = self._compile_args(node, prototype)
+		self._emit(CALL_OPERATION, (prototype._finish, count, value_type, eval_vars), node.get_line(), 1 - count)
+
+	# Arithmetic and comparisons have a shortcut for plain numbers
+	# Anything else goes through the operation's own _finish()
+
+	def _compile_arithmetic(self, node, value_type, eval_vars):
+
+		prototype = node.evaluate(self._evaluator, value_type, eval_vars)
+		self._compile_args(node, prototype)
+		function = _ARITHMETIC[node.get_operation()]
+		self._emit(BINARY_OPERATION, (function, prototype._finish, value_type), node.get_line())
+
+	def _compile_comparison(self, node, value_type, eval_vars):
+
+		prototype = node.evaluate(self._evaluator, value_type, eval_vars)
+		self._compile_args(node, prototype)
+		function = _COMPARISONS[node.get_operation()]
+		self._emit(COMPARE, (function, prototype._finish, value_type), node.get_line())
+
+	# Returns the name of a variable in the current scope, or None for anything else
+
+	def _get_local_name(self, node):
+
+		if (isinstance(node, ASTValue) and node.get_dtype() == ASTNode.TYPE_VARIABLE):
+			is_global, fields = node.get_value()
+			if (not is_global and len(fields) == 1):
+				return fields[0]
+		return None
+
+	def _compile_assign(self, node, value_type, eval_vars):
+
+		name = self._get_local_name(node.get_args()['op_1'])
+		if (name is None):
+			return self._compile_basic(node, value_type, eval_vars)
+		line = node.get_line()
+		self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+		self._emit(STORE_LOCAL, (name, [name], eval_vars), line)
+		self._check_type(ScriptValue if (eval_vars) else VariableValue, value_type, line)
+
+	def _compile_compound_assign(self, node, value_type, eval_vars):
+
+		name = self._get_local_name(node.get_args()['op_1'])
+		if (name is None):
+			return self._compile_basic(node, value_type, eval_vars)
+		prototype = node.evaluate(self._evaluator, value_type, eval_vars)
+		request = prototype.get_arg_requests()[1]
+		line = node.get_line()
+		self._compile(node.get_args()['op_2'], request.value_type, request.eval_vars, line)
+		function = _COMPOUND_ASSIGNMENTS[node.get_operation()]
+		self._emit(COMPOUND_LOCAL, (name, [name], function, prototype._finish, eval_vars), line)
+		self._check_type(ScriptValue if (eval_vars) else VariableValue, value_type, line)
+
+	# CONTROL FLOW
+
+	# `&&` and `||` skip the second operand, leaving the result of the first
+
+	def _compile_and(self, node, value_type, eval_vars):
+
+		self._compile_short_circuit(node, value_type, False)
+
+	def _compile_or(self, node, value_type, eval_vars):
+
+		self._compile_short_circuit(node, value_type, True)
+
+	def _compile_short_circuit(self, node, value_type, is_or):
+
+		line = node.get_line()
+		depth = self._depth
+		self._compile(node.get_args()['op_1'], ScriptValue, True, line)
+		skip = self._emit(JUMP_IF_FALSE, None, line)
+		if (is_or):
+			self._emit(LOAD_CONST, BoolValue(self._evaluator, True), line)
+			end = self._emit(JUMP, None, line)
+			self._patch(skip, len(self._instructions))
+			self._depth = depth
+			self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+			self._emit(TO_BOOL, None, line)
+		else:
+			self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+			self._emit(TO_BOOL, None, line)
+			end = self._emit(JUMP, None, line)
+			self._patch(skip, len(self._instructions))
+			self._depth = depth
+			self._emit(LOAD_CONST, BoolValue(self._evaluator, False), line)
+		self._patch(end, len(self._instructions))
+		self._check_type(BoolValue, value_type, line)
+
+	def _compile_if(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		depth = self._depth
+		self._compile(node.get_args()['condition'], ScriptValue, True, line)
+		skip = self._emit(JUMP_IF_FALSE, None, line)
+		self._compile(node.get_args()['body'], ScriptValue, True, line)
+		self._emit(POP, None, line)
+		self._emit(LOAD_CONST, BoolValue(self._evaluator, True), line)
+		end = self._emit(JUMP, None, line)
+		self._patch(skip, len(self._instructions))
+		self._depth = depth
+		self._emit(LOAD_CONST, BoolValue(self._evaluator, False), line)
+		self._patch(end, len(self._instructions))
+		self._check_type(BoolValue, value_type, line)
+
+	# The result (whether the body ran) is kept under the loop on the operand stack
+	# After a break, the condition is still checked one last time before the loop exits
+
+	def _compile_while(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		condition = node.get_args()['condition']
+		self._emit(LOAD_CONST, BoolValue(self._evaluator, False), line)
+		depth = self._depth
+		start = len(self._instructions)
+		self._compile(condition, ScriptValue, True, line)
+		exit = self._emit(JUMP_IF_FALSE, None, line)
+		self._emit(POP, None, line)
+		self._emit(LOAD_CONST, BoolValue(self._evaluator, True), line)
+
+		loop = _LoopContext(depth)
+		self._contexts.append(loop)
+		self._compile(node.get_args()['body'], ScriptValue, True, line)
+		self._contexts.pop()
+		self._emit(POP, None, line)
+		self._emit(JUMP, start, line)
+
+		self._patch_jumps(loop.continues, start, depth)
+		if (loop.breaks):
+			self._patch_jumps(loop.breaks, len(self._instructions), depth)
+			self._compile(condition, ScriptValue, True, line)
+			self._emit(POP, None, line)
+		self._patch(exit, len(self._instructions))
+		self._check_type(BoolValue, value_type, line)
+
+	# The loop's state is kept on the operand stack while the body runs,
+	# and is replaced with the result once it finishes
+
+	def _compile_for(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		self._compile(node.get_args()['iterator'], VariableValue, False, line)
+		self._compile(node.get_args()['list'], ListValue, True, line)
+		self._emit(FOR_SETUP, None, line)
+		depth = self._depth
+		start = self._emit(FOR_NEXT, None, line)
+
+		loop = _LoopContext(depth)
+		self._contexts.append(loop)
+		self._compile(node.get_args()['body'], ScriptValue, True, line)
+		self._contexts.pop()
+		self._emit(POP, None, line)
+		self._emit(JUMP, start, line)
+
+		self._patch_jumps(loop.continues, start, depth)
+		if (loop.breaks):
+			self._patch_jumps(loop.breaks, len(self._instructions), depth)
+			self._emit(FOR_END, None, line)
+		self._patch(start, len(self._instructions))
+		self._check_type(BoolValue, value_type, line)
+
+	# Only the body is covered by the handler, so errors in the catch body aren't caught
+
+	def _compile_try_catch(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		depth = self._depth
+		self._contexts.append(_BarrierContext(line))
+		start = len(self._instructions)
+		self._compile(node.get_args()['body'], ScriptValue, True, line)
+		self._emit(POP, None, line)
+		end = len(self._instructions)
+		self._emit(LOAD_CONST, BoolValue(self._evaluator, True), line)
+		skip = self._emit(JUMP, None, line)
+
+		target = len(self._instructions)
+		self._depth = depth + 1
+		self._emit(BIND_ERROR, node.get_args()['error'], line)
+		self._compile(node.get_args()['catch_body'], ScriptValue, True, line)
+		self._emit(POP, None, line)
+		self._emit(LOAD_CONST, BoolValue(self._evaluator, False), line)
+		self._contexts.pop()
+
+		self._patch(skip, len(self._instructions))
+		self._handlers.append((start, end, target, depth, self._objects))
+		self._check_type(BoolValue, value_type, line)
+
+	# Function calls run in a new frame, which checks the returned value
+
+	def _compile_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		self._compile(node.get_args()['function'], FunctionValue, True, line)
+		self._compile(node.get_args()['args'], ListValue, True, line)
+		self._emit(CALL_FUNCTION, (value_type, eval_vars), line)
+
+	# A tail call replaces the frame that's running (see `FusedTailCall`), so it never
+	# comes back, and is only ever found in a function body (see `operation_fuser`)
+
+	def _compile_tail_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		self._compile(node.get_args()['function'], FunctionValue, True, line)
+		self._compile(node.get_args()['args'], ListValue, True, line)
+		self._emit(TAIL_CALL, None, line)
+		self._depth += 1
+
+	def _compile_new_object(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		self._emit(NEW_OBJECT, None, line)
+		context = _ObjectContext(line, self._depth)
+		self._contexts.append(context)
+		self._objects += 1
+		self._compile(node.get_args()['body'], ScriptValue, True, line)
+		self._emit(POP, None, line)
+		self._objects -= 1
+		self._contexts.pop()
+		self._patch_jumps(context.returns, len(self._instructions), context.depth)
+		self._emit(END_OBJECT, None, line)
+		self._check_type(ObjectValue, value_type, line)
+
+	# Interrupts that pass through a function call are only an error
+	# once they reach the call, so they're reported at its line
+
+	def _compile_continue(self, node, value_type, eval_vars):
+
+		self._compile_loop_jump(node, "Invalid use of continue", lambda loop: loop.continues)
+
+	def _compile_break(self, node, value_type, eval_vars):
+
+		self._compile_loop_jump(node, "Invalid use of break", lambda loop: loop.breaks)
+
+	def _compile_loop_jump(self, node, message, get_jumps):
+
+		line = node.get_line()
+		if (not self._contexts):
+			self._emit(INVALID_IN_FUNCTION if (self._in_function) else INVALID, message, line)
+		elif (isinstance(self._contexts[-1], _LoopContext)):
+			get_jumps(self._contexts[-1]).append(self._emit(JUMP_OUT, None, line))
+		else:
+			self._emit(INVALID, message, self._contexts[-1].line)
+		self._depth += 1
+
+	def _compile_return(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		self._compile(node.get_args()['value'], ScriptValue, True, line)
+		for context in reversed(self._contexts):
+			if (isinstance(context, _ObjectContext)):
+				context.returns.append(self._emit(JUMP_OUT, None, line))
+				return
+		if (self._in_function):
+			self._emit(RETURN, None, line)
+			self._depth += 1
+		else:
+			self._emit(INVALID, "Invalid use of return", line)
+
+	def _compile_throw(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		self._compile(node.get_args()['exception'], ObjectValue, True, line)
+		self._emit(THROW, None, line)
+		self._depth += 1
+
+_OPERATION_COMPILERS = {
+	OperatorAssign: BytecodeCompiler._compile_assign,
+	OperatorAssignAdd: BytecodeCompiler._compile_compound_assign,
+	OperatorAssignSubtract: BytecodeCompiler._compile_compound_assign,
+	OperatorAssignMultiply: BytecodeCompiler._compile_compound_assign,
+	OperatorAdd: BytecodeCompiler._compile_arithmetic,
+	OperatorSubtract: BytecodeCompiler._compile_arithmetic,
+	OperatorMultiply: BytecodeCompiler._compile_arithmetic,
+	OperatorLess: BytecodeCompiler._compile_comparison,
+	OperatorGreater: BytecodeCompiler._compile_comparison,
+	OperatorLessEqual: BytecodeCompiler._compile_comparison,
+	OperatorGreaterEqual: BytecodeCompiler._compile_comparison,
+	OperatorEqual: BytecodeCompiler._compile_comparison,
+	OperatorUnequal: BytecodeCompiler._compile_comparison,
+	OperatorAnd: BytecodeCompiler._compile_and,
+	OperatorOr: BytecodeCompiler._compile_or,
+	IfStatement: BytecodeCompiler._compile_if,
+	WhileLoopStatement: BytecodeCompiler._compile_while,
+	ForLoopStatement: BytecodeCompiler._compile_for,
+	TryCatchStatement: BytecodeCompiler._compile_try_catch,
+	CallStatement: BytecodeCompiler._compile_call,
+	NewObjectStatement: BytecodeCompiler._compile_new_object,
+	ContinueStatement: BytecodeCompiler._compile_continue,
+	BreakStatement: BytecodeCompiler._compile_break,
+	ReturnStatement: BytecodeCompiler._compile_return,
+	ThrowStatement: BytecodeCompiler._compile_throw,
+	FusedTailCall: BytecodeCompiler._compile_tail_call
+}
\ No newline at end of file
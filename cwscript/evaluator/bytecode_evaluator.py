@@ -0,0 +1,380 @@
+from itertools import repeat
+
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+from cwscript.evaluator.compiled_evaluator import CompiledEvaluator, _ExceptionSignal
+from cwscript.evaluator.bytecode_compiler import *
+
+# Thrown exceptions are passed to the dispatch loop as an `_ExceptionSignal`,
+# so they're handled the same way as a CatchableError from a built-in
+
+# A function call in progress, or the top-level statement being run
+# `scope_base` is how many scopes there were once the frame started, and
+# the rest are what a call needs to check the returned value
+# `line` is where errors in the body itself are reported, which is the line of
+# the tail call for a frame that replaced another, while `call_line` is always
+# the line of the call that the value is returned to
+
+class _Frame:
+
+	def __init__(self, code, scope_base, line, value_type, eval_vars):
+
+		self.code = code
+		self.stack = []
+		self.pc = 0
+		self.scope_base = scope_base
+		self.line = line
+		self.call_line = line
+		self.value_type = value_type
+		self.eval_vars = eval_vars
+
+# An alternative to `CodeEvaluator` that compiles the AST into bytecode (see `bytecode_compiler`)
+# and runs it in a single dispatch loop with an operand stack
+# Function calls push a new frame instead of recursing, so deeply recursive
+# scripts don't use up the Python stack
+
+# Top-level statements are run one at a time by run_next(), or in batches by run_steps()
+# Function bodies are compiled the first time they're called
+
+class BytecodeEvaluator (CompiledEvaluator):
+
+	def __init__(self, root):
+
+		self._main = root
+		self._line = root.get_line()
+		self._last_value = None
+		self._scopes = [ObjectValue(self)]
+		self._rng = self.get_seed()
+		self._frames = []
+		self._compiler = BytecodeCompiler(self)
+		self._functions = {}
+		self._statements = self._run_deep(self._compile_root, root)
+		self._pc = 0
+
+	def _compile_root(self, root):
+
+		return [self._compiler.compile_statement(node) for node in root.get_children()]
+
+	def _get_function(self, body, line):
+
+		key = (body, line)
+		if (key not in self._functions):
+			self._functions[key] = self._run_deep(lambda body: self._compiler.compile_function(body, line), body)
+		return self._functions[key]
+
+	# Compiling is recursive, but running isn't, so only compiling needs `_run_deep()`
+	# Each step is a whole top-level statement
+
+	def run_steps(self, steps):
+
+		statements = self._statements
+		for step in (repeat(None) if (steps is None) else range(steps)):
+			if (self._pc >= len(statements)):
+				break
+			code = statements[self._pc]
+			self._pc += 1
+			self._frames = [_Frame(code, len(self._scopes), self._line, ScriptValue, True)]
+			self._last_value = self._execute()
+		return self._pc < len(statements)
+
+	def get_line(self):
+
+		return self._line
+
+	def request_value(self, node, value_type, eval_vars = True):
+
+		raise RuntimeError("Bytecode evaluator cannot request values")
+
+	def raise_interrupt(self, interrupt):
+
+		if (not isinstance(interrupt, ExceptionInterrupt)):
+			raise RuntimeError("Bytecode evaluator can only raise exceptions")
+		raise _ExceptionSignal(interrupt)
+
+	def handle_interrupt(self):
+
+		pass
+
+	# Runs instructions until the current top-level statement finishes
+	# The frame, its instructions, operand stack and program counter are kept in locals,
+	# and stored back in the frame whenever a call or exception switches frames
+	# `_line` is set before anything that could raise an error
+
+	def _execute(self):
+
+		scopes = self._scopes
+		frames = self._frames
+		frame = frames[-1]
+		instructions = frame.code.instructions
+		stack = frame.stack
+		pc = frame.pc
+
+		while (True):
+			opcode, arg, line = instructions[pc]
+			pc += 1
+			try:
+
+				if (opcode == LOAD_LOCAL):
+					self._line = line
+					stack.append(scopes[-1].get_field(self, arg))
+
+				elif (opcode == LOAD_CONST):
+					stack.append(arg)
+
+				elif (opcode == POP):
+					stack.pop()
+
+				elif (opcode == BINARY_OPERATION):
+					function, finish, value_type = arg
+					value_2 = stack.pop()
+					value_1 = stack.pop()
+					if (type(value_1) is IntValue and type(value_2) is IntValue):
+						output = IntValue(self, function(value_1.get_value(), value_2.get_value()))
+					else:
+						self._line = line
+						output = finish(self, [value_1, value_2])
+					if (not isinstance(output, value_type)):
+						self._line = line
+						self.assert_type(output, value_type)
+					stack.append(output)
+
+				elif (opcode == COMPARE):
+					function, finish, value_type = arg
+					value_2 = stack.pop()
+					value_1 = stack.pop()
+					if (type(value_1) in _PLAIN_NUMBERS and type(value_2) in _PLAIN_NUMBERS):
+						output = BoolValue(self, function(value_1.get_value(), value_2.get_value()))
+					else:
+						self._line = line
+						output = finish(self, [value_1, value_2])
+					if (not isinstance(output, value_type)):
+						self._line = line
+						self.assert_type(output, value_type)
+					stack.append(output)
+
+				elif (opcode == JUMP_IF_FALSE):
+					if (not stack.pop().to_bool(self)):
+						pc = arg
+
+				elif (opcode == JUMP):
+					pc = arg
+
+				elif (opcode == CALL_OPERATION):
+					finish, count, value_type, eval_vars = arg
+					if (count):
+						args = stack[-count:]
+						del stack[-count:]
+					else:
+						args = []
+					self._line = line
+					output = finish(self, args)
+					if (eval_vars and isinstance(output, VariableValue)):
+						output = output.get_var_value(self)
+					if (not isinstance(output, value_type)):
+						self.assert_type(output, value_type)
+					stack.append(output)
+
+				elif (opcode == STORE_LOCAL):
+					name, fields, eval_vars = arg
+					scope = scopes[-1]
+					scope.set_field(self, name, stack[-1])
+					if (not eval_vars):
+						stack[-1] = VariableValue(self, scope, fields)
+
+				elif (opcode == COMPOUND_LOCAL):
+					name, fields, function, finish, eval_vars = arg
+					value_2 = stack.pop()
+					self._line = line
+					scope = scopes[-1]
+					value_1 = scope.get_field(self, name)
+					if (type(value_1) is IntValue and type(value_2) is IntValue):
+						scope.set_field(self, name, IntValue(self, function(value_1.get_value(), value_2.get_value())))
+					else:
+						finish(self, [VariableValue(self, scope, fields), value_2])
+					stack.append(scope.get_field(self, name) if (eval_vars) else VariableValue(self, scope, fields))
+
+				elif (opcode == LOAD_VARIABLE):
+					self._line = line
+					is_global, fields = arg
+					parent = scopes[0] if (is_global) else scopes[-1]
+					stack.append(VariableValue(self, parent, fields).get_var_value(self))
+
+				elif (opcode == LOAD_REFERENCE):
+					is_global, fields = arg
+					parent = scopes[0] if (is_global) else scopes[-1]
+					stack.append(VariableValue(self, parent, fields))
+
+				elif (opcode == CHECK_TYPE):
+					if (not isinstance(stack[-1], arg)):
+						self._line = line
+						self.assert_type(stack[-1], arg)
+
+				elif (opcode == FOR_NEXT):
+					state = stack[-1]
+					values = state[1].view_list()
+					if (state[2] < len(values)):
+						self._line = line
+						state[0].set_var_value(self, values[state[2]])
+						state[2] += 1
+					else:
+						stack[-1] = BoolValue(self, state[2] > 0)
+						pc = arg
+
+				elif (opcode == JUMP_OUT):
+					target, depth = arg
+					del stack[depth:]
+					pc = target
+
+				elif (opcode == TO_BOOL):
+					stack[-1] = BoolValue(self, stack[-1].to_bool(self))
+
+				elif (opcode == BUILD_LIST):
+					if (arg):
+						values = stack[-arg:]
+						del stack[-arg:]
+					else:
+						values = []
+					stack.append(ListValue(self, values))
+
+				elif (opcode == RUN_OPERATION):
+					self._line = line
+					stack.append(arg(self, None))
+
+				# The iterator and list are replaced with the loop's state: [iterator, list, index]
+
+				elif (opcode == FOR_SETUP):
+					values = stack.pop()
+					stack[-1] = [stack[-1], values, 0]
+
+				elif (opcode == FOR_END):
+					stack[-1] = BoolValue(self, stack[-1][2] > 0)
+
+				# The scope is added before the body runs, and its frame keeps track of where it started
+
+				elif (opcode == CALL_FUNCTION):
+					value_type, eval_vars = arg
+					arg_values = stack.pop().view_list()
+					function = stack.pop()
+					self._line = line
+					parameters = function.get_parameters(self)
+					if (len(parameters) != len(arg_values)):
+						raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+					scope = ObjectValue(self)
+					for i in range(len(parameters)):
+						scope.set_field(self, parameters[i], arg_values[i])
+					self.add_function_scope(scope)
+					frame.pc = pc
+					frame = _Frame(self._get_function(function.get_body(), line), len(scopes), line, value_type, eval_vars)
+					frames.append(frame)
+					instructions = frame.code.instructions
+					stack = frame.stack
+					pc = 0
+
+				# A tail call replaces the frame that's running, in the same place among the scopes,
+				# so tail-recursive functions don't use up frames or scopes
+
+				elif (opcode == TAIL_CALL):
+					arg_values = stack.pop().view_list()
+					function = stack.pop()
+					self._line = line
+					parameters = function.get_parameters(self)
+					if (len(parameters) != len(arg_values)):
+						raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+					scope = ObjectValue(self)
+					for i in range(len(parameters)):
+						scope.set_field(self, parameters[i], arg_values[i])
+					del scopes[frame.scope_base - 1:]
+					self.add_function_scope(scope)
+					callee = _Frame(self._get_function(function.get_body(), line), frame.scope_base, line, frame.value_type, frame.eval_vars)
+					callee.call_line = frame.call_line
+					frames[-1] = frame = callee
+					instructions = frame.code.instructions
+					stack = frame.stack
+					pc = 0
+
+				# Returning switches back to the caller before checking the value,
+				# so any error is raised (and possibly caught) in the caller
+
+				elif (opcode == RETURN or opcode == END_FUNCTION):
+					output = stack.pop() if (opcode == RETURN) else NullValue(self)
+					callee = frames.pop()
+					del scopes[callee.scope_base - 1:]
+					frame = frames[-1]
+					instructions = frame.code.instructions
+					stack = frame.stack
+					pc = frame.pc
+					self._line = callee.call_line
+					if (callee.eval_vars and isinstance(output, VariableValue)):
+						output = output.get_var_value(self)
+					if (not isinstance(output, callee.value_type)):
+						self.assert_type(output, callee.value_type)
+					stack.append(output)
+
+				elif (opcode == NEW_OBJECT):
+					self._line = line
+					obj = ObjectValue(self)
+					self.add_function_scope(obj)
+					stack.append(obj)
+
+				elif (opcode == END_OBJECT):
+					self.pop_function_scope()
+
+				elif (opcode == BIND_ERROR):
+					self._line = line
+					self.get_function_scope().set_field(self, arg.eval_as_variable(self), stack.pop())
+
+				elif (opcode == THROW):
+					self._line = line
+					raise _ExceptionSignal(ExceptionInterrupt(line, stack.pop()))
+
+				elif (opcode == INVALID):
+					raise CWRuntimeError(arg, line)
+
+				elif (opcode == INVALID_IN_FUNCTION):
+					raise CWRuntimeError(arg, frame.line)
+
+				elif (opcode == HALT):
+					frame.pc = pc
+					return stack.pop()
+
+				else:
+					raise RuntimeError(f"Unknown opcode {opcode}")
+
+			except CatchableError as error:
+				frame.pc = pc
+				frame = self._unwind(self.make_exception(error.type, error.body))
+				instructions = frame.code.instructions
+				stack = frame.stack
+				pc = frame.pc
+			except _ExceptionSignal as signal:
+				frame.pc = pc
+				frame = self._unwind(signal.interrupt)
+				instructions = frame.code.instructions
+				stack = frame.stack
+				pc = frame.pc
+
+	# Finds the innermost handler for an exception, leaving frames (and their scopes) as needed
+	# Each frame's `pc` is just past the instruction that raised the exception or made the call
+	# Returns the frame that handles the exception, ready to run the catch body
+
+	def _unwind(self, interrupt):
+
+		frames = self._frames
+		while (frames):
+			frame = frames[-1]
+			index = frame.pc - 1
+			for start, end, target, depth, objects in frame.code.handlers:
+				if (start <= index < end):
+					del frame.stack[depth:]
+					del self._scopes[frame.scope_base + objects:]
+					frame.stack.append(interrupt.value)
+					frame.pc = target
+					return frame
+			frames.pop()
+			if (frames):
+				del self._scopes[frame.scope_base - 1:]
+		self._raise_unhandled(interrupt)
+
+_PLAIN_NUMBERS = frozenset([IntValue, FloatValue])
\ No newline at end of file
@@ -0,0 +1,626 @@
+from operator import add, sub, mul, lt, gt, le, ge, eq, ne
+
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.parser.ast import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+from cwscript.evaluator.compiled_evaluator import CompiledEvaluator, _SIGNALS, _InterruptSignal, _ReturnSignal, _BreakSignal, _ContinueSignal, _ExceptionSignal, _TailCallSignal
+
+# An alternative to `CodeEvaluator` that compiles the AST into nested Python closures
+# Each closure evaluates one node and returns its value, calling the closures
+# of its arguments directly instead of going through the evaluation stack
+
+# Statements and operators that don't affect control flow are compiled around
+# their own _finish() (or _evaluate() for single-step operations), so both
+# evaluators share the same implementation of every built-in
+# Control flow is compiled into Python control flow, with the interrupt
+# handling of each statement done with try/except
+
+# Errors need to report the same line as they would in `CodeEvaluator`,
+# which is the line of the operation on top of the stack
+# `_line` is set to that line before anything that could raise an error
+
+class ClosureEvaluator (CompiledEvaluator):
+
+	def __init__(self, root):
+
+		self._main = root
+		self._line = root.get_line()
+		self._scopes = [ObjectValue(self)]
+		self._rng = self.get_seed()
+		self._bodies = {}
+		self._statements = self._run_deep(self._compile_root, root)
+		self._pc = 0
+
+	def _compile_root(self, root):
+
+		return [self._compile(node, ScriptValue, True, node.get_line()) for node in root.get_children()]
+
+	def _run_statement(self, statement):
+
+		statement()
+
+	def get_line(self):
+
+		return self._line
+
+	def request_value(self, node, value_type, eval_vars = True):
+
+		raise RuntimeError("Closure evaluator cannot request values")
+
+	def raise_interrupt(self, interrupt):
+
+		raise _SIGNALS[type(interrupt)](interrupt)
+
+	def handle_interrupt(self):
+
+		pass
+
+	# Returns a closure that evaluates `node` the same way as `request_value()`
+	# `line` is the line of the operation requesting the value, which is where
+	# errors are reported if the node is a value rather than an operation
+
+	def _compile(self, node, value_type, eval_vars, line):
+
+		if (isinstance(node, ASTOperation)):
+			operation = node.get_operation()
+			if (operation in _OPERATION_COMPILERS):
+				return _OPERATION_COMPILERS[operation](self, node, value_type, eval_vars)
+			elif (issubclass(operation, StackBasicOperation)):
+				return self._compile_basic(node, value_type, eval_vars)
+			else:
+				raise UnsupportedError(f"Closure evaluator does not support {operation.__name__}")
+
+		dtype = node.get_dtype()
+		if (dtype == ASTNode.TYPE_BLOCK):
+			return self._compile_block(node, value_type)
+		elif (dtype == ASTNode.TYPE_LIST):
+			return self._compile_list(node, value_type)
+		elif (dtype == ASTNode.TYPE_VARIABLE):
+			return self._compile_variable(node, value_type, eval_vars, line)
+		else:
+			return self._compile_literal(node, value_type, line)
+
+	# Compiled function bodies are kept, since the same function is usually called many times
+
+	def _get_body(self, node, line):
+
+		key = (node, line)
+		if (key not in self._bodies):
+			self._bodies[key] = self._compile(node, ScriptValue, True, line)
+		return self._bodies[key]
+
+	# VALUES
+
+	# Literal values can't be changed, so each one is only created once
+
+	def _compile_literal(self, node, value_type, line):
+
+		value = node.evaluate(self, ScriptValue, True)
+		if (isinstance(value, value_type)):
+			def run():
+				return value
+		else:
+			def run():
+				self._line = line
+				return self.assert_type(value, value_type)
+		return run
+
+	def _compile_variable(self, node, value_type, eval_vars, line):
+
+		is_global, fields = node.get_value()
+		scopes = self._scopes
+
+		# Most variables are a single name in the current scope
+
+		if (eval_vars and not is_global and len(fields) == 1):
+			name = fields[0]
+			def run():
+				self._line = line
+				output = scopes[-1].get_field(self, name)
+				if (not isinstance(output, value_type)):
+					self.assert_type(output, value_type)
+				return output
+
+		elif (eval_vars):
+			def run():
+				self._line = line
+				parent = scopes[0] if (is_global) else scopes[-1]
+				output = VariableValue(self, parent, fields).get_var_value(self)
+				if (not isinstance(output, value_type)):
+					self.assert_type(output, value_type)
+				return output
+
+		else:
+			def run():
+				self._line = line
+				parent = scopes[0] if (is_global) else scopes[-1]
+				return self.assert_type(VariableValue(self, parent, fields), value_type)
+
+		return run
+
+	def _compile_block(self, node, value_type):
+
+		statements = [self._compile(child, ScriptValue, True, child.get_line()) for child in node.get_value()]
+
+		# A block reports the line of the last statement it ran
+
+		line = node.get_value()[-1].get_line() if (node.get_value()) else node.get_line()
+		# Like literals, the null a block produces is only created once
+
+		output = NullValue(self)
+		if (isinstance(output, value_type)):
+			def run():
+				for statement in statements:
+					statement()
+				return output
+		else:
+			def run():
+				for statement in statements:
+					statement()
+				self._line = line
+				return self.assert_type(output, value_type)
+		return run
+
+	def _compile_list(self, node, value_type):
+
+		line = node.get_line()
+		items = [self._compile(child, ScriptValue, True, line) for child in node.get_value()]
+		def run():
+			output = ListValue(self, [item() for item in items])
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# OPERATIONS
+
+	# Arguments are evaluated in order, then passed to the operation's _finish()
+	# Variables in the output are evaluated here, like in evaluate_and_check()
+
+	def _compile_basic(self, node, value_type, eval_vars):
+
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		line = node.get_line()
+		args = [self._compile(node.get_args()[request.name], request.value_type, request.eval_vars, line)
+			for request in operation.get_arg_requests()]
+
+		if (len(args) == 1):
+			arg_1, = args
+			def run():
+				values = [arg_1()]
+				self._line = line
+				output = finish(self, values)
+				if (eval_vars and isinstance(output, VariableValue)):
+					output = output.get_var_value(self)
+				if (not isinstance(output, value_type)):
+					self.assert_type(output, value_type)
+				return output
+
+		elif (len(args) == 2):
+			arg_1, arg_2 = args
+			def run():
+				values = [arg_1(), arg_2()]
+				self._line = line
+				output = finish(self, values)
+				if (eval_vars and isinstance(output, VariableValue)):
+					output = output.get_var_value(self)
+				if (not isinstance(output, value_type)):
+					self.assert_type(output, value_type)
+				return output
+
+		else:
+			def run():
+				values = [arg() for arg in args]
+				self._line = line
+				output = finish(self, values)
+				if (eval_vars and isinstance(output, VariableValue)):
+					output = output.get_var_value(self)
+				if (not isinstance(output, value_type)):
+					self.assert_type(output, value_type)
+				return output
+
+		return run
+
+	# Operations that finish in a single step can be run as they are
+
+	def _compile_single_step(self, node, value_type, eval_vars):
+
+		evaluate_and_check = node.evaluate(self, value_type, eval_vars).evaluate_and_check
+		line = node.get_line()
+		def run():
+			self._line = line
+			return evaluate_and_check(self, None)
+		return run
+
+	# Arithmetic and comparisons have a shortcut for plain numbers, which
+	# are by far the most common operands in loops
+	# Anything else (including errors) goes through the operation's own _finish()
+
+	def _compile_arithmetic(self, node, value_type, eval_vars):
+
+		function = _ARITHMETIC[node.get_operation()]
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		line = node.get_line()
+		arg_1, arg_2 = [self._compile(node.get_args()[request.name], request.value_type, request.eval_vars, line)
+			for request in operation.get_arg_requests()]
+		def run():
+			value_1 = arg_1()
+			value_2 = arg_2()
+			if (type(value_1) is IntValue and type(value_2) is IntValue):
+				output = IntValue(self, function(value_1.get_value(), value_2.get_value()))
+			else:
+				self._line = line
+				output = finish(self, [value_1, value_2])
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	def _compile_comparison(self, node, value_type, eval_vars):
+
+		function = _COMPARISONS[node.get_operation()]
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		line = node.get_line()
+		arg_1, arg_2 = [self._compile(node.get_args()[request.name], request.value_type, request.eval_vars, line)
+			for request in operation.get_arg_requests()]
+		def run():
+			value_1 = arg_1()
+			value_2 = arg_2()
+			if (type(value_1) in _PLAIN_NUMBERS and type(value_2) in _PLAIN_NUMBERS):
+				output = BoolValue(self, function(value_1.get_value(), value_2.get_value()))
+			else:
+				self._line = line
+				output = finish(self, [value_1, value_2])
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# Assigning to a variable in the current scope skips creating a `VariableValue`
+	# The scope is looked up before the value is evaluated, as it would be for the first argument
+
+	def _compile_assign(self, node, value_type, eval_vars):
+
+		target = node.get_args()['op_1']
+		if not (isinstance(target, ASTValue) and target.get_dtype() == ASTNode.TYPE_VARIABLE):
+			return self._compile_basic(node, value_type, eval_vars)
+		is_global, fields = target.get_value()
+		if (is_global or len(fields) != 1):
+			return self._compile_basic(node, value_type, eval_vars)
+
+		name = fields[0]
+		scopes = self._scopes
+		line = node.get_line()
+		value = self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+		def run():
+			scope = scopes[-1]
+			output = value()
+			scope.set_field(self, name, output)
+			if (not eval_vars):
+				output = VariableValue(self, scope, fields)
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# Same as above for compound assignment (`+=`, `-=` and `*=`), which also
+	# has the same shortcut for plain numbers as arithmetic
+
+	def _compile_compound_assign(self, node, value_type, eval_vars):
+
+		target = node.get_args()['op_1']
+		if not (isinstance(target, ASTValue) and target.get_dtype() == ASTNode.TYPE_VARIABLE):
+			return self._compile_basic(node, value_type, eval_vars)
+		is_global, fields = target.get_value()
+		if (is_global or len(fields) != 1):
+			return self._compile_basic(node, value_type, eval_vars)
+
+		function = _COMPOUND_ASSIGNMENTS[node.get_operation()]
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		name = fields[0]
+		scopes = self._scopes
+		line = node.get_line()
+		request = operation.get_arg_requests()[1]
+		value = self._compile(node.get_args()['op_2'], request.value_type, request.eval_vars, line)
+		def run():
+			scope = scopes[-1]
+			value_2 = value()
+			self._line = line
+			value_1 = scope.get_field(self, name)
+			if (type(value_1) is IntValue and type(value_2) is IntValue):
+				scope.set_field(self, name, IntValue(self, function(value_1.get_value(), value_2.get_value())))
+			else:
+				finish(self, [VariableValue(self, scope, fields), value_2])
+			output = scope.get_field(self, name) if (eval_vars) else VariableValue(self, scope, fields)
+			if (not isinstance(output, value_type)):
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	def _compile_and(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		op_1 = self._compile(node.get_args()['op_1'], ScriptValue, True, line)
+		op_2 = self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+		def run():
+			output = BoolValue(self, op_1().to_bool(self) and op_2().to_bool(self))
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	def _compile_or(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		op_1 = self._compile(node.get_args()['op_1'], ScriptValue, True, line)
+		op_2 = self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+		def run():
+			output = BoolValue(self, op_1().to_bool(self) or op_2().to_bool(self))
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# CONTROL FLOW
+
+	def _compile_if(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		condition = self._compile(node.get_args()['condition'], ScriptValue, True, line)
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			if (condition().to_bool(self)):
+				body()
+				output = BoolValue(self, True)
+			else:
+				output = BoolValue(self, False)
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# After a break, the condition is still checked one last time before the loop exits
+
+	def _compile_while(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		condition = self._compile(node.get_args()['condition'], ScriptValue, True, line)
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			ran = False
+			while (condition().to_bool(self)):
+				ran = True
+				try:
+					body()
+				except _BreakSignal:
+					condition()
+					break
+				except _ContinueSignal:
+					pass
+			output = BoolValue(self, ran)
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# The list is looked up again on every iteration, since the body can change it
+
+	def _compile_for(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		iterator = self._compile(node.get_args()['iterator'], VariableValue, False, line)
+		source = self._compile(node.get_args()['list'], ListValue, True, line)
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			variable = iterator()
+			values = source()
+			index = 0
+			while (index < len(values.view_list())):
+				self._line = line
+				variable.set_var_value(self, values.view_list()[index])
+				index += 1
+				try:
+					body()
+				except _BreakSignal:
+					break
+				except _ContinueSignal:
+					pass
+			output = BoolValue(self, index > 0)
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# Exceptions from the body are caught, but not those from the catch body
+	# Built-in errors are turned into exception objects when they're caught,
+	# while `_line` is still the line they were raised on
+
+	def _compile_try_catch(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		error = node.get_args()['error']
+		catch_body = self._compile(node.get_args()['catch_body'], ScriptValue, True, line)
+		def run():
+			try:
+				body()
+				interrupt = None
+			except _ExceptionSignal as signal:
+				interrupt = signal.interrupt
+			except CatchableError as catchable:
+				interrupt = self.make_exception(catchable.type, catchable.body)
+			except _ContinueSignal:
+				raise CWRuntimeError("Invalid use of continue", line)
+			except _BreakSignal:
+				raise CWRuntimeError("Invalid use of break", line)
+
+			if (interrupt is not None):
+				self._line = line
+				self.get_function_scope().set_field(self, error.eval_as_variable(self), interrupt.value)
+				try:
+					catch_body()
+				except _ContinueSignal:
+					raise CWRuntimeError("Invalid use of continue", line)
+				except _BreakSignal:
+					raise CWRuntimeError("Invalid use of break", line)
+
+			output = BoolValue(self, interrupt is None)
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	# A tail call (see `FusedTailCall`) runs the function it calls in place of the one
+	# that's running, so tail-recursive functions loop here instead of nesting
+	# Until the call finishes, errors are reported on the line of the tail call,
+	# like `CallStatement` does
+
+	def _compile_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		function = self._compile(node.get_args()['function'], FunctionValue, True, line)
+		arguments = self._compile(node.get_args()['args'], ListValue, True, line)
+		def run():
+			func = function()
+			arg_values = arguments().view_list()
+			parameters = func.get_parameters(self)
+			self._line = line
+			if (len(parameters) != len(arg_values)):
+				raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+			scope = ObjectValue(self)
+			for i in range(len(parameters)):
+				scope.set_field(self, parameters[i], arg_values[i])
+			self.add_function_scope(scope)
+
+			body_line = line
+			while (True):
+				try:
+					self._get_body(func.get_body(), body_line)()
+					output = None
+				except _TailCallSignal as signal:
+					self.pop_function_scope()
+					func = signal.interrupt.function
+					body_line = signal.interrupt.get_line()
+					self.add_function_scope(signal.interrupt.scope)
+					continue
+				except _ReturnSignal as signal:
+					output = signal.interrupt.value
+				except _ContinueSignal:
+					raise CWRuntimeError("Invalid use of continue", body_line)
+				except _BreakSignal:
+					raise CWRuntimeError("Invalid use of break", body_line)
+				except (_ExceptionSignal, CatchableError):
+					self.pop_function_scope()
+					raise
+				break
+
+			self.pop_function_scope()
+			if (output is None):
+				output = NullValue(self)
+			if (eval_vars and isinstance(output, VariableValue)):
+				output = output.get_var_value(self)
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+	def _compile_new_object(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			output = ObjectValue(self)
+			self._line = line
+			self.add_function_scope(output)
+			try:
+				body()
+			except _ReturnSignal:
+				pass
+			except _ContinueSignal:
+				raise CWRuntimeError("Invalid use of continue", line)
+			except _BreakSignal:
+				raise CWRuntimeError("Invalid use of break", line)
+			except (_ExceptionSignal, CatchableError):
+				self.pop_function_scope()
+				raise
+			self.pop_function_scope()
+			if (not isinstance(output, value_type)):
+				self._line = line
+				self.assert_type(output, value_type)
+			return output
+		return run
+
+_PLAIN_NUMBERS = frozenset([IntValue, FloatValue])
+
+_ARITHMETIC = {
+	OperatorAdd: add,
+	OperatorSubtract: sub,
+	OperatorMultiply: mul
+}
+
+_COMPARISONS = {
+	OperatorLess: lt,
+	OperatorGreater: gt,
+	OperatorLessEqual: le,
+	OperatorGreaterEqual: ge,
+	OperatorEqual: eq,
+	OperatorUnequal: ne
+}
+
+_COMPOUND_ASSIGNMENTS = {
+	OperatorAssignAdd: add,
+	OperatorAssignSubtract: sub,
+	OperatorAssignMultiply: mul
+}
+
+_OPERATION_COMPILERS = {
+	OperatorAssign: ClosureEvaluator._compile_assign,
+	OperatorAssignAdd: ClosureEvaluator._compile_compound_assign,
+	OperatorAssignSubtract: ClosureEvaluator._compile_compound_assign,
+	OperatorAssignMultiply: ClosureEvaluator._compile_compound_assign,
+	OperatorAdd: ClosureEvaluator._compile_arithmetic,
+	OperatorSubtract: ClosureEvaluator._compile_arithmetic,
+	OperatorMultiply: ClosureEvaluator._compile_arithmetic,
+	OperatorLess: ClosureEvaluator._compile_comparison,
+	OperatorGreater: ClosureEvaluator._compile_comparison,
+	OperatorLessEqual: ClosureEvaluator._compile_comparison,
+	OperatorGreaterEqual: ClosureEvaluator._compile_comparison,
+	OperatorEqual: ClosureEvaluator._compile_comparison,
+	OperatorUnequal: ClosureEvaluator._compile_comparison,
+	OperatorAnd: ClosureEvaluator._compile_and,
+	OperatorOr: ClosureEvaluator._compile_or,
+	IfStatement: ClosureEvaluator._compile_if,
+	WhileLoopStatement: ClosureEvaluator._compile_while,
+	ForLoopStatement: ClosureEvaluator._compile_for,
+	TryCatchStatement: ClosureEvaluator._compile_try_catch,
+	CallStatement: ClosureEvaluator._compile_call,
+	NewObjectStatement: ClosureEvaluator._compile_new_object,
+	LocalScopeStatement: ClosureEvaluator._compile_single_step,
+	GlobalScopeStatement: ClosureEvaluator._compile_single_step,
+	ContinueStatement: ClosureEvaluator._compile_single_step,
+	BreakStatement: ClosureEvaluator._compile_single_step,
+	FunctionStatement: ClosureEvaluator._compile_single_step,
+	LambdaStatement: ClosureEvaluator._compile_single_step,
+	RNGGetStatement: ClosureEvaluator._compile_single_step,
+	RNGResetStatement: ClosureEvaluator._compile_single_step,
+	RandomFloatStatement: ClosureEvaluator._compile_single_step,
+	PiStatement: ClosureEvaluator._compile_single_step,
+	EulerStatement: ClosureEvaluator._compile_single_step
+}
\ No newline at end of file
@@ -1,4 +1,5 @@
 from datetime import datetime
+from itertools import repeat
 
 from cwscript.constants import *
 from cwscript.errors import *
@@ -84,29 +85,87 @@ class CodeEvaluator:
 		# This is sensible, as you wouldn't expect `return` or `break` to have a return value
 
 		else:
-			top_op = self._main_stack[-1]
-			self._last_value = None
-			top_op.handle_interrupt(self, self._pending_interrupt)
-			if (self._pending_interrupt is not None):
-				self._main_stack.pop()
-			if (len(self._main_stack) == 0):
-				if (isinstance(self._pending_interrupt, ContinueInterrupt)):
-					raise CWRuntimeError("Invalid use of continue", self._pending_interrupt.get_line())
-				elif (isinstance(self._pending_interrupt, BreakInterrupt)):
-					raise CWRuntimeError("Invalid use of break", self._pending_interrupt.get_line())
-				elif (isinstance(self._pending_interrupt, ReturnInterrupt)):
-					raise CWRuntimeError("Invalid use of return", self._pending_interrupt.get_line())
-				elif (isinstance(self._pending_interrupt, ExceptionInterrupt)):
-					raise CWRuntimeError("Unhandled exception: " + self._pending_interrupt.value.to_string(self),
-						self._pending_interrupt.get_line()
-					)
-				else:
-					raise CWRuntimeError("Unhandled interrupt", self._pending_interrupt.get_line())
+			self._pass_interrupt()
 
 		return len(self._main_stack) > 0
 
+	# Runs up to `steps` steps of the evaluation stack, or all of them if `steps` is None
+	# This is the same as calling run_next() repeatedly, but everything that's used on
+	# every step is looked up once, and `_error_line` is only kept up to date when
+	# the stack is emptied (which is the only time get_line() needs it)
+	# Returns false once the last line has executed
+
+	def run_steps(self, steps):
+
+		main_stack = self._main_stack
+		for step in (repeat(None) if (steps is None) else range(steps)):
+			if (not main_stack):
+				break
+			if (self._pending_interrupt is None):
+				top_op = main_stack[-1]
+				last_value = self._last_value
+				self._last_value = None
+				try:
+					output = top_op.evaluate_and_check(self, last_value)
+					if (output is not None):
+						self._last_value = output
+						main_stack.pop()
+						if (not main_stack):
+							self._error_line = top_op.get_line()
+				except CatchableError as e:
+					self.raise_exception(e.type, e.body)
+			else:
+				self._pass_interrupt()
+		return len(main_stack) > 0
+
+	def run(self):
+
+		self.run_steps(None)
+
+	# Gives the topmost operation a chance to handle the pending interrupt,
+	# removing it from the stack if it doesn't
+
+	def _pass_interrupt(self):
+
+		top_op = self._main_stack[-1]
+		self._last_value = None
+		top_op.handle_interrupt(self, self._pending_interrupt)
+		if (self._pending_interrupt is not None):
+			self._main_stack.pop()
+		if (len(self._main_stack) == 0):
+			self._error_line = top_op.get_line()
+			self._raise_unhandled(self._pending_interrupt)
+
+	# Errors for an interrupt that made it past the root of the program
+
+	def _raise_unhandled(self, interrupt):
+
+		if (isinstance(interrupt, ContinueInterrupt)):
+			raise CWRuntimeError("Invalid use of continue", interrupt.get_line())
+		elif (isinstance(interrupt, BreakInterrupt)):
+			raise CWRuntimeError("Invalid use of break", interrupt.get_line())
+		elif (isinstance(interrupt, ReturnInterrupt)):
+			raise CWRuntimeError("Invalid use of return", interrupt.get_line())
+		elif (isinstance(interrupt, ExceptionInterrupt)):
+			raise CWRuntimeError("Unhandled exception: " + interrupt.value.to_string(self),
+				interrupt.get_line()
+			)
+		else:
+			raise CWRuntimeError("Unhandled interrupt", interrupt.get_line())
+
+	# Returns the value most recently produced by an operation
+	# Once the stack is empty, this is the value of the root expression
+
+	def get_last_value(self):
+
+		return self._last_value
+
 	def request_value(self, node, value_type, eval_vars = True):
 
+		value = node.evaluate_now(self, value_type)
+		if (value is not None):
+			self._last_value = value
+			return
 		value = node.evaluate(self, value_type, eval_vars)
 		if (isinstance(value, ScriptValue)):
 			self._last_value = value
@@ -127,6 +186,25 @@ class CodeEvaluator:
 		else:
 			return self._error_line
 
+	# Loops ask the evaluator whether they should be compiled once they've run this many
+	# iterations, which only `TieredEvaluator` does, so the stack runs every loop here
+
+	def get_hot_loop_threshold(self):
+
+		return None
+
+	def compile_hot_while(self, args, line):
+
+		return None
+
+	def compile_hot_for(self, args, line):
+
+		return None
+
+	def get_tiering_stats(self):
+
+		return None
+
 	def get_global_scope(self):
 
 		return self._scopes[0]
@@ -166,11 +244,19 @@ class CodeEvaluator:
 
 	def raise_exception(self, e_type, body):
 
+		self.raise_interrupt(self.make_exception(e_type, body))
+		return None
+
+	# Builds the interrupt for an error raised by a built-in function
+	# The exception is an object with `type` and `body` fields, both strings
+	# It's raised on the current line, unless another `line` is given
+
+	def make_exception(self, e_type, body, line = None):
+
 		obj = ObjectValue(self)
 		obj.set_field(self, 'type', StringValue(self, e_type))
 		obj.set_field(self, 'body', StringValue(self, body))
-		self.raise_interrupt(ExceptionInterrupt(self.get_line(), obj))
-		return None
+		return ExceptionInterrupt(self.get_line() if (line is None) else line, obj)
 
 	# Throws an error if an expression receives an incorrect type
 
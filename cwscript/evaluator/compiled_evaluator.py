@@ -0,0 +1,106 @@
+import sys
+from itertools import repeat
+
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+from cwscript.evaluator.code_evaluator import CodeEvaluator
+
+# Interrupts are raised as Python exceptions, so that they unwind every
+# Python frame between where they're raised and where they're handled
+
+class _InterruptSignal (Exception):
+
+	def __init__(self, interrupt):
+
+		self.interrupt = interrupt
+
+class _ReturnSignal (_InterruptSignal):
+
+	pass
+
+class _BreakSignal (_InterruptSignal):
+
+	pass
+
+class _ContinueSignal (_InterruptSignal):
+
+	pass
+
+class _ExceptionSignal (_InterruptSignal):
+
+	pass
+
+class _TailCallSignal (_InterruptSignal):
+
+	pass
+
+_SIGNALS = {
+	ReturnInterrupt: _ReturnSignal,
+	BreakInterrupt: _BreakSignal,
+	ContinueInterrupt: _ContinueSignal,
+	ExceptionInterrupt: _ExceptionSignal,
+	TailCallInterrupt: _TailCallSignal
+}
+
+# Base class for evaluators that compile the AST into Python code before running it
+# (see `ClosureEvaluator`, `TranspiledEvaluator` and `BytecodeEvaluator`)
+# Subclasses keep the compiled top-level statements in `_statements`, and
+# `_pc` is the index of the next one to run
+
+# Top-level statements are run one at a time by run_next(), or in batches by run_steps()
+
+class CompiledEvaluator (CodeEvaluator):
+
+	def run_next(self):
+
+		return self.run_steps(1)
+
+	# Each step is a whole top-level statement
+
+	def run_steps(self, steps):
+
+		self._run_deep(self._run_statements, steps)
+		return self._pc < len(self._statements)
+
+	# Anything that reaches this point was not handled by the program
+
+	def _run_statements(self, steps):
+
+		statements = self._statements
+		for step in (repeat(None) if (steps is None) else range(steps)):
+			if (self._pc >= len(statements)):
+				break
+			statement = statements[self._pc]
+			self._pc += 1
+			try:
+				self._run_statement(statement)
+			except _InterruptSignal as signal:
+				self._raise_unhandled(signal.interrupt)
+			except CatchableError as error:
+				self._raise_unhandled(self.make_exception(error.type, error.body, self._get_error_line(error)))
+
+	def _run_statement(self, statement):
+
+		raise NotImplementedError()
+
+	# The line an uncaught CatchableError is reported on, where None is the current line
+
+	def _get_error_line(self, error):
+
+		return None
+
+	# Compiled code calls itself directly, so deeply nested code and
+	# recursive functions are limited by Python's recursion limit
+	# The limit is raised while compiling or running, which is enough for
+	# `MAX_RECURSION_DEPTH` nested function calls
+
+	def _run_deep(self, function, arg):
+
+		limit = sys.getrecursionlimit()
+		sys.setrecursionlimit(max(limit, DEEP_RECURSION_LIMIT))
+		try:
+			return function(arg)
+		finally:
+			sys.setrecursionlimit(limit)
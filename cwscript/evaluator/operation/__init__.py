@@ -1,5 +1,5 @@
-
 from .base import *
 from .operator import *
 from .statement import *
-from .interrupt import *
\ No newline at end of file
+from .interrupt import *
+from .fused import *
\ No newline at end of file
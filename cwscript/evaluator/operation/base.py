@@ -2,6 +2,10 @@ from cwscript.evaluator.value import *
 
 class StackOperation:
 
+	# Whether the operation needs to know which node it came from (see `QuickeningOperation`)
+
+	quickens = False
+
 	def __init__(self, line, value_type, eval_vars):
 
 		self._line = line
@@ -95,15 +99,28 @@ class StackBasicOperation (StackOperation):
 		self._args_evaluated = []
 		self._arg_requests = self._define_args()
 
+	# Leaf arguments (literals and variables) are evaluated right away, so only
+	# arguments that are operations of their own take an extra step
+	# Evaluating them here raises the same errors on the same line as request_value() would
+
 	def _evaluate(self, evaluator, last_value):
 
 		if (last_value is not None):
 			self._args_evaluated.append(last_value)
-		if (len(self._args_evaluated) == len(self._args)):
-			return self._finish(evaluator, self._args_evaluated)
-		else:
+		while (len(self._args_evaluated) < len(self._args)):
 			req = self._arg_requests[len(self._args_evaluated)]
-			evaluator.request_value(self._args[req.name], req.value_type, req.eval_vars)
+			node = self._args[req.name]
+			if (not node.is_leaf()):
+				evaluator.request_value(node, req.value_type, req.eval_vars)
+				return None
+			self._args_evaluated.append(node.evaluate(evaluator, req.value_type, req.eval_vars))
+		return self._finish(evaluator, self._args_evaluated)
+
+	# Other engines evaluate the arguments themselves, then pass them to _finish()
+
+	def get_arg_requests(self):
+
+		return self._arg_requests
 
 	def _define_args(self):
 
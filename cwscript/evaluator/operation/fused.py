@@ -0,0 +1,130 @@
+from cwscript.evaluator.operation.base import *
+from cwscript.evaluator.operation.base import _ArgRequest as ArgRequest
+from cwscript.evaluator.operation.interrupt import *
+from cwscript.evaluator.operation.operator import _op_add, _prefix_op_class
+from cwscript.evaluator.operation.statement import WhileLoopStatement, _get_hot_step, _make_call_scope
+from cwscript.evaluator.value import *
+
+# Fused operations do the work of a common combination of operations in a single step
+# They're never parsed, and are only put in the AST by `operation_fuser`, which
+# makes sure that every argument they evaluate themselves is a leaf (see is_leaf())
+# Errors are raised on the same line with the same message as the operations they replace
+
+# Returns the scope holding a single-name variable, and the name itself
+
+def _get_target(evaluator, node):
+
+	is_global, fields = node.get_value()
+	scope = evaluator.get_global_scope() if (is_global) else evaluator.get_function_scope()
+	return scope, fields
+
+# Replaces `.x += <leaf>` and `.x = .x + <literal>`
+# The value is evaluated before the variable is read, like in OperatorAssignAdd
+
+class FusedAssignAdd (StackOperation):
+
+	def __init__(self, args, line, value_type, eval_vars):
+
+		super().__init__(line, value_type, eval_vars)
+		self._args = args
+
+	def _evaluate(self, evaluator, last_value):
+
+		scope, fields = _get_target(evaluator, self._args['variable'])
+		value = self._args['value'].evaluate(evaluator, ScriptValue, True)
+		current = scope.get_field(evaluator, fields[0])
+		if (type(current) is IntValue and type(value) is IntValue):
+			output = IntValue(evaluator, current.get_value() + value.get_value())
+		else:
+			output = _op_add(evaluator, current, value)
+		scope.set_field(evaluator, fields[0], output)
+		return output if (self._eval_vars) else VariableValue(evaluator, scope, fields)
+
+# Replaces `++.x` and `--.x`
+
+class FusedIncrement (StackOperation):
+
+	_change = 1
+
+	def __init__(self, args, line, value_type, eval_vars):
+
+		super().__init__(line, value_type, eval_vars)
+		self._args = args
+
+	def _evaluate(self, evaluator, last_value):
+
+		scope, fields = _get_target(evaluator, self._args['variable'])
+		current = scope.get_field(evaluator, fields[0])
+		if (type(current) is IntValue):
+			output = IntValue(evaluator, current.get_value() + self._change)
+		else:
+			evaluator.assert_type(current, NumericValue)
+			output = _prefix_op_class(current)(evaluator, current.get_value() + self._change)
+		scope.set_field(evaluator, fields[0], output)
+		return output if (self._eval_vars) else VariableValue(evaluator, scope, fields)
+
+class FusedDecrement (FusedIncrement):
+
+	_change = -1
+
+# Replaces `append <leaf> <leaf>`
+
+class FusedListAppend (StackOperation):
+
+	def __init__(self, args, line, value_type, eval_vars):
+
+		super().__init__(line, value_type, eval_vars)
+		self._args = args
+
+	def _evaluate(self, evaluator, last_value):
+
+		source = self._args['source'].evaluate(evaluator, ListValue, True)
+		source.append(self._args['value'].evaluate(evaluator, ScriptValue, True))
+		return source
+
+# Replaces a while loop whose condition is a comparison of two leaves (like `.i < .n`)
+# The condition is checked in the same step that starts the next iteration,
+# instead of being pushed onto the stack on its own
+# Breaking out of the loop and compiling it once it's hot work the same way as in WhileLoopStatement
+
+class FusedWhileCompare (WhileLoopStatement):
+
+	def _evaluate(self, evaluator, last_value):
+
+		if (self._step == 0):
+			self._compare = self._args['condition'].evaluate(evaluator, ScriptValue, True)
+			self._hot_step = _get_hot_step(evaluator, 1, 0)
+		elif (self._step == self._hot_step and not self._used_break):
+			loop = evaluator.compile_hot_while(self._args, self._line)
+			if (loop is not None):
+				return loop()
+		compare_args = self._args['condition'].get_args()
+		values = [compare_args[request.name].evaluate(evaluator, request.value_type, request.eval_vars)
+			for request in self._compare.get_arg_requests()]
+		if (self._compare._finish(evaluator, values).to_bool(evaluator) and not self._used_break):
+			self._step += 1
+			evaluator.request_value(self._args['body'], ScriptValue)
+		else:
+			return BoolValue(evaluator, self._step > 0)
+
+# Replaces `return call <function> <args>` in a function body, where nothing but
+# the CallStatement running the body would handle the return (see `operation_fuser`)
+# Instead of calling the function from a new CallStatement, the one that's already
+# running is told to run it in its place (see `TailCallInterrupt`), so tail-recursive
+# functions run in constant space, and aren't limited by `MAX_RECURSION_DEPTH`
+# The arguments are checked here, like the replaced CallStatement would've done
+
+class FusedTailCall (StackBasicOperation):
+
+	def _define_args(self):
+
+		return [
+			ArgRequest('function', FunctionValue),
+			ArgRequest('args', ListValue)
+		]
+
+	def _finish(self, evaluator, args):
+
+		scope = _make_call_scope(evaluator, args[0], args[1].view_list())
+		evaluator.raise_interrupt(TailCallInterrupt(evaluator.get_line(), args[0], scope))
+		return NullValue(evaluator)
\ No newline at end of file
@@ -29,4 +29,15 @@ class ExceptionInterrupt (Interrupt):
 	def __init__(self, line, value):
 
 		super().__init__(line)
-		self.value = value
\ No newline at end of file
+		self.value = value
+
+# Raised by a tail call (see `FusedTailCall`) for the CallStatement it's returning
+# to, which runs `function` in `scope` in place of the function it was running
+
+class TailCallInterrupt (Interrupt):
+
+	def __init__(self, line, function, scope):
+
+		super().__init__(line)
+		self.function = function
+		self.scope = scope
\ No newline at end of file
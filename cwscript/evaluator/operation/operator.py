@@ -1,3 +1,4 @@
+import operator as _operator
 from math import trunc
 
 from cwscript.evaluator.operation.base import *
@@ -35,7 +36,7 @@ def _op_add(evaluator, op_1, op_2):
 		return StringValue(evaluator, op_1.get_value() + op_2.get_value())
 	elif (isinstance(op_1, ListValue)):
 		evaluator.assert_type(op_2, ListValue)
-		return ListValue(evaluator, op_1.get_list() + op_2.get_list())
+		return ListValue(evaluator, op_1.view_list() + op_2.view_list())
 	else:
 		evaluator.unmatched_type_error(op_1, [NumericValue, StringValue, ListValue])
 
@@ -95,6 +96,74 @@ def _op_exponent(evaluator, op_1, op_2):
 		else:
 			return FloatValue(evaluator, val)
 
+# Operations that specialise themselves for the types of values they're given
+# The first time an operation sees a pair of types it has a variant for (like two
+# IntValues), its node switches to that variant, which skips the generic type checks
+# as long as a cheap guard on the exact types of both values passes
+# If the guard ever fails, the node goes back to the generic operation for good,
+# so nodes that see mixed types don't keep switching back and forth
+# When both operands are literals or variables, the stack evaluator runs the variant
+# straight from the node (see `ASTNode.evaluate_now()`), so no operation is created
+
+class QuickeningOperation (StackBasicOperation):
+
+	quickens = True
+	_node = None
+	_variants = {}
+
+	def set_node(self, node):
+
+		self._node = node
+
+	def _observe(self, args):
+
+		if (self._node is not None and self._node.get_quickened() is None):
+			variant = self._variants.get((type(args[0]), type(args[1])))
+			if (variant is not None):
+				self._node.quicken(variant)
+
+# Creates the variant of `operation` for two values of exactly `operand_class`,
+# which returns `function` of both values as an `output_class`
+# Variants are module-level classes with their own name, so they can be pickled
+
+def _make_variant(name, operation, operand_class, output_class, function):
+
+	def _finish(self, evaluator, args):
+
+		if (type(args[0]) is operand_class and type(args[1]) is operand_class):
+			return output_class(evaluator, function(args[0].get_value(), args[1].get_value()))
+		self._node.quicken(operation)
+		return operation._finish(self, evaluator, args)
+
+	# Reading a literal or a variable has no side effects, so if anything goes wrong,
+	# the node is simply evaluated again as an operation, which raises any error
+	# on the operation's own line, or switches the node back to `operation`
+
+	def run_now(evaluator, args, value_type):
+
+		try:
+			value_1 = args['op_1'].evaluate(evaluator, ScriptValue, True)
+			value_2 = args['op_2'].evaluate(evaluator, ScriptValue, True)
+		except CatchableError:
+			return None
+		if (type(value_1) is operand_class and type(value_2) is operand_class):
+			output = output_class(evaluator, function(value_1.get_value(), value_2.get_value()))
+			if (isinstance(output, value_type)):
+				return output
+		return None
+
+	variant = type(name, (operation,), {
+		'_finish': _finish,
+		'run_now': staticmethod(run_now),
+		'_operand_class': operand_class
+	})
+	variant.__qualname__ = name
+	return variant
+
+def _set_variants(operation, *variants):
+
+	operation._variants = {(variant._operand_class, variant._operand_class): variant for variant in variants}
+
 # Accepts containers or strings
 # Containers return a VariableValue, and can therefore be used
 # to modify the given index
@@ -140,7 +209,7 @@ class OperatorExponent (StackBasicOperation):
 
 		return _op_exponent(evaluator, args[0], args[1])
 
-class OperatorMultiply (StackBasicOperation):
+class OperatorMultiply (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -151,6 +220,7 @@ class OperatorMultiply (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return _op_multiply(evaluator, args[0], args[1])
 
 class OperatorFloatDivide (StackBasicOperation):
@@ -192,7 +262,7 @@ class OperatorModulus (StackBasicOperation):
 
 		return _op_modulus(evaluator, args[0], args[1])
 
-class OperatorAdd (StackBasicOperation):
+class OperatorAdd (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -203,9 +273,10 @@ class OperatorAdd (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return _op_add(evaluator, args[0], args[1])
 
-class OperatorSubtract (StackBasicOperation):
+class OperatorSubtract (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -216,9 +287,10 @@ class OperatorSubtract (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return _op_subtract(evaluator, args[0], args[1])
 
-class OperatorGreater (StackBasicOperation):
+class OperatorGreater (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -229,9 +301,10 @@ class OperatorGreater (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return BoolValue(evaluator, args[0].get_value() > args[1].get_value())
 
-class OperatorLess (StackBasicOperation):
+class OperatorLess (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -242,9 +315,10 @@ class OperatorLess (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return BoolValue(evaluator, args[0].get_value() < args[1].get_value())
 
-class OperatorGreaterEqual (StackBasicOperation):
+class OperatorGreaterEqual (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -255,9 +329,10 @@ class OperatorGreaterEqual (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return BoolValue(evaluator, args[0].get_value() >= args[1].get_value())
 
-class OperatorLessEqual (StackBasicOperation):
+class OperatorLessEqual (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -268,9 +343,10 @@ class OperatorLessEqual (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return BoolValue(evaluator, args[0].get_value() <= args[1].get_value())
 
-class OperatorEqual (StackBasicOperation):
+class OperatorEqual (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -281,9 +357,10 @@ class OperatorEqual (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return BoolValue(evaluator, args[0].is_equal(evaluator, args[1]))
 
-class OperatorUnequal (StackBasicOperation):
+class OperatorUnequal (QuickeningOperation):
 
 	def _define_args(self):
 
@@ -294,6 +371,7 @@ class OperatorUnequal (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
+		self._observe(args)
 		return BoolValue(evaluator, not args[0].is_equal(evaluator, args[1]))
 
 class OperatorSame (StackBasicOperation):
@@ -558,4 +636,45 @@ class OperatorInvert (StackBasicOperation):
 	def _finish(self, evaluator, args):
 
 		args[0].set_var_value(evaluator, BoolValue(evaluator, not args[0].get_var_value(evaluator).to_bool(evaluator)))
-		return args[0]
\ No newline at end of file
+		return args[0]
+
+# Quickened variants of the operations above
+
+_MultiplyInts = _make_variant('_MultiplyInts', OperatorMultiply, IntValue, IntValue, _operator.mul)
+_MultiplyFloats = _make_variant('_MultiplyFloats', OperatorMultiply, FloatValue, FloatValue, _operator.mul)
+_set_variants(OperatorMultiply, _MultiplyInts, _MultiplyFloats)
+
+_AddInts = _make_variant('_AddInts', OperatorAdd, IntValue, IntValue, _operator.add)
+_AddFloats = _make_variant('_AddFloats', OperatorAdd, FloatValue, FloatValue, _operator.add)
+_AddStrings = _make_variant('_AddStrings', OperatorAdd, StringValue, StringValue, _operator.add)
+_set_variants(OperatorAdd, _AddInts, _AddFloats, _AddStrings)
+
+_SubtractInts = _make_variant('_SubtractInts', OperatorSubtract, IntValue, IntValue, _operator.sub)
+_SubtractFloats = _make_variant('_SubtractFloats', OperatorSubtract, FloatValue, FloatValue, _operator.sub)
+_set_variants(OperatorSubtract, _SubtractInts, _SubtractFloats)
+
+_GreaterInts = _make_variant('_GreaterInts', OperatorGreater, IntValue, BoolValue, _operator.gt)
+_GreaterFloats = _make_variant('_GreaterFloats', OperatorGreater, FloatValue, BoolValue, _operator.gt)
+_set_variants(OperatorGreater, _GreaterInts, _GreaterFloats)
+
+_LessInts = _make_variant('_LessInts', OperatorLess, IntValue, BoolValue, _operator.lt)
+_LessFloats = _make_variant('_LessFloats', OperatorLess, FloatValue, BoolValue, _operator.lt)
+_set_variants(OperatorLess, _LessInts, _LessFloats)
+
+_GreaterEqualInts = _make_variant('_GreaterEqualInts', OperatorGreaterEqual, IntValue, BoolValue, _operator.ge)
+_GreaterEqualFloats = _make_variant('_GreaterEqualFloats', OperatorGreaterEqual, FloatValue, BoolValue, _operator.ge)
+_set_variants(OperatorGreaterEqual, _GreaterEqualInts, _GreaterEqualFloats)
+
+_LessEqualInts = _make_variant('_LessEqualInts', OperatorLessEqual, IntValue, BoolValue, _operator.le)
+_LessEqualFloats = _make_variant('_LessEqualFloats', OperatorLessEqual, FloatValue, BoolValue, _operator.le)
+_set_variants(OperatorLessEqual, _LessEqualInts, _LessEqualFloats)
+
+_EqualInts = _make_variant('_EqualInts', OperatorEqual, IntValue, BoolValue, _operator.eq)
+_EqualFloats = _make_variant('_EqualFloats', OperatorEqual, FloatValue, BoolValue, _operator.eq)
+_EqualStrings = _make_variant('_EqualStrings', OperatorEqual, StringValue, BoolValue, _operator.eq)
+_set_variants(OperatorEqual, _EqualInts, _EqualFloats, _EqualStrings)
+
+_UnequalInts = _make_variant('_UnequalInts', OperatorUnequal, IntValue, BoolValue, _operator.ne)
+_UnequalFloats = _make_variant('_UnequalFloats', OperatorUnequal, FloatValue, BoolValue, _operator.ne)
+_UnequalStrings = _make_variant('_UnequalStrings', OperatorUnequal, StringValue, BoolValue, _operator.ne)
+_set_variants(OperatorUnequal, _UnequalInts, _UnequalFloats, _UnequalStrings)
\ No newline at end of file
@@ -196,6 +196,15 @@ class IfStatement (StackOperation):
 			return BoolValue(evaluator, True)
 		self._step += 1
 
+# Returns the step a loop is on once it's run `hot_loop_threshold` iterations,
+# for loops that take `steps` steps per iteration after the first `start` steps,
+# or None if the evaluator doesn't compile loops
+
+def _get_hot_step(evaluator, steps, start):
+
+	threshold = evaluator.get_hot_loop_threshold()
+	return None if (threshold is None) else threshold * steps + start
+
 class WhileLoopStatement (StackOperation):
 
 	def __init__(self, args, line, value_type, eval_vars):
@@ -211,7 +220,16 @@ class WhileLoopStatement (StackOperation):
 		# This will need to be performed before every loop iteration
 		# to make sure it still should be run
 
+		# Once the loop has run `hot_loop_threshold` iterations, the evaluator can
+		# compile it and run the rest of it in one go (see `TieredEvaluator`)
+
 		if (self._step % 2 == 0):
+			if (self._step == 0):
+				self._hot_step = _get_hot_step(evaluator, 2, 0)
+			elif (self._step == self._hot_step and not self._used_break):
+				loop = evaluator.compile_hot_while(self._args, self._line)
+				if (loop is not None):
+					return loop()
 			evaluator.request_value(self._args['condition'], ScriptValue)
 		elif (self._step % 2 == 1):
 
@@ -257,6 +275,7 @@ class ForLoopStatement (StackOperation):
 			evaluator.request_value(self._args['list'], ListValue)
 		elif (self._step == 2):
 			self._list = last_value
+			self._hot_step = _get_hot_step(evaluator, 1, 2)
 
 		# Third iteration and onward: Run the loop body
 
@@ -266,12 +285,19 @@ class ForLoopStatement (StackOperation):
 			# Can also finish by using `break`
 			# Returns whether the block was run
 
-			if (self._step - 2 >= len(self._list.get_list()) or self._used_break):
+			if (self._step - 2 >= len(self._list.view_list()) or self._used_break):
 				return BoolValue(evaluator, self._step > 2)
 
+			# Hot loops can be compiled, like while loops
+
+			if (self._step == self._hot_step):
+				loop = evaluator.compile_hot_for(self._args, self._line)
+				if (loop is not None):
+					return loop(self._iterator, self._list, self._step - 2)
+
 			# Increment iterator, then run the block
 
-			self._iterator.set_var_value(evaluator, self._list.get_list()[self._step - 2])
+			self._iterator.set_var_value(evaluator, self._list.view_list()[self._step - 2])
 			evaluator.request_value(self._args['body'], ScriptValue)
 
 		self._step += 1
@@ -372,7 +398,7 @@ class LengthStatement (StackBasicOperation):
 		if (isinstance(args[0], StringValue)):
 			return IntValue(evaluator, len(args[0].get_value()))
 		elif (isinstance(args[0], ListValue)):
-			return IntValue(evaluator, len(args[0].get_list()))
+			return IntValue(evaluator, len(args[0].view_list()))
 		elif (isinstance(args[0], ObjectValue)):
 			return IntValue(evaluator, len(args[0].get_dict()))
 		else:
@@ -395,7 +421,7 @@ class SliceStatement (StackBasicOperation):
 		if (isinstance(args[0], StringValue)):
 			return StringValue(evaluator, args[0].get_value()[args[1].get_value():args[2].get_value()])
 		elif (isinstance(args[0], ListValue)):
-			return ListValue(evaluator, args[0].get_list()[args[1].get_value():args[2].get_value()])
+			return ListValue(evaluator, args[0].view_list()[args[1].get_value():args[2].get_value()])
 		else:
 			evaluator.unmatched_type_error(args[0], [StringValue, ListValue])
 
@@ -415,7 +441,7 @@ class SliceAfterStatement (StackBasicOperation):
 		if (isinstance(args[0], StringValue)):
 			return StringValue(evaluator, args[0].get_value()[args[1].get_value():])
 		elif (isinstance(args[0], ListValue)):
-			return ListValue(evaluator, args[0].get_list()[args[1].get_value():])
+			return ListValue(evaluator, args[0].view_list()[args[1].get_value():])
 		else:
 			evaluator.unmatched_type_error(args[0], [StringValue, ListValue])
 
@@ -453,10 +479,10 @@ class StringJoinStatement (StackBasicOperation):
 
 		# Return empty string if source is empty
 
-		if (not args[0].get_list()):
+		if (not args[0].view_list()):
 			return StringValue(evaluator, "")
 		else:
-			return StringValue(evaluator, args[1].get_value().join([s.to_string(evaluator) for s in args[0].get_list()]))
+			return StringValue(evaluator, args[1].get_value().join([s.to_string(evaluator) for s in args[0].view_list()]))
 
 # String & list: try to find index, return -1 if cannot
 # Object: try to find key (arbitrary choice if multiple), otherwise return null
@@ -476,7 +502,13 @@ class FindStatement (StackBasicOperation):
 			evaluator.assert_type(args[1], StringValue)
 			return IntValue(evaluator, args[0].get_value().find(args[1].get_value()))
 		elif (isinstance(args[0], ListValue)):
-			for i, value in enumerate(args[0].get_list()):
+			packed = args[0].get_packed()
+			if (packed is not None):
+				try:
+					return IntValue(evaluator, packed.get_array().index(evaluator.assert_type(args[1], NumericValue).get_value()))
+				except (CatchableError, ValueError):
+					return IntValue(evaluator, -1)
+			for i, value in enumerate(args[0].view_list()):
 				if (value.is_equal(evaluator, args[1])):
 					return IntValue(evaluator, i)
 			return IntValue(evaluator, -1)
@@ -537,7 +569,7 @@ class ListAppendStatement (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
-		args[0].get_list().append(args[1])
+		args[0].append(args[1])
 		return args[0]
 
 # Pops value from list/object, returning the removed value
@@ -555,10 +587,10 @@ class ContainerPopStatement (StackBasicOperation):
 
 		if (isinstance(args[0], ListValue)):
 			evaluator.assert_type(args[1], IntegerValue)
-			size = len(args[0].get_list())
+			size = len(args[0].view_list())
 			if not (-size <= args[1].get_value() < size):
 				raise CatchableError('invalid_index', "List index %s out of bounds" % args[1].get_value())
-			return args[0].get_list().pop(args[1].get_value())
+			return args[0].pop(args[1].get_value())
 		else:
 			evaluator.assert_type(args[1], StringValue)
 			if (args[1].get_value() not in args[0].get_dict()):
@@ -575,7 +607,7 @@ class RangeStatement (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
-		return ListValue(evaluator, [IntValue(evaluator, a) for a in range(args[0].get_value())])
+		return ListValue.from_ints(evaluator, range(args[0].get_value()))
 
 class AdvancedRangeStatement (StackBasicOperation):
 
@@ -594,7 +626,7 @@ class AdvancedRangeStatement (StackBasicOperation):
 		# Luckily, Python already works like this
 
 		range_iter = range(args[0].get_value(), args[1].get_value(), args[2].get_value())
-		return ListValue(evaluator, [IntValue(evaluator, a) for a in range_iter])
+		return ListValue.from_ints(evaluator, range_iter)
 
 class FunctionStatement (StackOperation):
 
@@ -636,6 +668,19 @@ class ReturnStatement (StackBasicOperation):
 		evaluator.raise_interrupt(ReturnInterrupt(evaluator.get_line(), args[0]))
 		return NullValue(evaluator)
 
+# Creates the variable scope for calling `function` with a list of argument values
+# The number of arguments must match the number of parameters in the definition
+
+def _make_call_scope(evaluator, function, arg_values):
+
+	parameters = function.get_parameters(evaluator)
+	if (len(parameters) != len(arg_values)):
+		raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+	scope = ObjectValue(evaluator)
+	for i in range(len(parameters)):
+		scope.set_field(evaluator, parameters[i], arg_values[i])
+	return scope
+
 class CallStatement (StackOperation):
 
 	def __init__(self, args, line, value_type, eval_vars):
@@ -659,22 +704,9 @@ class CallStatement (StackOperation):
 
 		elif (self._step == 2):
 
-			# The number of arguments must match the number of parameters in the definition
-
-			arg_values = last_value.get_list()
-			parameters = self._func.get_parameters(evaluator)
-			if (len(parameters) != len(arg_values)):
-				raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
-
-			# Create a new variable scope, and initialize the function's variables within it
-
-			scope = ObjectValue(evaluator)
-			for i in range(len(parameters)):
-				scope.set_field(evaluator, parameters[i], arg_values[i])
-			evaluator.add_function_scope(scope)
-
-			# Run the function's body
+			# Run the function's body in a new variable scope
 
+			evaluator.add_function_scope(_make_call_scope(evaluator, self._func, last_value.view_list()))
 			evaluator.request_value(self._func.get_body(), ScriptValue)
 
 		# This will be bypassed if a return statement is used
@@ -682,6 +714,8 @@ class CallStatement (StackOperation):
 
 		else:
 			evaluator.pop_function_scope()
+			if (self._call_line is not None):
+				self._line = self._call_line
 			return NullValue(evaluator) if (self._return_value is None) else self._return_value
 
 		self._step += 1
@@ -689,18 +723,34 @@ class CallStatement (StackOperation):
 	# Exit on return interrupt
 	# Error on continue/break interrupt, since
 	# continue/break cannot propogate past function scope
-	# Make sure to remove scope for unhandled interrupts
+	# Make sure to remove scope for unhandled interrupts,
+	# but only if the function's body was reached and the scope was added
+
+	# A tail call replaces the function that's running and its scope, and until the
+	# call finishes, errors are reported on the line of the tail call,
+	# as they would be by the CallStatement it replaces
+
+	_call_line = None
 
 	def handle_interrupt(self, evaluator, interrupt):
 
-		if (isinstance(interrupt, ReturnInterrupt)):
+		if (isinstance(interrupt, TailCallInterrupt)):
+			evaluator.handle_interrupt()
+			evaluator.pop_function_scope()
+			if (self._call_line is None):
+				self._call_line = self._line
+			self._line = interrupt.get_line()
+			self._func = interrupt.function
+			evaluator.add_function_scope(interrupt.scope)
+			evaluator.request_value(self._func.get_body(), ScriptValue)
+		elif (isinstance(interrupt, ReturnInterrupt)):
 			self._return_value = interrupt.value
 			evaluator.handle_interrupt()
 		elif (isinstance(interrupt, ContinueInterrupt)):
 			raise CWRuntimeError("Invalid use of continue", evaluator.get_line())
 		elif (isinstance(interrupt, BreakInterrupt)):
 			raise CWRuntimeError("Invalid use of break", evaluator.get_line())
-		else:
+		elif (self._step > 2):
 			evaluator.pop_function_scope()
 
 # Creates an empty object and runs a code block on it
@@ -727,6 +777,7 @@ class NewObjectStatement (StackOperation):
 
 	# Return can be used in objects
 	# The return value will be ignored, however
+	# The object's scope is removed if an exception passes through
 
 	def handle_interrupt(self, evaluator, interrupt):
 
@@ -736,6 +787,8 @@ class NewObjectStatement (StackOperation):
 			raise CWRuntimeError("Invalid use of continue", evaluator.get_line())
 		elif (isinstance(interrupt, BreakInterrupt)):
 			raise CWRuntimeError("Invalid use of break", evaluator.get_line())
+		else:
+			evaluator.pop_function_scope()
 
 # Creates a shallow copy of object
 
@@ -750,7 +803,7 @@ class CopyStatement (StackBasicOperation):
 	def _finish(self, evaluator, args):
 
 		if (isinstance(args[0], ListValue)):
-			return ListValue(evaluator, args[0].get_list().copy())
+			return args[0].copy(evaluator)
 		else:
 			o = ObjectValue(evaluator)
 			o.set_dict(args[0].get_dict().copy())
@@ -925,10 +978,13 @@ class MaxListStatement (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
-		if (not args[0].get_list()):
+		if (not args[0].view_list()):
 			raise CatchableError('invalid_argument', "List cannot be empty")
-		val = args[0].get_list()[0]
-		for n in args[0].get_list()[1:]:
+		packed = args[0].get_packed()
+		if (packed is not None):
+			return packed.box(max(packed.get_array()))
+		val = args[0].view_list()[0]
+		for n in args[0].view_list()[1:]:
 			if (evaluator.assert_type(n, NumericValue).get_value() > val.get_value()):
 				val = n
 		return val
@@ -943,10 +999,13 @@ class MinListStatement (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
-		if (not args[0].get_list()):
+		if (not args[0].view_list()):
 			raise CatchableError('invalid_argument', "List cannot be empty")
-		val = args[0].get_list()[0]
-		for n in args[0].get_list()[1:]:
+		packed = args[0].get_packed()
+		if (packed is not None):
+			return packed.box(min(packed.get_array()))
+		val = args[0].view_list()[0]
+		for n in args[0].view_list()[1:]:
 			if (evaluator.assert_type(n, NumericValue).get_value() < val.get_value()):
 				val = n
 		return val
@@ -1193,7 +1252,7 @@ class RandomChoiceStatement (StackBasicOperation):
 
 	def _finish(self, evaluator, args):
 
-		lst = args[0].get_list()
+		lst = args[0].view_list()
 		if (not lst):
 			return NullValue(evaluator)
 		else:
@@ -0,0 +1,170 @@
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.parser.ast import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+from cwscript.evaluator.code_evaluator import CodeEvaluator
+from cwscript.evaluator.closure_evaluator import ClosureEvaluator
+from cwscript.evaluator.compiled_evaluator import _InterruptSignal, _BreakSignal, _ContinueSignal
+
+# Compiles hot loops for a `TieredEvaluator` with the same closures as `ClosureEvaluator`
+# It shares the evaluator's scopes and RNG, so compiled code sees the same state
+# as the operations on the stack around it
+
+class _LoopCompiler (ClosureEvaluator):
+
+	def __init__(self, host, scopes):
+
+		self._host = host
+		self._line = 0
+		self._scopes = scopes
+		self._bodies = {}
+
+	# Fused operations are only ever run by the stack, so they're only compiled here
+
+	def _compile(self, node, value_type, eval_vars, line):
+
+		if (isinstance(node, ASTOperation) and node.get_operation() in _FUSED_COMPILERS):
+			return _FUSED_COMPILERS[node.get_operation()](self, node, value_type, eval_vars)
+		return super()._compile(node, value_type, eval_vars, line)
+
+	def get_seed(self):
+
+		return self._host.get_seed()
+
+	def get_rng(self):
+
+		return self._host.get_rng()
+
+	def set_rng(self, value):
+
+		self._host.set_rng(value)
+
+	def next_rng(self):
+
+		return self._host.next_rng()
+
+	# Each returns a function that runs the rest of a loop that's already
+	# run at least one iteration on the stack, and returns its value
+
+	# After a break, the condition is still checked one last time before the loop exits
+
+	def compile_while(self, args, line):
+
+		condition = self._compile(args['condition'], ScriptValue, True, line)
+		body = self._compile(args['body'], ScriptValue, True, line)
+		def run():
+			while (condition().to_bool(self)):
+				try:
+					body()
+				except _BreakSignal:
+					condition()
+					break
+				except _ContinueSignal:
+					pass
+			return BoolValue(self, True)
+		return self._wrap(run, line)
+
+	# The loop picks up at `index`, with `variable` and `source` already evaluated
+
+	def compile_for(self, args, line):
+
+		body = self._compile(args['body'], ScriptValue, True, line)
+		def run(variable, source, index):
+			while (index < len(source.view_list())):
+				self._line = line
+				variable.set_var_value(self, source.view_list()[index])
+				index += 1
+				try:
+					body()
+				except _BreakSignal:
+					break
+				except _ContinueSignal:
+					pass
+			return BoolValue(self, True)
+		return self._wrap(run, line)
+
+	# Anything that leaves the loop is raised again on the stack, and the loop
+	# returns None so that it's passed on from there
+	# Built-in errors are turned into exceptions while `_line` is still the line they were raised on
+
+	def _wrap(self, function, line):
+
+		def run(*args):
+			self._line = line
+			try:
+				return self._run_deep(lambda args: function(*args), args)
+			except _InterruptSignal as signal:
+				self._host.raise_interrupt(signal.interrupt)
+			except CatchableError as error:
+				self._host.raise_interrupt(self.make_exception(error.type, error.body))
+			return None
+		return run
+
+_FUSED_COMPILERS = {
+	FusedAssignAdd: ClosureEvaluator._compile_single_step,
+	FusedIncrement: ClosureEvaluator._compile_single_step,
+	FusedDecrement: ClosureEvaluator._compile_single_step,
+	FusedListAppend: ClosureEvaluator._compile_single_step,
+	FusedWhileCompare: ClosureEvaluator._compile_while
+}
+
+# A `CodeEvaluator` that compiles loops once they get hot
+# Loops count their own iterations, and once one has run `hot_loop_threshold`
+# of them on the stack, its condition and body are compiled into closures
+# (see `ClosureEvaluator`) and the rest of the loop runs as a single step
+# Each loop is only compiled once, and is reused every time it gets hot after that
+
+# A loop that contains something the closure compiler doesn't support, or that's
+# nested too deeply to compile, is left on the stack, which is also remembered
+# so it's never tried again
+# Setting `hot_loop_threshold` to None turns compiling off
+
+class TieredEvaluator (CodeEvaluator):
+
+	def __init__(self, root, hot_loop_threshold = HOT_LOOP_THRESHOLD):
+
+		super().__init__(root)
+		self._hot_loop_threshold = hot_loop_threshold
+		self._compiler = _LoopCompiler(self, self._scopes)
+		self._loops = {}
+		self._tiered_runs = 0
+
+	def get_hot_loop_threshold(self):
+
+		return self._hot_loop_threshold
+
+	def compile_hot_while(self, args, line):
+
+		return self._compile_hot_loop(self._compiler.compile_while, args, line)
+
+	def compile_hot_for(self, args, line):
+
+		return self._compile_hot_loop(self._compiler.compile_for, args, line)
+
+	# Loops are told apart by their body, since no two loops share one
+
+	def _compile_hot_loop(self, compile_loop, args, line):
+
+		key = args['body']
+		if (key not in self._loops):
+			try:
+				self._loops[key] = self._compiler._run_deep(lambda args: compile_loop(args, line), args)
+			except (UnsupportedError, RecursionError):
+				self._loops[key] = None
+		if (self._loops[key] is not None):
+			self._tiered_runs += 1
+		return self._loops[key]
+
+	# `compiled_loops` and `stack_loops` count loops that got hot, and whether they could be compiled
+	# `tiered_runs` counts how many times a loop switched to its compiled version
+
+	def get_tiering_stats(self):
+
+		compiled = len([loop for loop in self._loops.values() if (loop is not None)])
+		return {
+			'hot_loop_threshold': self._hot_loop_threshold,
+			'compiled_loops': compiled,
+			'stack_loops': len(self._loops) - compiled,
+			'tiered_runs': self._tiered_runs
+		}
\ No newline at end of file
@@ -0,0 +1,210 @@
+import sys
+
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.parser import ast_cache
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+from cwscript.evaluator.code_evaluator import CodeEvaluator
+from cwscript.evaluator.compiled_evaluator import CompiledEvaluator, _ExceptionSignal
+from cwscript.evaluator.transpiler import *
+
+# Thrown exceptions are raised as an `_ExceptionSignal`, and caught
+# by generated try/except blocks like a CatchableError would be
+
+# Raised by `continue` or `break` outside of any loop in a function body,
+# which is an error on the line of the call
+
+class _JumpSignal (Exception):
+
+	def __init__(self, message):
+
+		self.message = message
+
+# Returned by a function body that ends with a tail call, for call() to run in its place
+
+class _TailCall:
+
+	def __init__(self, function, scope, line):
+
+		self.function = function
+		self.scope = scope
+		self.line = line
+
+# An alternative to `CodeEvaluator` that translates the AST into Python source
+# (see `PythonTranspiler`), compiles it with compile() and runs the result
+# Built-ins still run through each operation's own _finish(), so all evaluators
+# share the same implementation of them
+
+# No line is tracked while the code runs
+# Instead, get_line() finds the innermost frame of generated code and looks its
+# Python line number up in the line table, and errors that were raised further
+# down are given the line they were raised on from their traceback
+
+# The compiled code can be cached on disk next to the AST cache (see `ast_cache`),
+# keyed by a hash of the generated source
+# Code the transpiler can't handle raises UnsupportedError, in which case
+# create_transpiled_evaluator() falls back to `CodeEvaluator`
+
+class TranspiledEvaluator (CompiledEvaluator):
+
+	def __init__(self, root, source_path = None, cache_dir = None):
+
+		self._main = root
+		self._line = root.get_line()
+		self._scopes = [ObjectValue(self)]
+		self._rng = self.get_seed()
+
+		transpiler = PythonTranspiler(self)
+		try:
+			self._run_deep(transpiler.transpile, root)
+		except RecursionError:
+			raise UnsupportedError("Code is nested too deeply to transpile")
+		self._line_table = transpiler.get_line_table()
+		code = self._compile(transpiler.get_source(), source_path, cache_dir)
+
+		namespace = transpiler.get_namespace()
+		namespace.update({
+			'CatchableError': CatchableError,
+			'CWRuntimeError': CWRuntimeError,
+			'ExceptionInterrupt': ExceptionInterrupt,
+			'ExceptionSignal': _ExceptionSignal,
+			'JumpSignal': _JumpSignal,
+			'GS': self._scopes[0],
+			'G': self._scopes[0].get_dict()
+		})
+		exec(code, namespace)
+		self._statements = [namespace[name] for name in transpiler.get_statements()]
+		self._bodies = {body: namespace[name] for body, name in transpiler.get_bodies().items()}
+		self._pc = 0
+
+	# Loads the compiled code from the cache if it's there, or compiles and caches it
+	# Python refuses some valid code, like blocks nested too deeply, which is left unsupported
+
+	def _compile(self, source, source_path, cache_dir):
+
+		path = None
+		if (source_path is not None or cache_dir is not None):
+			key = ast_cache.get_key(source)
+			path = ast_cache.get_cache_path(key, source_path, cache_dir, ast_cache.CODE_CACHE_EXTENSION)
+			code = ast_cache.load_code(path, key)
+			if (code is not None):
+				return code
+		try:
+			code = self._run_deep(lambda source: compile(source, TRANSPILED_FILENAME, 'exec'), source)
+		except (SyntaxError, RecursionError, MemoryError, ValueError) as error:
+			raise UnsupportedError(f"Generated code could not be compiled: {error}")
+		if (path is not None):
+			ast_cache.store_code(path, key, code)
+		return code
+
+	def _run_statement(self, statement):
+
+		scope = self._scopes[0]
+		statement(self, scope, scope.get_dict())
+
+	def _get_error_line(self, error):
+
+		return self._get_traceback_line(error.__traceback__)
+
+	# Only called when something goes wrong, so walking the stack is cheap overall
+
+	def get_line(self):
+
+		frame = sys._getframe(1)
+		while (frame is not None):
+			if (frame.f_code.co_filename == TRANSPILED_FILENAME):
+				line = self._line_table[frame.f_lineno]
+				if (line is not None):
+					return line
+			frame = frame.f_back
+		return self._line
+
+	# Same as get_line(), for where an error was raised rather than where it was caught
+
+	def _get_traceback_line(self, traceback):
+
+		output = self._line
+		while (traceback is not None):
+			if (traceback.tb_frame.f_code.co_filename == TRANSPILED_FILENAME):
+				line = self._line_table[traceback.tb_lineno]
+				if (line is not None):
+					output = line
+			traceback = traceback.tb_next
+		return output
+
+	def request_value(self, node, value_type, eval_vars = True):
+
+		raise RuntimeError("Transpiled evaluator cannot request values")
+
+	def raise_interrupt(self, interrupt):
+
+		if (not isinstance(interrupt, ExceptionInterrupt)):
+			raise RuntimeError("Transpiled evaluator can only raise exceptions")
+		raise _ExceptionSignal(interrupt)
+
+	def handle_interrupt(self):
+
+		pass
+
+	# Returns the exception object for an error caught by a try/catch statement
+
+	def catch_error(self, error):
+
+		if (isinstance(error, _ExceptionSignal)):
+			return error.interrupt.value
+		return self.make_exception(error.type, error.body, self._get_traceback_line(error.__traceback__)).value
+
+	# Called by generated code to call a function, and returns its value
+	# The scope is removed again if an exception passes through
+	# A body that returns a tail call is replaced by the function it calls, in the same
+	# scope slot, and until the call finishes, errors are reported on the line of the tail call
+
+	def call(self, function, args):
+
+		scope = self._make_scope(function, args)
+		self.add_function_scope(scope)
+
+		line = None
+		while (True):
+			try:
+				output = self._bodies[function.get_body()](self, scope, scope.get_dict())
+			except (_ExceptionSignal, CatchableError):
+				self.pop_function_scope()
+				raise
+			except _JumpSignal as signal:
+				raise CWRuntimeError(signal.message, self.get_line() if (line is None) else line)
+			if (type(output) is not _TailCall):
+				break
+			self.pop_function_scope()
+			function, scope, line = output.function, output.scope, output.line
+			self.add_function_scope(scope)
+		self.pop_function_scope()
+		return output
+
+	# Called by generated code for a tail call, which its function body then returns
+	# The arguments are checked here, so errors are raised in the body that made the call
+
+	def tail_call(self, function, args, line):
+
+		return _TailCall(function, self._make_scope(function, args), line)
+
+	def _make_scope(self, function, args):
+
+		arg_values = args.view_list()
+		parameters = function.get_parameters(self)
+		if (len(parameters) != len(arg_values)):
+			raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+		scope = ObjectValue(self)
+		for i in range(len(parameters)):
+			scope.set_field(self, parameters[i], arg_values[i])
+		return scope
+
+# Runs `root` with a `TranspiledEvaluator` if it can, and with `CodeEvaluator` otherwise
+
+def create_transpiled_evaluator(root, source_path = None, cache_dir = None):
+
+	try:
+		return TranspiledEvaluator(root, source_path, cache_dir)
+	except UnsupportedError:
+		return CodeEvaluator(root)
\ No newline at end of file
@@ -0,0 +1,643 @@
+from cwscript.errors import *
+from cwscript.parser.ast import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+
+# Generated code is compiled under this name, which is how its frames are
+# told apart from the rest of the interpreter when looking up lines
+
+TRANSPILED_FILENAME = '<cwscript>'
+
+# A loop that `continue` and `break` can jump out of
+# For while loops, `condition` is checked once more after a break
+
+class _LoopContext:
+
+	def __init__(self, condition, line):
+
+		self.condition = condition
+		self.line = line
+
+# A try/catch statement, which `continue` and `break` can't get past
+
+class _BarrierContext:
+
+	def __init__(self, line):
+
+		self.line = line
+
+# Translates the AST into the source of a Python module (see `TranspiledEvaluator`)
+
+# Every top-level statement, function body and object body becomes a Python function
+# taking the evaluator and the current scope, both as an object (`S`) and as the dict
+# of its fields (`L`), while the global scope is always available as `GS` and `G`
+# Nodes are translated into a series of statements, one per line, each storing
+# its result in a new temporary variable (`t0`, `t1`...) that the next ones use
+# Values that the code needs, like literals and the _finish() of each operation,
+# are given names (`c0`, `c1`...) in the module's namespace
+
+# Control flow becomes Python control flow: loops become `while` loops, functions
+# return with `return`, and thrown exceptions are raised as Python exceptions
+# `continue` and `break` are only translated directly when they're inside a loop
+# in the same function, and are errors otherwise
+
+# Each generated line is tagged with the CWScript line that errors on it should
+# report, using the same rules as `CodeEvaluator` (the line of the operation on
+# top of the stack), and get_line_table() maps Python line numbers to those lines
+# Lines tagged with None report the line of the code that called their function,
+# which is the case for values used directly as function bodies
+
+class PythonTranspiler:
+
+	def __init__(self, evaluator):
+
+		self._evaluator = evaluator
+		self._source = []
+		self._line_table = [None]
+		self._statements = []
+		self._bodies = {}
+		self._queue = []
+		self._namespace = {value_type.__name__: value_type for value_type in _RUNTIME_TYPES}
+		self._namespace['PLAIN_NUMBERS'] = frozenset([IntValue, FloatValue])
+		self._true = self._constant(BoolValue(evaluator, True))
+		self._false = self._constant(BoolValue(evaluator, False))
+
+	# Functions are written one at a time, so bodies found while writing
+	# a function are queued up to be written after it
+
+	def transpile(self, root):
+
+		for node in root.get_children():
+			self._statements.append(self._schedule('statement', node, node.get_line()))
+		index = 0
+		while (index < len(self._queue)):
+			self._write_function(*self._queue[index])
+			index += 1
+
+	def get_source(self):
+
+		return "\n".join(self._source) + "\n"
+
+	# Indexed by the line number of the generated source (starting at 1)
+
+	def get_line_table(self):
+
+		return self._line_table
+
+	# Values that the generated code refers to by name
+
+	def get_namespace(self):
+
+		return self._namespace
+
+	# Names of the functions for each top-level statement, in order
+
+	def get_statements(self):
+
+		return self._statements
+
+	# Names of the functions for each function body, by the body's node
+
+	def get_bodies(self):
+
+		return self._bodies
+
+	def _schedule(self, kind, node, line):
+
+		name = f"_{kind}_{len(self._queue)}"
+		self._queue.append((name, kind, node, line))
+		return name
+
+	def _write_function(self, name, kind, node, line):
+
+		self._kind = kind
+		self._line = line
+		self._lines = []
+		self._indent = 1
+		self._temps = 0
+		self._contexts = []
+
+		self._write(node, ScriptValue, True, line)
+		if (kind == 'function'):
+			self._emit(f"return {self._constant(NullValue(self._evaluator))}", line)
+		elif (not self._lines):
+			self._emit("pass", line)
+
+		self._add_line(f"def {name}(ev, S, L):", line)
+		for indent, text, text_line in self._lines:
+			self._add_line("\t" * indent + text, text_line)
+		self._add_line("", None)
+
+	def _add_line(self, text, line):
+
+		self._source.append(text)
+		self._line_table.append(line)
+
+	def _emit(self, text, line):
+
+		self._lines.append((self._indent, text, line))
+
+	# Python blocks can't be empty, so `pass` is added to any that would be
+
+	def _begin_block(self):
+
+		self._indent += 1
+		return len(self._lines)
+
+	def _end_block(self, start):
+
+		if (len(self._lines) == start):
+			self._emit("pass", None)
+		self._indent -= 1
+
+	def _temp(self):
+
+		name = f"t{self._temps}"
+		self._temps += 1
+		return name
+
+	def _constant(self, value):
+
+		name = f"c{len(self._namespace)}"
+		self._namespace[name] = value
+		return name
+
+	def _type_name(self, value_type):
+
+		self._namespace[value_type.__name__] = value_type
+		return value_type.__name__
+
+	# Nothing is checked if the output is known to be an `output_class`, which is the right type
+
+	def _check_type(self, output, value_type, line, output_class = None):
+
+		if not (value_type is ScriptValue or (output_class is not None and issubclass(output_class, value_type))):
+			value_type = self._type_name(value_type)
+			self._emit(f"if not isinstance({output}, {value_type}): ev.assert_type({output}, {value_type})", line)
+		return output
+
+	# Writes the statements that evaluate `node` the same way as `request_value()`,
+	# and returns the name of the variable (or constant) that holds the result
+	# `line` is the line of the operation requesting the value, which is where
+	# errors are reported if the node is a value rather than an operation
+
+	def _write(self, node, value_type, eval_vars, line):
+
+		if (isinstance(node, ASTOperation)):
+			operation = node.get_operation()
+			if (operation in _OPERATION_WRITERS):
+				return _OPERATION_WRITERS[operation](self, node, value_type, eval_vars)
+			elif (issubclass(operation, StackBasicOperation)):
+				return self._write_basic(node, value_type, eval_vars)
+			else:
+				raise UnsupportedError(f"Transpiler does not support {operation.__name__}")
+
+		dtype = node.get_dtype()
+		if (dtype == ASTNode.TYPE_BLOCK):
+			return self._write_block(node, value_type)
+		elif (dtype == ASTNode.TYPE_LIST):
+			return self._write_list(node, value_type)
+		elif (dtype == ASTNode.TYPE_VARIABLE):
+			return self._write_variable(node, value_type, eval_vars, line)
+		else:
+			return self._write_literal(node, value_type, line)
+
+	def _write_args(self, node, operation):
+
+		return [self._write(node.get_args()[request.name], request.value_type, request.eval_vars, node.get_line())
+			for request in operation.get_arg_requests()]
+
+	# Assignments to a single name can use the dict of the scope directly
+
+	def _get_simple_target(self, node):
+
+		target = node.get_args()['op_1']
+		if not (isinstance(target, ASTValue) and target.get_dtype() == ASTNode.TYPE_VARIABLE):
+			return None
+		is_global, fields = target.get_value()
+		if (len(fields) != 1):
+			return None
+		return is_global, fields
+
+	# VALUES
+
+	# Literal values can't be changed, so each one is only created once
+
+	def _write_literal(self, node, value_type, line):
+
+		value = node.evaluate(self._evaluator, ScriptValue, True)
+		output = self._constant(value)
+		if (not isinstance(value, value_type)):
+			self._emit(f"ev.assert_type({output}, {self._type_name(value_type)})", line)
+		return output
+
+	def _write_variable(self, node, value_type, eval_vars, line):
+
+		is_global, fields = node.get_value()
+		scope, values = ('GS', 'G') if (is_global) else ('S', 'L')
+		output = self._temp()
+		if (eval_vars and len(fields) == 1):
+			name = repr(fields[0])
+			self._emit(f"{output} = {values}[{name}] if ({name} in {values}) else {scope}.get_field(ev, {name})", line)
+		elif (eval_vars):
+			self._emit(f"{output} = VariableValue(ev, {scope}, {self._constant(fields)}).get_var_value(ev)", line)
+		else:
+			self._emit(f"{output} = VariableValue(ev, {scope}, {self._constant(fields)})", line)
+		return self._check_type(output, value_type, line)
+
+	# Like literals, the null a block produces is only created once
+	# A block reports the line of the last statement it ran
+
+	def _write_block(self, node, value_type):
+
+		for child in node.get_value():
+			self._write(child, ScriptValue, True, child.get_line())
+		line = node.get_value()[-1].get_line() if (node.get_value()) else node.get_line()
+		output = self._constant(NullValue(self._evaluator))
+		if (not issubclass(NullValue, value_type)):
+			self._emit(f"ev.assert_type({output}, {self._type_name(value_type)})", line)
+		return output
+
+	def _write_list(self, node, value_type):
+
+		line = node.get_line()
+		items = [self._write(child, ScriptValue, True, line) for child in node.get_value()]
+		output = self._temp()
+		self._emit(f"{output} = ListValue(ev, [{', '.join(items)}])", line)
+		return self._check_type(output, value_type, line, ListValue)
+
+	# OPERATIONS
+
+	# Arguments are evaluated in order, then passed to the operation's _finish()
+	# Variables in the output are evaluated here, like in evaluate_and_check()
+
+	def _write_basic(self, node, value_type, eval_vars):
+
+		operation = node.evaluate(self._evaluator, value_type, eval_vars)
+		line = node.get_line()
+		args = self._write_args(node, operation)
+		output = self._temp()
+		self._emit(f"{output} = {self._constant(operation._finish)}(ev, [{', '.join(args)}])", line)
+		if (eval_vars):
+			self._emit(f"if isinstance({output}, VariableValue): {output} = {output}.get_var_value(ev)", line)
+		return self._check_type(output, value_type, line)
+
+	# Operations that finish in a single step can be run as they are
+
+	def _write_single_step(self, node, value_type, eval_vars):
+
+		evaluate_and_check = node.evaluate(self._evaluator, value_type, eval_vars).evaluate_and_check
+		output = self._temp()
+		self._emit(f"{output} = {self._constant(evaluate_and_check)}(ev, None)", node.get_line())
+		return output
+
+	# Function bodies are written once, however many functions share them
+
+	def _write_function_definition(self, node, value_type, eval_vars):
+
+		body = node.get_args()['body']
+		if (body not in self._bodies):
+			self._bodies[body] = self._schedule('function', body, None)
+		return self._write_single_step(node, value_type, eval_vars)
+
+	# Arithmetic and comparisons have a shortcut for plain numbers, which
+	# are by far the most common operands in loops
+	# Anything else (including errors) goes through the operation's own _finish()
+
+	def _write_arithmetic(self, node, value_type, eval_vars):
+
+		symbol = _ARITHMETIC[node.get_operation()]
+		operation = node.evaluate(self._evaluator, value_type, eval_vars)
+		line = node.get_line()
+		value_1, value_2 = self._write_args(node, operation)
+		output = self._temp()
+		self._emit(f"if {value_1}.__class__ is IntValue and {value_2}.__class__ is IntValue: "
+			f"{output} = IntValue(ev, {value_1}.get_value() {symbol} {value_2}.get_value())", line)
+		self._emit(f"else: {output} = {self._constant(operation._finish)}(ev, [{value_1}, {value_2}])", line)
+		return self._check_type(output, value_type, line)
+
+	def _write_comparison(self, node, value_type, eval_vars):
+
+		symbol = _COMPARISONS[node.get_operation()]
+		operation = node.evaluate(self._evaluator, value_type, eval_vars)
+		line = node.get_line()
+		value_1, value_2 = self._write_args(node, operation)
+		output = self._temp()
+		self._emit(f"if {value_1}.__class__ in PLAIN_NUMBERS and {value_2}.__class__ in PLAIN_NUMBERS: "
+			f"{output} = BoolValue(ev, {value_1}.get_value() {symbol} {value_2}.get_value())", line)
+		self._emit(f"else: {output} = {self._constant(operation._finish)}(ev, [{value_1}, {value_2}])", line)
+		return self._check_type(output, value_type, line)
+
+	def _write_assign(self, node, value_type, eval_vars):
+
+		target = self._get_simple_target(node)
+		if (target is None):
+			return self._write_basic(node, value_type, eval_vars)
+
+		is_global, fields = target
+		scope, values = ('GS', 'G') if (is_global) else ('S', 'L')
+		line = node.get_line()
+		value = self._write(node.get_args()['op_2'], ScriptValue, True, line)
+		self._emit(f"{values}[{fields[0]!r}] = {value}", line)
+		if (eval_vars):
+			output = value
+		else:
+			output = self._temp()
+			self._emit(f"{output} = VariableValue(ev, {scope}, {self._constant(fields)})", line)
+		return self._check_type(output, value_type, line)
+
+	# Compound assignment (`+=`, `-=` and `*=`) has the same shortcut as arithmetic
+	# The variable is read after the value is evaluated, as it would be by _finish()
+
+	def _write_compound_assign(self, node, value_type, eval_vars):
+
+		target = self._get_simple_target(node)
+		if (target is None):
+			return self._write_basic(node, value_type, eval_vars)
+
+		is_global, fields = target
+		scope, values = ('GS', 'G') if (is_global) else ('S', 'L')
+		name = repr(fields[0])
+		symbol = _ARITHMETIC[_COMPOUND_ASSIGNMENTS[node.get_operation()]]
+		operation = node.evaluate(self._evaluator, value_type, eval_vars)
+		variable = f"VariableValue(ev, {scope}, {self._constant(fields)})"
+		line = node.get_line()
+		request = operation.get_arg_requests()[1]
+		value = self._write(node.get_args()['op_2'], request.value_type, request.eval_vars, line)
+		current = self._temp()
+		self._emit(f"{current} = {values}[{name}] if ({name} in {values}) else {scope}.get_field(ev, {name})", line)
+		self._emit(f"if {current}.__class__ is IntValue and {value}.__class__ is IntValue: "
+			f"{values}[{name}] = IntValue(ev, {current}.get_value() {symbol} {value}.get_value())", line)
+		self._emit(f"else: {self._constant(operation._finish)}(ev, [{variable}, {value}])", line)
+		output = self._temp()
+		self._emit(f"{output} = {values}[{name}]" if (eval_vars) else f"{output} = {variable}", line)
+		return self._check_type(output, value_type, line)
+
+	def _write_and(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		output = self._temp()
+		value_1 = self._write(node.get_args()['op_1'], ScriptValue, True, line)
+		self._emit(f"if {value_1}.to_bool(ev):", line)
+		start = self._begin_block()
+		value_2 = self._write(node.get_args()['op_2'], ScriptValue, True, line)
+		self._emit(f"{output} = BoolValue(ev, {value_2}.to_bool(ev))", line)
+		self._end_block(start)
+		self._emit("else:", line)
+		start = self._begin_block()
+		self._emit(f"{output} = {self._false}", line)
+		self._end_block(start)
+		return self._check_type(output, value_type, line)
+
+	def _write_or(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		output = self._temp()
+		value_1 = self._write(node.get_args()['op_1'], ScriptValue, True, line)
+		self._emit(f"if {value_1}.to_bool(ev):", line)
+		start = self._begin_block()
+		self._emit(f"{output} = {self._true}", line)
+		self._end_block(start)
+		self._emit("else:", line)
+		start = self._begin_block()
+		value_2 = self._write(node.get_args()['op_2'], ScriptValue, True, line)
+		self._emit(f"{output} = BoolValue(ev, {value_2}.to_bool(ev))", line)
+		self._end_block(start)
+		return self._check_type(output, value_type, line)
+
+	# CONTROL FLOW
+
+	def _write_if(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		output = self._temp()
+		condition = self._write(node.get_args()['condition'], ScriptValue, True, line)
+		self._emit(f"if {condition}.to_bool(ev):", line)
+		start = self._begin_block()
+		self._write(node.get_args()['body'], ScriptValue, True, line)
+		self._emit(f"{output} = {self._true}", line)
+		self._end_block(start)
+		self._emit("else:", line)
+		start = self._begin_block()
+		self._emit(f"{output} = {self._false}", line)
+		self._end_block(start)
+		return self._check_type(output, value_type, line)
+
+	def _write_while(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		ran = self._temp()
+		self._emit(f"{ran} = False", line)
+		self._emit("while True:", line)
+		start = self._begin_block()
+		condition = self._write(node.get_args()['condition'], ScriptValue, True, line)
+		self._emit(f"if not {condition}.to_bool(ev): break", line)
+		self._emit(f"{ran} = True", line)
+		self._contexts.append(_LoopContext(node.get_args()['condition'], line))
+		self._write(node.get_args()['body'], ScriptValue, True, line)
+		self._contexts.pop()
+		self._end_block(start)
+		output = self._temp()
+		self._emit(f"{output} = {self._true} if {ran} else {self._false}", line)
+		return self._check_type(output, value_type, line)
+
+	# The length of the list is checked on every iteration, since the body can change it
+
+	def _write_for(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		variable = self._write(node.get_args()['iterator'], VariableValue, False, line)
+		source = self._write(node.get_args()['list'], ListValue, True, line)
+		index = self._temp()
+		values = self._temp()
+		self._emit(f"{index} = 0", line)
+		self._emit("while True:", line)
+		start = self._begin_block()
+		self._emit(f"{values} = {source}.view_list()", line)
+		self._emit(f"if {index} >= len({values}): break", line)
+		self._emit(f"{variable}.set_var_value(ev, {values}[{index}])", line)
+		self._emit(f"{index} += 1", line)
+		self._contexts.append(_LoopContext(None, line))
+		self._write(node.get_args()['body'], ScriptValue, True, line)
+		self._contexts.pop()
+		self._end_block(start)
+		output = self._temp()
+		self._emit(f"{output} = {self._true} if {index} > 0 else {self._false}", line)
+		return self._check_type(output, value_type, line)
+
+	# After a break, a while loop's condition is still checked one last time before it exits
+	# Outside of a loop, continue and break are errors on the line of whatever stops them:
+	# a try/catch statement or an object in the same function, the call of the current
+	# function (which is only known when it runs), or the statement itself at the top level
+
+	def _write_jump(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		name = 'continue' if (node.get_operation() is ContinueStatement) else 'break'
+		context = self._contexts[-1] if (self._contexts) else None
+
+		if (isinstance(context, _LoopContext)):
+			if (name == 'break' and context.condition is not None):
+				self._write(context.condition, ScriptValue, True, context.line)
+			self._emit(name, line)
+		elif (isinstance(context, _BarrierContext)):
+			self._emit(f"raise CWRuntimeError('Invalid use of {name}', {context.line})", line)
+		elif (self._kind == 'function'):
+			self._emit(f"raise JumpSignal('Invalid use of {name}')", line)
+		elif (self._kind == 'object'):
+			self._emit(f"raise CWRuntimeError('Invalid use of {name}', {self._line})", line)
+		else:
+			self._emit(f"raise CWRuntimeError('Invalid use of {name}', {line})", line)
+		return self._constant(NullValue(self._evaluator))
+
+	# Returning from an object ends its body, and the value is ignored
+
+	def _write_return(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		operation = node.evaluate(self._evaluator, value_type, eval_vars)
+		value, = self._write_args(node, operation)
+		if (self._kind == 'function'):
+			self._emit(f"return {value}", line)
+		elif (self._kind == 'object'):
+			self._emit("return", line)
+		else:
+			self._emit(f"raise CWRuntimeError('Invalid use of return', {line})", line)
+		return self._constant(NullValue(self._evaluator))
+
+	def _write_throw(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		operation = node.evaluate(self._evaluator, value_type, eval_vars)
+		value, = self._write_args(node, operation)
+		self._emit(f"raise ExceptionSignal(ExceptionInterrupt({line}, {value}))", line)
+		return self._constant(NullValue(self._evaluator))
+
+	# Exceptions from the body are caught, but not those from the catch body
+
+	def _write_try_catch(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		output = self._temp()
+		error = self._temp()
+		self._contexts.append(_BarrierContext(line))
+
+		self._emit("try:", line)
+		start = self._begin_block()
+		self._write(node.get_args()['body'], ScriptValue, True, line)
+		self._end_block(start)
+
+		self._emit(f"except (CatchableError, ExceptionSignal) as {error}:", line)
+		start = self._begin_block()
+		self._emit(f"S.set_field(ev, {self._constant(node.get_args()['error'])}.eval_as_variable(ev), "
+			f"ev.catch_error({error}))", line)
+		self._write(node.get_args()['catch_body'], ScriptValue, True, line)
+		self._emit(f"{output} = {self._false}", line)
+		self._end_block(start)
+
+		self._emit("else:", line)
+		start = self._begin_block()
+		self._emit(f"{output} = {self._true}", line)
+		self._end_block(start)
+
+		self._contexts.pop()
+		return self._check_type(output, value_type, line)
+
+	def _write_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		function = self._write(node.get_args()['function'], FunctionValue, True, line)
+		args = self._write(node.get_args()['args'], ListValue, True, line)
+		output = self._temp()
+		self._emit(f"{output} = ev.call({function}, {args})", line)
+		if (eval_vars):
+			self._emit(f"if isinstance({output}, VariableValue): {output} = {output}.get_var_value(ev)", line)
+		return self._check_type(output, value_type, line)
+
+	# A tail call (see `FusedTailCall`) is only ever in a function body, which returns
+	# the function to call in its place instead of calling it (see `TranspiledEvaluator`)
+
+	def _write_tail_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		function = self._write(node.get_args()['function'], FunctionValue, True, line)
+		args = self._write(node.get_args()['args'], ListValue, True, line)
+		self._emit(f"return ev.tail_call({function}, {args}, {line})", line)
+		return self._constant(NullValue(self._evaluator))
+
+	# The body of an object is a function of its own, so that returning can end it
+
+	def _write_new_object(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		body = self._schedule('object', node.get_args()['body'], line)
+		output = self._temp()
+		self._emit(f"{output} = ObjectValue(ev)", line)
+		self._emit(f"ev.add_function_scope({output})", line)
+		self._emit(f"try: {body}(ev, {output}, {output}.get_dict())", line)
+		self._emit("except (CatchableError, ExceptionSignal): ev.pop_function_scope(); raise", line)
+		self._emit("ev.pop_function_scope()", line)
+		return self._check_type(output, value_type, line, ObjectValue)
+
+# Classes that generated code uses directly
+
+_RUNTIME_TYPES = [ScriptValue, IntValue, FloatValue, BoolValue, ListValue, ObjectValue, VariableValue]
+
+_ARITHMETIC = {
+	OperatorAdd: '+',
+	OperatorSubtract: '-',
+	OperatorMultiply: '*'
+}
+
+_COMPARISONS = {
+	OperatorLess: '<',
+	OperatorGreater: '>',
+	OperatorLessEqual: '<=',
+	OperatorGreaterEqual: '>=',
+	OperatorEqual: '==',
+	OperatorUnequal: '!='
+}
+
+_COMPOUND_ASSIGNMENTS = {
+	OperatorAssignAdd: OperatorAdd,
+	OperatorAssignSubtract: OperatorSubtract,
+	OperatorAssignMultiply: OperatorMultiply
+}
+
+_OPERATION_WRITERS = {
+	OperatorAssign: PythonTranspiler._write_assign,
+	OperatorAssignAdd: PythonTranspiler._write_compound_assign,
+	OperatorAssignSubtract: PythonTranspiler._write_compound_assign,
+	OperatorAssignMultiply: PythonTranspiler._write_compound_assign,
+	OperatorAdd: PythonTranspiler._write_arithmetic,
+	OperatorSubtract: PythonTranspiler._write_arithmetic,
+	OperatorMultiply: PythonTranspiler._write_arithmetic,
+	OperatorLess: PythonTranspiler._write_comparison,
+	OperatorGreater: PythonTranspiler._write_comparison,
+	OperatorLessEqual: PythonTranspiler._write_comparison,
+	OperatorGreaterEqual: PythonTranspiler._write_comparison,
+	OperatorEqual: PythonTranspiler._write_comparison,
+	OperatorUnequal: PythonTranspiler._write_comparison,
+	OperatorAnd: PythonTranspiler._write_and,
+	OperatorOr: PythonTranspiler._write_or,
+	IfStatement: PythonTranspiler._write_if,
+	WhileLoopStatement: PythonTranspiler._write_while,
+	ForLoopStatement: PythonTranspiler._write_for,
+	ContinueStatement: PythonTranspiler._write_jump,
+	BreakStatement: PythonTranspiler._write_jump,
+	ReturnStatement: PythonTranspiler._write_return,
+	ThrowStatement: PythonTranspiler._write_throw,
+	TryCatchStatement: PythonTranspiler._write_try_catch,
+	CallStatement: PythonTranspiler._write_call,
+	FusedTailCall: PythonTranspiler._write_tail_call,
+	NewObjectStatement: PythonTranspiler._write_new_object,
+	FunctionStatement: PythonTranspiler._write_function_definition,
+	LambdaStatement: PythonTranspiler._write_function_definition,
+	LocalScopeStatement: PythonTranspiler._write_single_step,
+	GlobalScopeStatement: PythonTranspiler._write_single_step,
+	RNGGetStatement: PythonTranspiler._write_single_step,
+	RNGResetStatement: PythonTranspiler._write_single_step,
+	RandomFloatStatement: PythonTranspiler._write_single_step,
+	PiStatement: PythonTranspiler._write_single_step,
+	EulerStatement: PythonTranspiler._write_single_step
+}
\ No newline at end of file
@@ -0,0 +1,912 @@
+from operator import add, sub, mul, mod, truediv, lt, gt, le, ge, eq, ne
+
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.parser.ast import *
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+from cwscript.evaluator.closure_evaluator import ClosureEvaluator
+from cwscript.evaluator.compiled_evaluator import _ReturnSignal, _BreakSignal, _ContinueSignal, _ExceptionSignal, _TailCallSignal
+
+# Lists and objects are plain Python lists and dicts, which are only subclassed
+# so that they can't be mistaken for the lists and dicts the evaluator uses itself
+
+class _List (list):
+
+	__slots__ = ()
+
+class _Object (dict):
+
+	__slots__ = ()
+
+# Views of a native list or dict that box values as they're read and unbox them
+# as they're written, so that built-ins can change native containers in place
+# They only support what built-ins and the container values themselves use
+
+class _BoxedList:
+
+	__slots__ = ('_evaluator', '_native')
+
+	def __init__(self, evaluator, native):
+
+		self._evaluator = evaluator
+		self._native = native
+
+	def __len__(self):
+
+		return len(self._native)
+
+	def __iter__(self):
+
+		return (_box(self._evaluator, value) for value in self._native)
+
+	# Slices are new lists, so they're returned as plain lists of boxed values
+
+	def __getitem__(self, index):
+
+		if (isinstance(index, slice)):
+			return [_box(self._evaluator, value) for value in self._native[index]]
+		return _box(self._evaluator, self._native[index])
+
+	def __setitem__(self, index, value):
+
+		self._native[index] = _unbox(value)
+
+	def __add__(self, other):
+
+		return list(self) + list(other)
+
+	def append(self, value):
+
+		self._native.append(_unbox(value))
+
+	def pop(self, index = -1):
+
+		return _box(self._evaluator, self._native.pop(index))
+
+	def copy(self):
+
+		return list(self)
+
+class _BoxedDict:
+
+	__slots__ = ('_evaluator', '_native')
+
+	def __init__(self, evaluator, native):
+
+		self._evaluator = evaluator
+		self._native = native
+
+	def __len__(self):
+
+		return len(self._native)
+
+	def __iter__(self):
+
+		return iter(self._native)
+
+	def __contains__(self, key):
+
+		return key in self._native
+
+	def __getitem__(self, key):
+
+		return _box(self._evaluator, self._native[key])
+
+	def __setitem__(self, key, value):
+
+		self._native[key] = _unbox(value)
+
+	def keys(self):
+
+		return self._native.keys()
+
+	def values(self):
+
+		return [_box(self._evaluator, value) for value in self._native.values()]
+
+	def items(self):
+
+		return [(key, _box(self._evaluator, value)) for key, value in self._native.items()]
+
+	def get(self, key, default):
+
+		return _box(self._evaluator, self._native[key]) if (key in self._native) else default
+
+	def setdefault(self, key, default):
+
+		return _box(self._evaluator, self._native.setdefault(key, _unbox(default)))
+
+	def pop(self, key):
+
+		return _box(self._evaluator, self._native.pop(key))
+
+	def copy(self):
+
+		return dict(self.items())
+
+# The values built-ins see for native lists and objects
+# A new one is made every time a container is boxed, so two of them are the same
+# value (for `===`) when they're views of the same container
+
+class _ListAdapter (ListValue):
+
+	__slots__ = ()
+
+	def is_same(self, evaluator, other):
+
+		return (isinstance(other, _ListAdapter) and other.view_list()._native is self.view_list()._native)
+
+	# The view can't be shared, since it has to keep writing to the native list
+
+	def copy(self, evaluator):
+
+		return ListValue(evaluator, self.view_list().copy())
+
+class _ObjectAdapter (ObjectValue):
+
+	__slots__ = ()
+
+	def is_same(self, evaluator, other):
+
+		return (isinstance(other, _ObjectAdapter) and other.get_dict()._native is self.get_dict()._native)
+
+# BOXING
+
+def _box_null(evaluator, value):
+
+	return NullValue(evaluator)
+
+def _box_list(evaluator, value):
+
+	output = object.__new__(_ListAdapter)
+	output.set_list(_BoxedList(evaluator, value))
+	return output
+
+def _box_object(evaluator, value):
+
+	output = object.__new__(_ObjectAdapter)
+	output.set_dict(_BoxedDict(evaluator, value))
+	return output
+
+def _box_self(evaluator, value):
+
+	return value
+
+_BOXERS = {
+	type(None): _box_null,
+	bool: BoolValue,
+	int: IntValue,
+	float: FloatValue,
+	str: StringValue,
+	_List: _box_list,
+	_Object: _box_object,
+	FunctionValue: _box_self,
+	VariableValue: _box_self
+}
+
+# Returns the `ScriptValue` for a native value
+
+def _box(evaluator, value):
+
+	return _BOXERS[type(value)](evaluator, value)
+
+# Lists and objects made by built-ins are copied into native containers,
+# while the values they hold that were boxed from native ones are unboxed in place
+
+def _unbox_null(value):
+
+	return None
+
+def _unbox_bool(value):
+
+	return value.to_bool(None)
+
+def _unbox_list(value):
+
+	return _List([_unbox(item) for item in value.view_list()])
+
+def _unbox_object(value):
+
+	return _Object([(key, _unbox(item)) for key, item in value.get_dict().items()])
+
+def _unbox_list_adapter(value):
+
+	return value.view_list()._native
+
+def _unbox_object_adapter(value):
+
+	return value.get_dict()._native
+
+_UNBOXERS = {
+	NullValue: _unbox_null,
+	BoolValue: _unbox_bool,
+	IntValue: IntValue.get_value,
+	FloatValue: FloatValue.get_value,
+	StringValue: StringValue.get_value,
+	ListValue: _unbox_list,
+	ObjectValue: _unbox_object,
+	_ListAdapter: _unbox_list_adapter,
+	_ObjectAdapter: _unbox_object_adapter
+}
+
+# Returns the native value for a `ScriptValue`
+# Functions and variables are their own native values, and anything
+# that's already native is returned as it is
+
+def _unbox(value):
+
+	unbox = _UNBOXERS.get(type(value))
+	return value if (unbox is None) else unbox(value)
+
+# The native types each value type stands for, which are checked with type() instead
+# of isinstance(), since bools would otherwise pass for ints
+# `ScriptValue` is left out, since anything passes for it
+
+_NATIVE_TYPES = {
+	NullValue: frozenset([type(None)]),
+	NumericValue: frozenset([bool, int, float]),
+	IntegerValue: frozenset([bool, int]),
+	BoolValue: frozenset([bool]),
+	IntValue: frozenset([int]),
+	FloatValue: frozenset([float]),
+	StringValue: frozenset([str]),
+	MutableValue: frozenset([_List, _Object, FunctionValue]),
+	ContainerValue: frozenset([_List, _Object]),
+	ListValue: frozenset([_List]),
+	ObjectValue: frozenset([_Object]),
+	FunctionValue: frozenset([FunctionValue]),
+	VariableValue: frozenset([VariableValue])
+}
+
+_NUMBERS = [bool, int, float]
+_PRIMITIVES = [type(None), bool, int, float, str]
+_NUMBER_PAIRS = frozenset([(type_1, type_2) for type_1 in _NUMBERS for type_2 in _NUMBERS])
+_ADD_PAIRS = _NUMBER_PAIRS | frozenset([(str, str)])
+_PRIMITIVE_PAIRS = frozenset([(type_1, type_2) for type_1 in _PRIMITIVES for type_2 in _PRIMITIVES])
+_SIZED = frozenset([str, _List, _Object])
+
+# An alternative to `ClosureEvaluator` where values are native Python values instead of
+# `ScriptValue`s: null, bools, numbers and strings are None, bool, int, float and str,
+# lists and objects are (thin subclasses of) list and dict, and functions are still
+# `FunctionValue`s, so arithmetic and comparisons don't create a new value object each time
+# Scopes are native objects as well
+
+# Common operations are compiled to work on native values directly, and fall back to
+# the operation's own _finish() for any types they don't handle, which also raises
+# the same errors as the other evaluators
+# Every other built-in is run on boxed values: primitives are wrapped in a new
+# `ScriptValue`, and lists and objects in an adapter whose get_list() or get_dict()
+# is a view of the native container, so built-ins that change them change the original
+# Anything outside the evaluator (like get_global_scope()) sees boxed values too
+
+# Type checks map each value type to the native types it stands for (see `_NATIVE_TYPES`),
+# and box the value only to build the error message when they fail
+
+class UnboxedEvaluator (ClosureEvaluator):
+
+	def __init__(self, root):
+
+		self._main = root
+		self._line = root.get_line()
+		self._scopes = [_Object()]
+		self._rng = self.get_seed()
+		self._bodies = {}
+		self._statements = self._run_deep(self._compile_root, root)
+		self._pc = 0
+
+	def get_global_scope(self):
+
+		return _box(self, self._scopes[0])
+
+	def get_function_scope(self):
+
+		return _box(self, self._scopes[-1])
+
+	def _compile(self, node, value_type, eval_vars, line):
+
+		if (isinstance(node, ASTOperation)):
+			operation = node.get_operation()
+			if (operation in _NATIVE_COMPILERS):
+				run = _NATIVE_COMPILERS[operation](self, node, value_type, eval_vars)
+			elif (issubclass(operation, StackBasicOperation)):
+				run = self._compile_basic(node, value_type, eval_vars)
+			else:
+				raise UnsupportedError(f"Unboxed evaluator does not support {operation.__name__}")
+			return self._check_output(run, value_type, node.get_line())
+
+		dtype = node.get_dtype()
+		if (dtype == ASTNode.TYPE_BLOCK):
+			return self._compile_block(node, value_type)
+		elif (dtype == ASTNode.TYPE_LIST):
+			return self._check_output(self._compile_list(node), value_type, node.get_line())
+		elif (dtype == ASTNode.TYPE_VARIABLE):
+			return self._compile_variable(node, value_type, eval_vars, line)
+		else:
+			return self._compile_literal(node, value_type, line)
+
+	# Wraps `run` to check the type of its output, unless any type will do
+
+	def _check_output(self, run, value_type, line):
+
+		types = _NATIVE_TYPES.get(value_type)
+		if (types is None):
+			return run
+		def checked():
+			output = run()
+			if (type(output) not in types):
+				self._line = line
+				self.assert_type(_box(self, output), value_type)
+			return output
+		return checked
+
+	# VALUES
+
+	def _compile_literal(self, node, value_type, line):
+
+		value = _unbox(node.evaluate(self, ScriptValue, True))
+		types = _NATIVE_TYPES.get(value_type)
+		if (types is None or type(value) in types):
+			def run():
+				return value
+		else:
+			def run():
+				self._line = line
+				return self.assert_type(_box(self, value), value_type)
+		return run
+
+	# Variables that aren't a single name are looked up through the boxed scope,
+	# like variables that aren't evaluated, which are always boxed
+	# A missing name is looked up again the same way, to raise the usual error
+
+	def _compile_variable(self, node, value_type, eval_vars, line):
+
+		is_global, fields = node.get_value()
+		scopes = self._scopes
+		types = _NATIVE_TYPES.get(value_type)
+
+		if (eval_vars and not is_global and len(fields) == 1):
+			name = fields[0]
+			def run():
+				self._line = line
+				try:
+					output = scopes[-1][name]
+				except KeyError:
+					_box(self, scopes[-1]).get_field(self, name)
+				if (types is not None and type(output) not in types):
+					self.assert_type(_box(self, output), value_type)
+				return output
+
+		elif (eval_vars):
+			def run():
+				self._line = line
+				parent = scopes[0] if (is_global) else scopes[-1]
+				output = _unbox(VariableValue(self, _box(self, parent), fields).get_var_value(self))
+				if (types is not None and type(output) not in types):
+					self.assert_type(_box(self, output), value_type)
+				return output
+
+		else:
+			def run():
+				self._line = line
+				parent = scopes[0] if (is_global) else scopes[-1]
+				return self.assert_type(VariableValue(self, _box(self, parent), fields), value_type)
+
+		return run
+
+	# A block's null is None, which is returned by falling off the end
+
+	def _compile_block(self, node, value_type):
+
+		statements = [self._compile(child, ScriptValue, True, child.get_line()) for child in node.get_value()]
+		line = node.get_value()[-1].get_line() if (node.get_value()) else node.get_line()
+		types = _NATIVE_TYPES.get(value_type)
+		if (types is None or type(None) in types):
+			def run():
+				for statement in statements:
+					statement()
+		else:
+			def run():
+				for statement in statements:
+					statement()
+				self._line = line
+				self.assert_type(NullValue(self), value_type)
+		return run
+
+	def _compile_list(self, node):
+
+		line = node.get_line()
+		items = [self._compile(child, ScriptValue, True, line) for child in node.get_value()]
+		def run():
+			return _List([item() for item in items])
+		return run
+
+	# OPERATIONS
+
+	# Arguments are boxed and passed to the operation's _finish(), and its output is unboxed
+
+	def _compile_basic(self, node, value_type, eval_vars):
+
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		line = node.get_line()
+		args = [self._compile(node.get_args()[request.name], request.value_type, request.eval_vars, line)
+			for request in operation.get_arg_requests()]
+		def run():
+			values = [_box(self, arg()) for arg in args]
+			self._line = line
+			output = finish(self, values)
+			if (eval_vars and isinstance(output, VariableValue)):
+				output = output.get_var_value(self)
+			return _unbox(output)
+		return run
+
+	def _compile_single_step(self, node, value_type, eval_vars):
+
+		evaluate_and_check = node.evaluate(self, value_type, eval_vars).evaluate_and_check
+		line = node.get_line()
+		def run():
+			self._line = line
+			return _unbox(evaluate_and_check(self, None))
+		return run
+
+	# Compiles the arguments of a two-argument operation, and returns them with its _finish()
+
+	def _compile_pair(self, node, value_type, eval_vars):
+
+		operation = node.evaluate(self, value_type, eval_vars)
+		line = node.get_line()
+		arg_1, arg_2 = [self._compile(node.get_args()[request.name], request.value_type, request.eval_vars, line)
+			for request in operation.get_arg_requests()]
+		return operation._finish, arg_1, arg_2
+
+	# Arithmetic on numbers (and adding strings) is done natively, as long as
+	# dividing wouldn't divide by zero
+	# Python's int and float arithmetic matches CW's, including for bools
+
+	def _compile_arithmetic(self, node, value_type, eval_vars):
+
+		function, pairs, divides = _ARITHMETIC[node.get_operation()]
+		finish, arg_1, arg_2 = self._compile_pair(node, value_type, eval_vars)
+		line = node.get_line()
+		def run():
+			value_1 = arg_1()
+			value_2 = arg_2()
+			if ((type(value_1), type(value_2)) in pairs and (value_2 or not divides)):
+				return function(value_1, value_2)
+			self._line = line
+			return _unbox(finish(self, [_box(self, value_1), _box(self, value_2)]))
+		return run
+
+	# Equality only has a shortcut for primitives, since containers are compared by their contents
+
+	def _compile_comparison(self, node, value_type, eval_vars):
+
+		function, pairs = _COMPARISONS[node.get_operation()]
+		finish, arg_1, arg_2 = self._compile_pair(node, value_type, eval_vars)
+		line = node.get_line()
+		def run():
+			value_1 = arg_1()
+			value_2 = arg_2()
+			if ((type(value_1), type(value_2)) in pairs):
+				return function(value_1, value_2)
+			self._line = line
+			return _unbox(finish(self, [_box(self, value_1), _box(self, value_2)]))
+		return run
+
+	# Reading from a list or object by a valid index is done natively
+	# Anything else, including indexes that are assigned to, goes through OperatorIndex
+
+	def _compile_index(self, node, value_type, eval_vars):
+
+		if (not eval_vars):
+			return self._compile_basic(node, value_type, eval_vars)
+		finish, arg_1, arg_2 = self._compile_pair(node, value_type, eval_vars)
+		line = node.get_line()
+		def run():
+			container = arg_1()
+			index = arg_2()
+			if (type(container) is _List and type(index) is int and -len(container) <= index < len(container)):
+				return container[index]
+			elif (type(container) is _Object and type(index) is str and index in container):
+				return container[index]
+			self._line = line
+			output = finish(self, [_box(self, container), _box(self, index)])
+			if (isinstance(output, VariableValue)):
+				output = output.get_var_value(self)
+			return _unbox(output)
+		return run
+
+	# Returns the scope and name of a single-name variable in the current scope, or None
+	# Assignments to anything else are left to the operation itself
+
+	def _get_local_target(self, node):
+
+		if not (isinstance(node, ASTValue) and node.get_dtype() == ASTNode.TYPE_VARIABLE):
+			return None
+		is_global, fields = node.get_value()
+		if (is_global or len(fields) != 1):
+			return None
+		return fields
+
+	# The scope is looked up before the value is evaluated, as it would be for the first argument
+
+	def _compile_assign(self, node, value_type, eval_vars):
+
+		fields = self._get_local_target(node.get_args()['op_1'])
+		if (fields is None):
+			return self._compile_basic(node, value_type, eval_vars)
+		name = fields[0]
+		scopes = self._scopes
+		value = self._compile(node.get_args()['op_2'], ScriptValue, True, node.get_line())
+		def run():
+			scope = scopes[-1]
+			output = value()
+			scope[name] = output
+			return output if (eval_vars) else VariableValue(self, _box(self, scope), fields)
+		return run
+
+	# A missing variable isn't a number either, so it's left to the operation to raise the error
+
+	def _compile_compound_assign(self, node, value_type, eval_vars):
+
+		fields = self._get_local_target(node.get_args()['op_1'])
+		if (fields is None):
+			return self._compile_basic(node, value_type, eval_vars)
+		function, pairs = _COMPOUND_ASSIGNMENTS[node.get_operation()]
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		name = fields[0]
+		scopes = self._scopes
+		line = node.get_line()
+		request = operation.get_arg_requests()[1]
+		value = self._compile(node.get_args()['op_2'], request.value_type, request.eval_vars, line)
+		def run():
+			scope = scopes[-1]
+			value_2 = value()
+			self._line = line
+			value_1 = scope.get(name)
+			if ((type(value_1), type(value_2)) in pairs):
+				scope[name] = function(value_1, value_2)
+			else:
+				finish(self, [VariableValue(self, _box(self, scope), fields), _box(self, value_2)])
+			return scope[name] if (eval_vars) else VariableValue(self, _box(self, scope), fields)
+		return run
+
+	def _compile_increment(self, node, value_type, eval_vars):
+
+		fields = self._get_local_target(node.get_args()['op'])
+		if (fields is None):
+			return self._compile_basic(node, value_type, eval_vars)
+		change = _INCREMENTS[node.get_operation()]
+		numbers = _NATIVE_TYPES[NumericValue]
+		finish = node.evaluate(self, value_type, eval_vars)._finish
+		name = fields[0]
+		scopes = self._scopes
+		line = node.get_line()
+		def run():
+			scope = scopes[-1]
+			self._line = line
+			value = scope.get(name)
+			if (type(value) in numbers):
+				scope[name] = value + change
+			else:
+				finish(self, [VariableValue(self, _box(self, scope), fields)])
+			return scope[name] if (eval_vars) else VariableValue(self, _box(self, scope), fields)
+		return run
+
+	def _compile_and(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		op_1 = self._compile(node.get_args()['op_1'], ScriptValue, True, line)
+		op_2 = self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+		def run():
+			return bool(op_1()) and bool(op_2())
+		return run
+
+	def _compile_or(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		op_1 = self._compile(node.get_args()['op_1'], ScriptValue, True, line)
+		op_2 = self._compile(node.get_args()['op_2'], ScriptValue, True, line)
+		def run():
+			return bool(op_1()) or bool(op_2())
+		return run
+
+	def _compile_length(self, node, value_type, eval_vars):
+
+		operation = node.evaluate(self, value_type, eval_vars)
+		finish = operation._finish
+		line = node.get_line()
+		arg = self._compile(node.get_args()['value'], ScriptValue, True, line)
+		def run():
+			value = arg()
+			if (type(value) in _SIZED):
+				return len(value)
+			self._line = line
+			return _unbox(finish(self, [_box(self, value)]))
+		return run
+
+	def _compile_append(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		source = self._compile(node.get_args()['source'], ListValue, True, line)
+		value = self._compile(node.get_args()['value'], ScriptValue, True, line)
+		def run():
+			output = source()
+			output.append(value())
+			return output
+		return run
+
+	# CONTROL FLOW
+
+	# Python's truth values match CW's for every native value
+
+	def _compile_if(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		condition = self._compile(node.get_args()['condition'], ScriptValue, True, line)
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			if (condition()):
+				body()
+				return True
+			return False
+		return run
+
+	# After a break, the condition is still checked one last time before the loop exits
+
+	def _compile_while(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		condition = self._compile(node.get_args()['condition'], ScriptValue, True, line)
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			ran = False
+			while (condition()):
+				ran = True
+				try:
+					body()
+				except _BreakSignal:
+					condition()
+					break
+				except _ContinueSignal:
+					pass
+			return ran
+		return run
+
+	# A single-name iterator is assigned in the scope the loop started in,
+	# which is the scope its `VariableValue` would've held on to
+
+	def _compile_for(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		fields = self._get_local_target(node.get_args()['iterator'])
+		iterator = self._compile(node.get_args()['iterator'], VariableValue, False, line)
+		source = self._compile(node.get_args()['list'], ListValue, True, line)
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		scopes = self._scopes
+		def run():
+			variable = iterator()
+			values = source()
+			scope = scopes[-1]
+			index = 0
+			while (index < len(values)):
+				self._line = line
+				if (fields is None):
+					variable.set_var_value(self, _box(self, values[index]))
+				else:
+					scope[fields[0]] = values[index]
+				index += 1
+				try:
+					body()
+				except _BreakSignal:
+					break
+				except _ContinueSignal:
+					pass
+			return index > 0
+		return run
+
+	# Exceptions from the body are caught, but not those from the catch body
+	# Built-in errors are turned into exception objects when they're caught,
+	# while `_line` is still the line they were raised on
+
+	def _compile_try_catch(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		error = node.get_args()['error']
+		catch_body = self._compile(node.get_args()['catch_body'], ScriptValue, True, line)
+		scopes = self._scopes
+		def run():
+			try:
+				body()
+				interrupt = None
+			except _ExceptionSignal as signal:
+				interrupt = signal.interrupt
+			except CatchableError as catchable:
+				interrupt = self.make_exception(catchable.type, catchable.body)
+			except _ContinueSignal:
+				raise CWRuntimeError("Invalid use of continue", line)
+			except _BreakSignal:
+				raise CWRuntimeError("Invalid use of break", line)
+
+			if (interrupt is not None):
+				self._line = line
+				scopes[-1][error.eval_as_variable(self)] = _unbox(interrupt.value)
+				try:
+					catch_body()
+				except _ContinueSignal:
+					raise CWRuntimeError("Invalid use of continue", line)
+				except _BreakSignal:
+					raise CWRuntimeError("Invalid use of break", line)
+
+			return interrupt is None
+		return run
+
+	# Returned values are native (see _compile_return())
+	# Tail calls are run in place of the function that made them, like in `ClosureEvaluator`
+
+	def _compile_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		function = self._compile(node.get_args()['function'], FunctionValue, True, line)
+		arguments = self._compile(node.get_args()['args'], ListValue, True, line)
+		def run():
+			func = function()
+			arg_values = arguments()
+			parameters = func.get_parameters(self)
+			self._line = line
+			if (len(parameters) != len(arg_values)):
+				raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+			self.add_function_scope(_Object(zip(parameters, arg_values)))
+
+			body_line = line
+			while (True):
+				try:
+					self._get_body(func.get_body(), body_line)()
+					output = None
+				except _TailCallSignal as signal:
+					self.pop_function_scope()
+					func = signal.interrupt.function
+					body_line = signal.interrupt.get_line()
+					self.add_function_scope(signal.interrupt.scope)
+					continue
+				except _ReturnSignal as signal:
+					output = signal.interrupt.value
+				except _ContinueSignal:
+					raise CWRuntimeError("Invalid use of continue", body_line)
+				except _BreakSignal:
+					raise CWRuntimeError("Invalid use of break", body_line)
+				except (_ExceptionSignal, CatchableError):
+					self.pop_function_scope()
+					raise
+				break
+
+			self.pop_function_scope()
+			return output
+		return run
+
+	# The new scope is native, so it's built here instead of by `FusedTailCall`
+
+	def _compile_tail_call(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		function = self._compile(node.get_args()['function'], FunctionValue, True, line)
+		arguments = self._compile(node.get_args()['args'], ListValue, True, line)
+		def run():
+			func = function()
+			arg_values = arguments()
+			parameters = func.get_parameters(self)
+			self._line = line
+			if (len(parameters) != len(arg_values)):
+				raise CatchableError('invalid_argument', "Wrong number of arguments for function call")
+			raise _TailCallSignal(TailCallInterrupt(line, func, _Object(zip(parameters, arg_values))))
+		return run
+
+	def _compile_new_object(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		body = self._compile(node.get_args()['body'], ScriptValue, True, line)
+		def run():
+			output = _Object()
+			self._line = line
+			self.add_function_scope(output)
+			try:
+				body()
+			except _ReturnSignal:
+				pass
+			except _ContinueSignal:
+				raise CWRuntimeError("Invalid use of continue", line)
+			except _BreakSignal:
+				raise CWRuntimeError("Invalid use of break", line)
+			except (_ExceptionSignal, CatchableError):
+				self.pop_function_scope()
+				raise
+			self.pop_function_scope()
+			return output
+		return run
+
+	# The value is returned as it is, so it's never boxed on its way out of a function
+
+	def _compile_return(self, node, value_type, eval_vars):
+
+		line = node.get_line()
+		value = self._compile(node.get_args()['value'], ScriptValue, True, line)
+		def run():
+			output = value()
+			self._line = line
+			raise _ReturnSignal(ReturnInterrupt(line, output))
+		return run
+
+_ARITHMETIC = {
+	OperatorAdd: (add, _ADD_PAIRS, False),
+	OperatorSubtract: (sub, _NUMBER_PAIRS, False),
+	OperatorMultiply: (mul, _NUMBER_PAIRS, False),
+	OperatorFloatDivide: (truediv, _NUMBER_PAIRS, True),
+	OperatorModulus: (mod, _NUMBER_PAIRS, True)
+}
+
+_COMPARISONS = {
+	OperatorLess: (lt, _NUMBER_PAIRS),
+	OperatorGreater: (gt, _NUMBER_PAIRS),
+	OperatorLessEqual: (le, _NUMBER_PAIRS),
+	OperatorGreaterEqual: (ge, _NUMBER_PAIRS),
+	OperatorEqual: (eq, _PRIMITIVE_PAIRS),
+	OperatorUnequal: (ne, _PRIMITIVE_PAIRS)
+}
+
+_COMPOUND_ASSIGNMENTS = {
+	OperatorAssignAdd: (add, _ADD_PAIRS),
+	OperatorAssignSubtract: (sub, _NUMBER_PAIRS),
+	OperatorAssignMultiply: (mul, _NUMBER_PAIRS)
+}
+
+_INCREMENTS = {
+	OperatorIncrement: 1,
+	OperatorDecrement: -1
+}
+
+_NATIVE_COMPILERS = {
+	OperatorAssign: UnboxedEvaluator._compile_assign,
+	OperatorAssignAdd: UnboxedEvaluator._compile_compound_assign,
+	OperatorAssignSubtract: UnboxedEvaluator._compile_compound_assign,
+	OperatorAssignMultiply: UnboxedEvaluator._compile_compound_assign,
+	OperatorAdd: UnboxedEvaluator._compile_arithmetic,
+	OperatorSubtract: UnboxedEvaluator._compile_arithmetic,
+	OperatorMultiply: UnboxedEvaluator._compile_arithmetic,
+	OperatorFloatDivide: UnboxedEvaluator._compile_arithmetic,
+	OperatorModulus: UnboxedEvaluator._compile_arithmetic,
+	OperatorLess: UnboxedEvaluator._compile_comparison,
+	OperatorGreater: UnboxedEvaluator._compile_comparison,
+	OperatorLessEqual: UnboxedEvaluator._compile_comparison,
+	OperatorGreaterEqual: UnboxedEvaluator._compile_comparison,
+	OperatorEqual: UnboxedEvaluator._compile_comparison,
+	OperatorUnequal: UnboxedEvaluator._compile_comparison,
+	OperatorIndex: UnboxedEvaluator._compile_index,
+	OperatorIncrement: UnboxedEvaluator._compile_increment,
+	OperatorDecrement: UnboxedEvaluator._compile_increment,
+	OperatorAnd: UnboxedEvaluator._compile_and,
+	OperatorOr: UnboxedEvaluator._compile_or,
+	LengthStatement: UnboxedEvaluator._compile_length,
+	ListAppendStatement: UnboxedEvaluator._compile_append,
+	IfStatement: UnboxedEvaluator._compile_if,
+	WhileLoopStatement: UnboxedEvaluator._compile_while,
+	ForLoopStatement: UnboxedEvaluator._compile_for,
+	TryCatchStatement: UnboxedEvaluator._compile_try_catch,
+	CallStatement: UnboxedEvaluator._compile_call,
+	NewObjectStatement: UnboxedEvaluator._compile_new_object,
+	ReturnStatement: UnboxedEvaluator._compile_return,
+	FusedTailCall: UnboxedEvaluator._compile_tail_call,
+	LocalScopeStatement: UnboxedEvaluator._compile_single_step,
+	GlobalScopeStatement: UnboxedEvaluator._compile_single_step,
+	ContinueStatement: UnboxedEvaluator._compile_single_step,
+	BreakStatement: UnboxedEvaluator._compile_single_step,
+	FunctionStatement: UnboxedEvaluator._compile_single_step,
+	LambdaStatement: UnboxedEvaluator._compile_single_step,
+	RNGGetStatement: UnboxedEvaluator._compile_single_step,
+	RNGResetStatement: UnboxedEvaluator._compile_single_step,
+	RandomFloatStatement: UnboxedEvaluator._compile_single_step,
+	PiStatement: UnboxedEvaluator._compile_single_step,
+	EulerStatement: UnboxedEvaluator._compile_single_step
+}
\ No newline at end of file
@@ -1,10 +1,17 @@
 from cwscript.errors import *
 
+# Values are created constantly and containers can hold a lot of them,
+# so every value class lists its fields in __slots__ instead of having a __dict__
+# Only variables and functions are ever printed as an ID, so only they have an `_id` slot,
+# which stays empty until get_id() is called
+
 class ScriptValue:
 
+	__slots__ = ()
+
 	def __init__(self, evaluator):
 
-		self._id = ScriptValue._new_id()
+		pass
 
 	# Casts a value to a string
 	# Not every value can do this
@@ -20,7 +27,7 @@ class ScriptValue:
 
 	def is_equal(self, evaluator, other):
 
-		return (self._id == other._id)
+		return (self is other)
 
 	# For primitive types, same as checking equality
 
@@ -35,10 +42,21 @@ class ScriptValue:
 
 		return True
 
-	_id = -1
+	# Returns a unique ID for this value, which is only given out the first time it's asked for
+	# Only classes with an `_id` slot can be given one
+
+	def get_id(self):
+
+		try:
+			return self._id
+		except AttributeError:
+			self._id = ScriptValue._new_id()
+			return self._id
+
+	_next_id = -1
 
 	@classmethod
 	def _new_id(cls):
 
-		cls._id += 1
-		return cls._id
\ No newline at end of file
+		cls._next_id += 1
+		return cls._next_id
\ No newline at end of file
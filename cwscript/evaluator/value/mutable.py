@@ -1,16 +1,24 @@
+from array import array
+
+from cwscript.constants import *
 from cwscript.errors import *
 from cwscript.evaluator.value.base import ScriptValue
+from cwscript.evaluator.value.primitive import IntValue, FloatValue
 
 class MutableValue (ScriptValue):
 
+	__slots__ = ()
+
 	# For mutable objects, === checks memory address
 
 	def is_same(self, evaluator, other):
 
-		return (self._id == other._id)
+		return (self is other)
 
 class FunctionValue (MutableValue):
 
+	__slots__ = ('_parameters', '_body', '_id')
+
 	def __init__(self, evaluator, parameters, body):
 
 		# `parameters` should be a list of strings
@@ -25,7 +33,7 @@ class FunctionValue (MutableValue):
 
 	def to_string(self, evaluator, isolated = True):
 
-		return f"FUNC:0x{self._id:0x}"
+		return f"FUNC:0x{self.get_id():0x}"
 
 	def get_body(self):
 
@@ -33,6 +41,8 @@ class FunctionValue (MutableValue):
 
 class ContainerValue (MutableValue):
 
+	__slots__ = ()
+
 	def set_field(self, evaluator, field, value):
 
 		pass
@@ -41,26 +51,224 @@ class ContainerValue (MutableValue):
 
 		pass
 
+# The storage of a list that only holds IntValues or only FloatValues (see `ListValue`)
+# The numbers themselves are kept in an array ('q' for ints and 'd' for floats),
+# and are only boxed into values as they're read, so it can be read like a list of values
+# It's only ever changed through `ListValue`, which unpacks it when a value doesn't fit
+
+class _PackedList:
+
+	__slots__ = ('_array', '_value_class')
+
+	def __init__(self, numbers, value_class):
+
+		self._array = numbers
+		self._value_class = value_class
+
+	# Returns the array of numbers, for built-ins that can work on them directly
+
+	def get_array(self):
+
+		return self._array
+
+	def box(self, number):
+
+		return self._value_class(None, number)
+
+	def __len__(self):
+
+		return len(self._array)
+
+	def __iter__(self):
+
+		value_class = self._value_class
+		return (value_class(None, number) for number in self._array)
+
+	# Slices are new lists, so they're returned as plain lists of values
+
+	def __getitem__(self, index):
+
+		if (isinstance(index, slice)):
+			return [self._value_class(None, number) for number in self._array[index]]
+		return self._value_class(None, self._array[index])
+
+	def __add__(self, other):
+
+		return list(self) + list(other)
+
+	def __radd__(self, other):
+
+		return list(other) + list(self)
+
+	def copy(self):
+
+		return _PackedList(self._array[:], self._value_class)
+
+	# These return false if `value` doesn't fit in the array, without changing it
+
+	def store(self, index, value):
+
+		if (type(value) is not self._value_class):
+			return False
+		try:
+			self._array[index] = value.get_value()
+		except OverflowError:
+			return False
+		return True
+
+	def add(self, value):
+
+		if (type(value) is not self._value_class):
+			return False
+		try:
+			self._array.append(value.get_value())
+		except OverflowError:
+			return False
+		return True
+
+	def pop(self, index):
+
+		return self.box(self._array.pop(index))
+
+	def unpack(self):
+
+		return list(self)
+
+_TYPECODES = {
+	IntValue: 'q',
+	FloatValue: 'd'
+}
+
+# Returns the packed storage for a list of values, or None if they can't be packed
+
+def _pack(values):
+
+	value_class = type(values[0])
+	if (value_class not in _TYPECODES):
+		return None
+	for value in values:
+		if (type(value) is not value_class):
+			return None
+	try:
+		return _PackedList(array(_TYPECODES[value_class], [value.get_value() for value in values]), value_class)
+	except OverflowError:
+		return None
+
 class ListValue (ContainerValue):
 
+	__slots__ = ('_values', '_shared')
+
+	# The list takes `values` as it is, so callers pass a list nothing else holds on to
+	# Copies share the same list until either one changes it (see copy())
+
+	# Lists of at least `PACKED_LIST_MIN_LENGTH` IntValues or FloatValues (and nothing else)
+	# are stored packed (see `_PackedList`), which takes 8 bytes per number
+	# They stay packed until a value of any other type is stored in them
+	# Only plain lists are packed, so storage that's already packed (or isn't a list) is kept as it is
+
 	def __init__(self, evaluator, values):
 
 		super().__init__(evaluator)
-		self._values = values.copy()
+		packed = _pack(values) if (type(values) is list and len(values) >= PACKED_LIST_MIN_LENGTH) else None
+		self._values = values if (packed is None) else packed
+		self._shared = False
+
+	# Creates a list of IntValues from plain ints, which are packed without being boxed first
+
+	@classmethod
+	def from_ints(cls, evaluator, numbers):
+
+		if (len(numbers) >= PACKED_LIST_MIN_LENGTH):
+			try:
+				output = cls(evaluator, [])
+				output._values = _PackedList(array('q', numbers), IntValue)
+				return output
+			except OverflowError:
+				pass
+		return cls(evaluator, [IntValue(evaluator, number) for number in numbers])
+
+	# Returns the list's storage, copying it first if it's shared
+
+	def _own(self):
+
+		if (self._shared):
+			self._values = self._values.copy()
+			self._shared = False
+		return self._values
 
 	# Returns a mutable reference to the list
+	# If it's shared with a copy, it's copied first, and if it's packed, it's unpacked
+	# for good, so only use this to change the list in ways append() and pop() can't
 
 	def get_list(self):
 
+		values = self._own()
+		if (type(values) is _PackedList):
+			values = self._values = values.unpack()
+		return values
+
+	# Returns the list without copying it, so it must not be changed
+	# It can stop being this list's once the list is copied, so it shouldn't be held on to
+	# Packed lists are returned as they are, and box their numbers as they're read
+
+	def view_list(self):
+
 		return self._values
 
+	# Returns the packed storage of the list, or None if it isn't packed
+
+	def get_packed(self):
+
+		return self._values if (type(self._values) is _PackedList) else None
+
+	def set_list(self, values):
+
+		self._values = values
+		self._shared = False
+
+	# Copies the list in constant time
+	# Both lists are marked as shared, and whichever is changed first is copied then
+	# The storage is shared as it is, so a list that isn't packed isn't packed by copying it
+
+	def copy(self, evaluator):
+
+		output = ListValue(evaluator, [])
+		output._values = self._values
+		output._shared = True
+		self._shared = True
+		return output
+
+	# A list that grows to `PACKED_LIST_MIN_LENGTH` is packed then, if it can be
+
+	def append(self, value):
+
+		values = self._own()
+		if (type(values) is _PackedList):
+			if (values.add(value)):
+				return
+			values = self._values = values.unpack()
+		values.append(value)
+		if (len(values) == PACKED_LIST_MIN_LENGTH and type(values) is list):
+			packed = _pack(values)
+			if (packed is not None):
+				self._values = packed
+
+	def pop(self, index):
+
+		return self._own().pop(index)
+
 	# `field` should be integer
 
 	def set_field(self, evaluator, field, value):
 
 		if not (-len(self._values) <= field < len(self._values)):
 			raise CatchableError('invalid_index', "List index %s out of bounds" % field)
-		self._values[field] = value
+		values = self._own()
+		if (type(values) is _PackedList):
+			if (values.store(field, value)):
+				return
+			values = self._values = values.unpack()
+		values[field] = value
 
 	def get_field(self, evaluator, field):
 
@@ -91,6 +299,8 @@ class ListValue (ContainerValue):
 
 class ObjectValue (ContainerValue):
 
+	__slots__ = ('_values',)
+
 	def __init__(self, evaluator):
 
 		super().__init__(evaluator)
@@ -115,7 +325,7 @@ class ObjectValue (ContainerValue):
 	def get_field(self, evaluator, field):
 
 		if (field not in self._values):
-			raise CatchableError('invalid_index', "Invalid variable '%s'" % field, evaluator.get_line())
+			raise CatchableError('invalid_index', "Invalid variable '%s'" % field)
 		return self._values[field]
 
 	def to_string(self, evaluator, isolated = True):
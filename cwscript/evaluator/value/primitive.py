@@ -1,11 +1,33 @@
 from cwscript.errors import *
 from cwscript.evaluator.value.base import ScriptValue
 
+# Null, true and false are only ever created once each, and so are small integers
+# (the same range as CPython's), so the constructors return an existing value
+# whenever they can
+# Primitives are compared by value, even by `===`, so sharing them changes nothing
+# These are set up entirely in __new__(), and object.__init__() ignores the arguments
+# they're constructed with, so nothing runs again for a shared value
+
+_SMALL_INT_MIN = -5
+_SMALL_INT_MAX = 256
+
+# Creates a primitive without going through its constructor
+
+def _create(cls, value):
+
+	output = object.__new__(cls)
+	output._value = value
+	return output
+
 class NullValue (ScriptValue):
 
-	def __init__(self, evaluator):
+	__slots__ = ()
 
-		super().__init__(evaluator)
+	def __new__(cls, evaluator):
+
+		return _NULL
+
+	__init__ = object.__init__
 
 	def to_string(self, evaluator, isolated = True):
 
@@ -24,7 +46,7 @@ class NullValue (ScriptValue):
 
 class NumericValue (ScriptValue):
 
-	pass
+	__slots__ = ('_value',)
 
 # Similar to NumericValue, but excludes floats for things like
 # array indexing
@@ -32,17 +54,20 @@ class NumericValue (ScriptValue):
 
 class IntegerValue (NumericValue):
 
-	pass
+	__slots__ = ()
 
 # As a NumericValue, bools can be used as if they were 1 or 0
 # in numeric expressions
 
 class BoolValue (IntegerValue):
 
-	def __init__(self, evaluator, value):
+	__slots__ = ()
 
-		super().__init__(evaluator)
-		self._value = bool(value)
+	def __new__(cls, evaluator, value):
+
+		return _TRUE if (value) else _FALSE
+
+	__init__ = object.__init__
 
 	def get_value(self):
 
@@ -62,10 +87,18 @@ class BoolValue (IntegerValue):
 
 class IntValue (IntegerValue):
 
-	def __init__(self, evaluator, value):
+	__slots__ = ()
 
-		super().__init__(evaluator)
-		self._value = int(value)
+	def __new__(cls, evaluator, value):
+
+		value = int(value)
+		if (_SMALL_INT_MIN <= value <= _SMALL_INT_MAX):
+			return _SMALL_INTS[value - _SMALL_INT_MIN]
+		output = object.__new__(cls)
+		output._value = value
+		return output
+
+	__init__ = object.__init__
 
 	def get_value(self):
 
@@ -83,8 +116,15 @@ class IntValue (IntegerValue):
 
 		return self._value != 0
 
+_NULL = object.__new__(NullValue)
+_TRUE = _create(BoolValue, True)
+_FALSE = _create(BoolValue, False)
+_SMALL_INTS = [_create(IntValue, value) for value in range(_SMALL_INT_MIN, _SMALL_INT_MAX + 1)]
+
 class FloatValue (NumericValue):
 
+	__slots__ = ()
+
 	def __init__(self, evaluator, value):
 
 		super().__init__(evaluator)
@@ -111,6 +151,8 @@ class FloatValue (NumericValue):
 
 class StringValue (ScriptValue):
 
+	__slots__ = ('_value',)
+
 	def __init__(self, evaluator, value):
 
 		super().__init__(evaluator)
@@ -134,6 +176,8 @@ class StringValue (ScriptValue):
 
 class VariableValue (ScriptValue):
 
+	__slots__ = ('_parent', '_fields', '_id')
+
 	def __init__(self, evaluator, parent, fields):
 
 		self._parent = parent
@@ -155,10 +199,10 @@ class VariableValue (ScriptValue):
 
 	def to_string(self, evaluator, isolated = True):
 
-		return f"VAR:0x{self._id:0x}"
+		return f"VAR:0x{self.get_id():0x}"
 
-	# Type check is not needed when comparing IDs directly
+	# Only variables and functions have IDs, so other values can't be equal to a variable
 
 	def is_equal(self, evaluator, other):
 
-		return other._id == self._id
\ No newline at end of file
+		return (isinstance(other, VariableValue) and other.get_id() == self.get_id())
\ No newline at end of file
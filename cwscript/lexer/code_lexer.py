@@ -1,157 +1,283 @@
 from cwscript.constants import *
 from cwscript.errors import *
 from cwscript import rules
-from cwscript.lexer.token import Token
+from cwscript.lexer.token import Token, TokenTable
 
-_code = ""
-_c = ""
-_line = 0
+# Kept for convenience; the actual work is done by `Lexer`
 
 def lex(code):
 
-	global _code, _c
-	_code = code
-	_pop_char()
-	tokens = []
+	return Lexer(code).lex()
 
-	while (_c != ''):
+# Splits source code into tokens
+# Instead of consuming the source one character at a time, the lexer
+# moves an index cursor through it and slices out each token's body,
+# so the cost of lexing stays linear in the size of the input
+# All state is stored on the instance, so separate lexers can run at the same time
 
-		# Ignore whitespace
+# The source can either be a string or a text file object
+# File objects are read in chunks as tokens are requested, and text before the
+# current token is discarded, so only a small part of the file is held at once
 
-		if (_c in WHITESPACE):
-			_pop_char()
-			continue
+class Lexer:
 
-		# Ignore comments
+	CHUNK_SIZE = 65536
 
-		if (_c == '#'):
-			while (_c != '' and _c not in NEWLINES):
-				_pop_char()
-			continue
+	# Lexing can start partway through a string, as long as it's
+	# between two tokens and the line at that point is given
 
-		# Lex grouping symbols (one character exactly)
+	def __init__(self, source, chunk_size = CHUNK_SIZE, start = 0, line = 0):
 
-		if (_c in OPENING_GROUPINGS):
-			tokens.append(Token(Token.GROUP_OPEN, _c, _line))
-			_pop_char()
-			continue
-		if (_c in CLOSING_GROUPINGS):
-			tokens.append(Token(Token.GROUP_CLOSE, _c, _line))
-			_pop_char()
-			continue
+		if (isinstance(source, str)):
+			self._code = source
+			self._stream = None
+		else:
+			self._code = ""
+			self._stream = source
+		self._chunk_size = chunk_size
+		self._pos = start
+		self._line = line
+
+		# Location of the most recently scanned token
+		# `_body` is only set for tokens whose body doesn't appear in the source
+
+		self._start = 0
+		self._end = 0
+		self._body = None
+		self._token_line = 0
+
+		# Set while a statement is being read by lex_statements()
+
+		self._in_statement = False
+
+	def lex(self):
 
-		# Lex separators (one character exactly)
+		return list(self.tokens())
 
-		if (_c in [',', ';']):
-			tokens.append(Token(Token.SEMICOLON if _c == ';' else Token.COMMA, _c, _line))
-			_pop_char()
-			continue
+	# Yields tokens one at a time, reading more of the source only when needed
 
-		# Lex operators
-		# Operators have a length between 1 and 3
-		# The lexer keeps going until the next character no longer
-		# results in a valid operation
-		# Binary operators are distinguished from prefix operators
-		# by whether they're followed by whitespace
+	def tokens(self):
 
-		ops = [op for op in rules.get_op_strings() if op[0] == _c]
-		token = ''
-		if (ops):
+		for token_type in self._scan():
+			body = self._code[self._start:self._end] if (self._body is None) else self._body
+			yield Token(token_type, body, self._token_line)
 
-			# Try to match a second and third character
+	# Stores every token in a compact `TokenTable` instead of separate objects
+	# Token bodies are slices of the source, so it must be a string
 
-			for i in range(2):
-				token += _c
-				_pop_char()
-				ops = [op for op in rules.get_op_strings() if len(op) > (1 + i) and op[1+i] == _c]
-				if (not ops):
+	def lex_table(self):
+
+		if (self._stream is not None):
+			raise TypeError("Token tables can only be built from a string")
+		table = TokenTable(self._code)
+		for token_type in self._scan():
+			table.append(token_type, self._start, self._end, self._token_line, self._body)
+		return table
+
+	# Yields a `TokenTable` for each top-level statement as soon as its semicolon is lexed
+	# Both strings and file objects can be lexed this way, since nothing
+	# is discarded from the buffer while a statement is being read
+	# A closing symbol that doesn't match any opening symbol ends the statement early,
+	# so the parser can report it before anything after it is lexed
+
+	def lex_statements(self):
+
+		table = TokenTable(None)
+		groups = []
+		for token_type in self._scan():
+			table.append(token_type, self._start, self._end, self._token_line, self._body)
+			self._in_statement = True
+			if (token_type == Token.GROUP_OPEN):
+				groups.append(self._code[self._start])
+			elif (token_type == Token.GROUP_CLOSE):
+				if (not groups or not rules.check_group_symbols(groups.pop(), self._code[self._start])):
 					break
-				elif (i == 1):
-					token += _c
-					_pop_char()
+			elif (token_type == Token.SEMICOLON and not groups):
+				table.set_code(self._code)
+				yield table
+				table = TokenTable(None)
+				self._in_statement = False
+		if (len(table) > 0):
+			table.set_code(self._code)
+			yield table
+
+	# Yields the type of each token, leaving its location in `_start`, `_end`,
+	# and `_token_line` until the next token is requested
+
+	def _scan(self):
+
+		while (self._pos < len(self._code) or self._fill()):
+
+			self._discard_read()
+			c = self._code[self._pos]
+
+			# Ignore whitespace
+
+			if (c in WHITESPACE_CHARS):
+				if (c == '\n'):
+					self._line += 1
+				self._pos += 1
+				continue
+
+			# Ignore comments
+
+			if (c == '#'):
+				self._skip_comment()
+				continue
+
+			self._start = self._pos
+			self._body = None
+			self._token_line = self._line
+
+			# Lex grouping symbols and separators (one character exactly)
+
+			if (c in OPENING_CHARS):
+				token_type = Token.GROUP_OPEN
+				self._pos += 1
+			elif (c in CLOSING_CHARS):
+				token_type = Token.GROUP_CLOSE
+				self._pos += 1
+			elif (c in SEPARATOR_CHARS):
+				token_type = Token.SEMICOLON if c == ';' else Token.COMMA
+				self._pos += 1
 
-			# For binary operators, next character must be whitespace
-			# For prefix operators, next character cannot be whitespace
+			# Operators, strings, and everything else span multiple characters
 
-			if (_c in WHITESPACE):
-				if (not rules.is_binary_op(token)):
-					raise CWLexError(f"Prefix operator '{token}' cannot be followed by whitespace", _line)
-				tokens.append(Token(Token.BINARY_OP, token, _line))
+			elif (c in rules.get_op_trie()):
+				token_type = self._lex_operator()
+			elif (c in QUOTE_CHARS):
+				token_type = self._lex_string()
 			else:
-				if (not rules.is_prefix_op(token)):
-					raise CWLexError(f"Binary operator '{token}' must be surrounded by whitespace", _line)
-				tokens.append(Token(Token.PREFIX_OP, token, _line))
-			continue
+				token_type = self._lex_free_type()
 
-		# For strings, continue until a closing quote is reached
-		# Strings can be multiline, so line breaks will not terminate the string
-		# We must ensure that a closing quote is not escaped
+			self._end = self._pos
+			yield token_type
 
-		if (_c in QUOTES):
+	# Reads the next chunk of the source file onto the end of the buffer
+	# Returns false once there is nothing left to read
+	# The read size grows with the buffer so that very long tokens
+	# are still read in a linear amount of time
 
-			in_escape = False
-			token = _c
-			_pop_char()
-			while (True):
+	def _fill(self):
 
-				if (_c == ''):
-					raise CWLexError("Unterminated string literal", _line)
+		if (self._stream is None):
+			return False
+		chunk = self._stream.read(max(self._chunk_size, len(self._code) - self._pos))
+		if (not chunk):
+			self._stream = None
+			return False
+		self._code += chunk
+		return True
 
-				# Quote can only be closed if not in escape sequence
+	# Drops the part of the buffer that has already been lexed
+	# This is only called between tokens, so no positions need to be kept
+	# unless they're part of the statement being read
 
-				if (not in_escape and _c == token[0]):
-					token += _c
-					_pop_char()
-					break
+	def _discard_read(self):
+
+		if (self._stream is not None and self._pos >= self._chunk_size and not self._in_statement):
+			self._code = self._code[self._pos:]
+			self._pos = 0
+
+	# Returns the character at the cursor without consuming it,
+	# or an empty string at the end of the source
+
+	def _peek(self):
+
+		if (self._pos < len(self._code) or self._fill()):
+			return self._code[self._pos]
+		return ''
+
+	def _skip_comment(self):
 
-				# Escape sequences start at \ and last exactly one character
+		while (True):
+			code = self._code
+			while (self._pos < len(code) and code[self._pos] not in NEWLINE_CHARS):
+				self._pos += 1
+			if (self._pos < len(code) or not self._fill()):
+				return
 
-				if (not in_escape and _c == '\\'):
-					in_escape = True
-				elif (in_escape):
-					in_escape = False
+	# Operators are matched by walking the operator trie in `rules`
+	# The lexer keeps going until the next character no longer
+	# continues a valid operation
+	# Binary operators are distinguished from prefix operators
+	# by whether they're followed by whitespace
+
+	def _lex_operator(self):
+
+		start = self._pos
+		node = rules.get_op_trie()
+		while (self._peek() in node):
+			node = node[self._code[self._pos]]
+			self._pos += 1
+
+		# For binary operators, next character must be whitespace
+		# For prefix operators, next character cannot be whitespace
+
+		token = self._code[start:self._pos]
+		if (self._peek() in WHITESPACE_CHARS):
+			if (not rules.is_binary_op(token)):
+				raise CWLexError(f"Prefix operator '{token}' cannot be followed by whitespace", self._line)
+			return Token.BINARY_OP
+		else:
+			if (not rules.is_prefix_op(token)):
+				raise CWLexError(f"Binary operator '{token}' must be surrounded by whitespace", self._line)
+			return Token.PREFIX_OP
 
-				# Continue to next iteration
+	# For strings, continue until a closing quote is reached
+	# Strings can be multiline, so line breaks will not terminate the string
+	# We must ensure that a closing quote is not escaped
 
-				token += _c
-				_pop_char()
+	def _lex_string(self):
 
-			tokens.append(Token(Token.FREE_TYPE, token, _line))
-			continue
+		start = self._pos
+		quote = self._code[start]
+		self._pos += 1
+		in_escape = False
+		while (True):
 
-		# For anything else, keep it as one token
-		# Even without whitespace, group symbols and separators can end a token
+			c = self._peek()
+			if (c == ''):
+				raise CWLexError("Unterminated string literal", self._line)
+			self._pos += 1
 
-		token = ''
-		while (_c != ''):
-			if (_c in WHITESPACE or
-				_c in OPENING_GROUPINGS or
-				_c in CLOSING_GROUPINGS or
-				_c in [',', ';']
-			):
+			# Quote can only be closed if not in escape sequence
+			# Escape sequences start at \ and last exactly one character
+
+			if (in_escape):
+				in_escape = False
+			elif (c == quote):
+				break
+			elif (c == '\\'):
+				in_escape = True
+
+		# The token keeps the line it started on, even if the string spans several
+
+		self._line += self._code.count('\n', start, self._pos)
+		return Token.FREE_TYPE
+
+	# For anything else, keep it as one token
+	# Even without whitespace, group symbols and separators can end a token
+
+	def _lex_free_type(self):
+
+		start = self._pos
+		while (True):
+			code = self._code
+			while (self._pos < len(code) and code[self._pos] not in FREE_TYPE_END_CHARS):
+				self._pos += 1
+			if (self._pos < len(code) or not self._fill()):
 				break
-			token += _c
-			_pop_char()
+		token = self._code[start:self._pos]
 
 		# Check if token matches a defined statement root
 		# Exception: `else` is replaced with or operator `||`
 		# They have the same behavior, but `else` looks better in some circumstances
 
 		if (token == 'else'):
-			tokens.append(Token(Token.BINARY_OP, '||', _line))
+			self._body = '||'
+			return Token.BINARY_OP
 		elif (rules.is_statement(token)):
-			tokens.append(Token(Token.EXPR_ROOT, token, _line))
+			return Token.EXPR_ROOT
 		else:
-			tokens.append(Token(Token.FREE_TYPE, token, _line))
-
-	return tokens
-
-def _pop_char():
-
-	global _code, _c, _line
-	old_c = _c
-	_c = '' if len(_code) == 0 else _code[0]
-	_code = _code[1:]
-	if (_c in NEWLINES):
-		_line += 1
-	return old_c
\ No newline at end of file
+			return Token.FREE_TYPE
\ No newline at end of file
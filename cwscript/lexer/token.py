@@ -1,6 +1,11 @@
+from array import array
+from itertools import accumulate
+
 
 class Token:
 
+	__slots__ = ('type', 'body', '_line')
+
 	EXPR_ROOT = 0
 	FREE_TYPE = 1
 	GROUP_OPEN = 2
@@ -41,4 +46,115 @@ class Token:
 
 	def get_line(self):
 
-		return self._line
\ No newline at end of file
+		return self._line
+
+# Compact storage for a whole list of tokens
+# Each field is kept in its own array instead of in a separate object per token,
+# and bodies are sliced out of the original source only when they're requested
+# The few tokens whose body doesn't appear in the source (like `else`,
+# which becomes `||`) store their body separately
+# Lines are kept in a list rather than an array, so every token on a line shares
+# the lexer's int object for it, as do the AST nodes parsed from them
+
+class TokenTable:
+
+	def __init__(self, code):
+
+		self._code = code
+		self._types = array('b')
+		self._starts = array('q')
+		self._lengths = array('i')
+		self._lines = []
+		self._bodies = {}
+
+	# Builds a table from token objects, storing their bodies one after another
+
+	@classmethod
+	def from_tokens(cls, tokens):
+
+		tokens = list(tokens)
+		bodies = [token.body for token in tokens]
+		table = cls("".join(bodies))
+		table._types = array('b', [token.type for token in tokens])
+		table._lengths = array('i', map(len, bodies))
+		table._starts = array('q', accumulate(table._lengths, initial = 0))
+		table._starts.pop()
+		table._lines = [token.get_line() for token in tokens]
+		return table
+
+	# A table can be filled in before all of its source has been read,
+	# in which case the source is only given once it has been
+
+	def set_code(self, code):
+
+		self._code = code
+
+	def append(self, type_, start, end, line, body = None):
+
+		if (body is not None):
+			self._bodies[len(self._types)] = body
+		self._types.append(type_)
+		self._starts.append(start)
+		self._lengths.append(end - start)
+		self._lines.append(line)
+
+	def __len__(self):
+
+		return len(self._types)
+
+	# Builds a standalone token, for code that expects token objects
+
+	def __getitem__(self, index):
+
+		return Token(self.get_type(index), self.get_body(index), self.get_line(index))
+
+	def __iter__(self):
+
+		for i in range(len(self._types)):
+			yield Token(self._types[i], self.get_body(i), self._lines[i])
+
+	def get_type(self, index):
+
+		return self._types[index]
+
+	# The type and line columns themselves, and the bodies of a range of tokens,
+	# for reading many tokens in a row
+
+	def get_types(self):
+
+		return self._types
+
+	def get_lines(self):
+
+		return self._lines
+
+	def get_bodies(self, start, end):
+
+		code = self._code
+		bodies = [code[token_start:token_start + length] for token_start, length in zip(self._starts[start:end], self._lengths[start:end])]
+		if (self._bodies):
+			for i in range(start, end):
+				if (i in self._bodies):
+					bodies[i - start] = self._bodies[i]
+		return bodies
+
+	def get_body(self, index):
+
+		if (self._bodies and index in self._bodies):
+			return self._bodies[index]
+		start = self._starts[index]
+		return self._code[start:start + self._lengths[index]]
+
+	def get_line(self, index):
+
+		return self._lines[index]
+
+	# Offsets of the token within the source
+
+	def get_start(self, index):
+
+		return self._starts[index]
+
+	def get_end(self, index):
+
+		return self._starts[index] + self._lengths[index]
\ No newline at end of file
@@ -0,0 +1,96 @@
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.parser.ast import *
+from cwscript.evaluator.code_evaluator import CodeEvaluator
+from cwscript.evaluator.value import *
+from cwscript.evaluator.operation import *
+
+# Replaces operations whose arguments are all literals with the value they produce,
+# so expressions like `60 * 60 * 24` or `sqrt 2` are only evaluated once
+# Folding is done by running the operation itself on a separate evaluator,
+# which keeps the folded value exactly the same as it would be at runtime
+
+# Only operations without side effects can be folded, and they must always
+# give the same result for the same arguments (so no RNG, scopes, printing, etc.)
+
+_PURE_OPERATIONS = frozenset([
+	OperatorIndex, OperatorExponent, OperatorMultiply, OperatorFloatDivide, OperatorIntDivide,
+	OperatorModulus, OperatorAdd, OperatorSubtract, OperatorGreater, OperatorLess,
+	OperatorGreaterEqual, OperatorLessEqual, OperatorEqual, OperatorUnequal, OperatorSame,
+	OperatorNotSame, OperatorAnd, OperatorOr, OperatorNegative, OperatorNot,
+	BoolCastStatement, IntCastStatement, FloatCastStatement, StringCastStatement, TypeOfStatement,
+	LengthStatement, SliceStatement, SliceAfterStatement, FindStatement, StringReplaceStatement,
+	StringUpperCaseStatement, StringLowerCaseStatement, RoundStatement, FloorStatement,
+	CeilStatement, TruncateStatement, AbsoluteValueStatement, SignStatement, MaxStatement,
+	MinStatement, ClampStatement, SquareRootStatement, LogStatement, NaturalLogStatement,
+	SinStatement, CosStatement, TanStatement, ArcSinStatement, ArcCosStatement, ArcTanStatement,
+	ArcTan2Statement, PiStatement, EulerStatement
+])
+
+# Integer powers are only folded when the result stays reasonably small
+# Anything bigger is left to the runtime, so that code which never runs
+# doesn't cost anything to compile
+
+_MAX_FOLDED_INT_BITS = 4096
+
+# Folds every constant expression in the tree, and returns the new root
+# Nodes are visited children first, so operands are folded before the operations using them
+
+def fold_constants(root):
+
+	order = []
+	stack = [root]
+	while (stack):
+		node = stack.pop()
+		order.append(node)
+		stack.extend(node.get_children())
+	for node in reversed(order):
+		node.map_children(_fold_node)
+	return _fold_node(root)
+
+# Returns the folded version of a node, or the node itself if it can't be folded
+
+def _fold_node(node):
+
+	if (not isinstance(node, ASTOperation) or node.get_operation() not in _PURE_OPERATIONS):
+		return node
+	args = node.get_args()
+	for arg in args.values():
+		if (not isinstance(arg, ASTValue) or not arg.is_literal()):
+			return node
+	if (node.get_operation() is OperatorExponent and not _is_small_power(args['op_1'], args['op_2'])):
+		return node
+
+	# If the operation fails in any way (including a CatchableError, such as `1 / 0`),
+	# it's left as it is so that the same error happens when the code actually runs
+
+	evaluator = CodeEvaluator(node)
+	try:
+		evaluator.run()
+	except Exception:
+		return node
+	return _make_literal(node.get_line(), evaluator.get_last_value(), node)
+
+def _is_small_power(base, exponent):
+
+	if (base.get_dtype() != ASTNode.TYPE_INT or exponent.get_dtype() != ASTNode.TYPE_INT):
+		return True
+	return exponent.get_value() <= 0 or abs(base.get_value()).bit_length() * exponent.get_value() <= _MAX_FOLDED_INT_BITS
+
+# Converts a value back into a literal node
+# Values that have no literal form (lists, objects, etc.) leave the original node in place
+
+def _make_literal(line, value, node):
+
+	if (isinstance(value, NullValue)):
+		return ASTValue(line, ASTNode.TYPE_NULL, None)
+	elif (isinstance(value, BoolValue)):
+		return ASTValue(line, ASTNode.TYPE_BOOL, bool(value.get_value()))
+	elif (isinstance(value, IntValue)):
+		return ASTValue(line, ASTNode.TYPE_INT, value.get_value())
+	elif (isinstance(value, FloatValue)):
+		return ASTValue(line, ASTNode.TYPE_FLOAT, value.get_value())
+	elif (isinstance(value, StringValue)):
+		return ASTValue(line, ASTNode.TYPE_STRING, value.get_value())
+	else:
+		return node
\ No newline at end of file
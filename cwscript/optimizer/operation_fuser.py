@@ -0,0 +1,140 @@
+from cwscript.parser.ast import *
+from cwscript.evaluator.operation import *
+
+# Replaces a few combinations of operations that are common in loops with
+# fused operations that do the same thing in a single step (see `fused`),
+# and returns of a function call with tail calls wherever it's safe
+# Only `CodeEvaluator` runs the fused operations, since the other evaluators
+# already compile these combinations into something faster on their own,
+# but every evaluator runs tail calls (see fuse_tail_calls())
+
+# Errors are reported on the line of the operation on top of the stack,
+# so operations are only fused when they're all on the same line
+# The exception is a tail call, which takes the line of the call, since
+# the line of a return is only used when there's no function to return from
+
+_COMPARISONS = frozenset([
+	OperatorLess, OperatorGreater, OperatorLessEqual, OperatorGreaterEqual, OperatorEqual, OperatorUnequal
+])
+
+_INCREMENTS = {
+	OperatorIncrement: FusedIncrement,
+	OperatorDecrement: FusedDecrement
+}
+
+# Fuses every matching combination in the tree, and returns the new root
+# Nodes are visited children first, like in `constant_folder`
+
+def fuse_operations(root):
+
+	order = []
+	stack = [root]
+	while (stack):
+		node = stack.pop()
+		order.append(node)
+		stack.extend(node.get_children())
+	for node in reversed(order):
+		node.map_children(_fuse_node)
+	root = _fuse_node(root)
+	fuse_tail_calls(root)
+	return root
+
+# Returns the fused version of a node, or the node itself if it doesn't match any pattern
+
+def _fuse_node(node):
+
+	if (not isinstance(node, ASTOperation)):
+		return node
+	operation = node.get_operation()
+	args = node.get_args()
+	line = node.get_line()
+
+	# `.x += <leaf>`
+
+	if (operation is OperatorAssignAdd and _is_simple_variable(args['op_1']) and args['op_2'].is_leaf()):
+		return ASTOperation(line, FusedAssignAdd, {'variable': args['op_1'], 'value': args['op_2']})
+
+	# `.x = .x + <literal>`
+
+	elif (operation is OperatorAssign and _is_simple_variable(args['op_1']) and _is_self_add(node)):
+		return ASTOperation(line, FusedAssignAdd, {'variable': args['op_1'], 'value': args['op_2'].get_args()['op_2']})
+
+	# `++.x` and `--.x`
+
+	elif (operation in _INCREMENTS and _is_simple_variable(args['op'])):
+		return ASTOperation(line, _INCREMENTS[operation], {'variable': args['op']})
+
+	# `append <leaf> <leaf>`
+
+	elif (operation is ListAppendStatement and args['source'].is_leaf() and args['value'].is_leaf()):
+		return ASTOperation(line, FusedListAppend, dict(args))
+
+	# `while (<leaf> < <leaf>) ...`
+
+	elif (operation is WhileLoopStatement and _is_leaf_comparison(args['condition'], line)):
+		return ASTOperation(line, FusedWhileCompare, dict(args))
+
+	return node
+
+# Operations that handle a return (or an exception from the function it calls)
+# differently than the CallStatement running the function body would,
+# so no return inside them can be a tail call
+
+_TAIL_CALL_BARRIERS = frozenset([CallStatement, FusedTailCall, TryCatchStatement, NewObjectStatement])
+
+_FUNCTIONS = frozenset([FunctionStatement, LambdaStatement])
+
+# Turns every `return call ...` that's in tail position into a tail call, in place
+# Each node is visited knowing whether it's in a function body,
+# with nothing but operations that let returns through in between
+
+def fuse_tail_calls(root):
+
+	stack = [(root, False)]
+	while (stack):
+		node, in_body = stack.pop()
+		operation = node.get_operation() if (isinstance(node, ASTOperation)) else None
+		if (operation in _FUNCTIONS):
+			stack.extend([(child, name == 'body') for name, child in node.get_args().items()])
+			continue
+		if (in_body and operation not in _TAIL_CALL_BARRIERS):
+			node.map_children(_fuse_tail_call)
+			stack.extend([(child, True) for child in node.get_children()])
+		else:
+			stack.extend([(child, False) for child in node.get_children()])
+
+def _fuse_tail_call(node):
+
+	if not (isinstance(node, ASTOperation) and node.get_operation() is ReturnStatement):
+		return node
+	value = node.get_args()['value']
+	if not (isinstance(value, ASTOperation) and value.get_operation() is CallStatement):
+		return node
+	return ASTOperation(value.get_line(), FusedTailCall, dict(value.get_args()))
+
+# A variable with a single name, in either the current or the global scope
+
+def _is_simple_variable(node):
+
+	return isinstance(node, ASTValue) and node.get_dtype() == ASTNode.TYPE_VARIABLE and len(node.get_value()[1]) == 1
+
+# Whether an assignment's value adds a literal to the same variable
+# The literal can't fail to evaluate, so it doesn't matter that the fused
+# operation evaluates it before reading the variable
+
+def _is_self_add(node):
+
+	value = node.get_args()['op_2']
+	if not (isinstance(value, ASTOperation) and value.get_operation() is OperatorAdd and value.get_line() == node.get_line()):
+		return False
+	op_1 = value.get_args()['op_1']
+	op_2 = value.get_args()['op_2']
+	if not (_is_simple_variable(op_1) and op_1.get_value() == node.get_args()['op_1'].get_value()):
+		return False
+	return isinstance(op_2, ASTValue) and op_2.is_literal()
+
+def _is_leaf_comparison(node, line):
+
+	if not (isinstance(node, ASTOperation) and node.get_operation() in _COMPARISONS and node.get_line() == line):
+		return False
+	return all([arg.is_leaf() for arg in node.get_args().values()])
\ No newline at end of file
@@ -1,3 +1,5 @@
+import copy
+
 from cwscript.constants import *
 from cwscript.errors import *
 from cwscript.evaluator.operation import *
@@ -22,10 +24,56 @@ class ASTNode:
 
 		return self._line
 
+	def get_dtype(self):
+
+		return self._dtype
+
+	# Returns a copy of this node and every node below it, moved by a number of lines
+	# Used when an edit above the node adds or removes lines
+	# The original is left alone, since it may still be part of an earlier AST
+
+	def shifted(self, delta):
+
+		stack = []
+		def copy_node(node):
+			node = copy.copy(node)
+			node._line += delta
+			stack.append(node)
+			return node
+		root = copy_node(self)
+		while (stack):
+			stack.pop().map_children(copy_node)
+		return root
+
+	def get_children(self):
+
+		return []
+
+	# Replaces each child node with `function(child)`
+	# Used by passes that rewrite the tree after parsing
+
+	def map_children(self, function):
+
+		pass
+
+	# Leaves are nodes that evaluate straight to a value, without any operation
+	# to push onto the stack, which are literals and variables
+
+	def is_leaf(self):
+
+		return False
+
 	def evaluate(self, evaluator, value_type, eval_vars):
 
 		raise NotImplementedError()
 
+	# Returns this node's value if the stack evaluator can get it without pushing
+	# an operation for it, and None otherwise
+
+	def evaluate_now(self, evaluator, value_type):
+
+		return None
+
 	# See implementation in ASTValue
 
 	def eval_as_parameters(self, evaluator):
@@ -52,6 +100,31 @@ class ASTValue (ASTNode):
 		self._dtype = dtype
 		self._value = value
 
+	def get_children(self):
+
+		if (self._dtype in [ASTNode.TYPE_BLOCK, ASTNode.TYPE_LIST]):
+			return self._value
+		return []
+
+	def map_children(self, function):
+
+		if (self._dtype in [ASTNode.TYPE_BLOCK, ASTNode.TYPE_LIST]):
+			self._value = [function(node) for node in self._value]
+
+	def get_value(self):
+
+		return self._value
+
+	def is_leaf(self):
+
+		return self._dtype not in [ASTNode.TYPE_BLOCK, ASTNode.TYPE_LIST]
+
+	# Literals are values that can be created without running any code
+
+	def is_literal(self):
+
+		return self._dtype in [ASTNode.TYPE_NULL, ASTNode.TYPE_BOOL, ASTNode.TYPE_INT, ASTNode.TYPE_FLOAT, ASTNode.TYPE_STRING]
+
 	# Allows negating a numeric value directly instead of applying a negation operation
 	# Negating a bool converts it to an int
 
@@ -260,6 +333,48 @@ class ASTOperation (ASTNode):
 		self._args = args
 		self._dtype = ASTNode.TYPE_OTHER
 
+	def get_children(self):
+
+		return list(self._args.values())
+
+	def map_children(self, function):
+
+		self._args = {name: function(node) for name, node in self._args.items()}
+
+	def get_operation(self):
+
+		return self._operation
+
+	def get_args(self):
+
+		return self._args
+
+	# Operations can swap in a variant of themselves that's specialised for the values
+	# they've seen so far (see `QuickeningOperation`), which is used from then on
+	# get_operation() still returns the original, since the variant can change again
+	# If both operands of a variant are leaves, the variant is run by evaluate_now()
+
+	_quickened = None
+	_runs_now = False
+
+	def get_quickened(self):
+
+		return self._quickened
+
+	def quicken(self, operation):
+
+		self._quickened = operation
+		self._runs_now = hasattr(operation, 'run_now') and all([arg.is_leaf() for arg in self._args.values()])
+
+	def evaluate_now(self, evaluator, value_type):
+
+		if (not self._runs_now):
+			return None
+		return self._quickened.run_now(evaluator, self._args, value_type)
+
 	def evaluate(self, evaluator, value_type, eval_vars):
 
-		return self._operation(self._args, self._line, value_type, eval_vars)
\ No newline at end of file
+		operation = (self._quickened or self._operation)(self._args, self._line, value_type, eval_vars)
+		if (operation.quickens):
+			operation.set_node(self)
+		return operation
\ No newline at end of file
@@ -0,0 +1,153 @@
+import os
+import sys
+import pickle
+import marshal
+import hashlib
+import tempfile
+
+from cwscript.constants import *
+
+# Stores parsed ASTs on disk so that unchanged scripts don't need to be
+# lexed and parsed again every time they're run
+# Each cache file holds a key, a digest of the payload, and the pickled AST
+# The key is a hash of the source along with the cache format and Python
+# versions, so a cache file is only used when it was made from the exact same
+# code by a compatible interpreter, and the digest is checked before unpickling
+# so that a damaged file is never loaded
+
+# Cache files are pickled, so (like __pycache__) they should only
+# ever be written by the interpreter itself
+
+CACHE_FOLDER = '__cwcache__'
+CACHE_EXTENSION = '.cwc'
+
+# Compiled Python code for `TranspiledEvaluator`, which is marshalled instead of pickled
+# Code files have the same key and digest header as AST cache files
+
+CODE_CACHE_EXTENSION = '.cwpy'
+
+_HASH_CHUNK_SIZE = 65536
+_KEY_SIZE = hashlib.sha256().digest_size * 2
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+# Returns the cache key for `code`, which is either a string or a text file object
+# Files are hashed in chunks and rewound, so they can still be parsed afterwards
+
+def get_key(code):
+
+	digest = hashlib.sha256()
+	digest.update(f"{AST_CACHE_VERSION}:{sys.implementation.cache_tag}:".encode())
+	if (isinstance(code, str)):
+		digest.update(code.encode('utf-8', 'surrogatepass'))
+	else:
+		start = code.tell()
+		while (True):
+			chunk = code.read(_HASH_CHUNK_SIZE)
+			if (not chunk):
+				break
+			digest.update(chunk.encode('utf-8', 'surrogatepass'))
+		code.seek(start)
+	return digest.hexdigest()
+
+# Cache files for scripts are kept in a folder next to the script by default
+# Inside a shared cache directory, files are named by key instead, which
+# also allows caching code that didn't come from a file
+
+def get_cache_path(key, source_path = None, cache_dir = None, extension = CACHE_EXTENSION):
+
+	if (cache_dir is not None):
+		return os.path.join(cache_dir, key + extension)
+	elif (source_path is not None):
+		folder, name = os.path.split(os.path.abspath(source_path))
+		return os.path.join(folder, CACHE_FOLDER, os.path.splitext(name)[0] + extension)
+	else:
+		return None
+
+# Returns the cached AST, or None if there is no usable cache file
+# A missing, unreadable, outdated, or corrupt cache file is treated as a miss
+
+def load(path, key):
+
+	data = _read_payload(path, key)
+	if (data is None):
+		return None
+	try:
+		return pickle.loads(data)
+	except Exception:
+		return None
+
+# Same as load() for a code object stored by store_code()
+
+def load_code(path, key):
+
+	data = _read_payload(path, key)
+	if (data is None):
+		return None
+	try:
+		return marshal.loads(data)
+	except Exception:
+		return None
+
+# Writes the AST to a temporary file first, then moves it into place
+# Replacing a file is atomic, so other processes either see the
+# old cache file or the complete new one, never a partial write
+# Failing to write the cache is not an error, since it's only an optimization
+
+def store(path, key, ast):
+
+	try:
+		data = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+	except (pickle.PicklingError, RecursionError):
+		return False
+	return _write_atomically(path, _pack_payload(key, data), CACHE_EXTENSION)
+
+def store_code(path, key, code):
+
+	try:
+		data = marshal.dumps(code)
+	except ValueError:
+		return False
+	return _write_atomically(path, _pack_payload(key, data), CODE_CACHE_EXTENSION)
+
+# Cache files start with the key and the sha256 digest of the payload after it
+
+def _pack_payload(key, data):
+
+	return key.encode('ascii') + hashlib.sha256(data).digest() + data
+
+# Returns the payload of the cache file, or None if its key doesn't match
+# or the payload doesn't match its digest
+
+def _read_payload(path, key):
+
+	try:
+		with open(path, 'rb') as file:
+			data = file.read()
+	except OSError:
+		return None
+	header_size = _KEY_SIZE + _DIGEST_SIZE
+	if (len(data) < header_size or data[:_KEY_SIZE] != key.encode('ascii')):
+		return None
+	payload = data[header_size:]
+	if (hashlib.sha256(payload).digest() != data[_KEY_SIZE:header_size]):
+		return None
+	return payload
+
+def _write_atomically(path, data, extension):
+
+	folder = os.path.dirname(path)
+	temp_path = None
+	try:
+		os.makedirs(folder, exist_ok = True)
+		handle, temp_path = tempfile.mkstemp(dir = folder, prefix = '.', suffix = extension + '.tmp')
+		with os.fdopen(handle, 'wb') as file:
+			file.write(data)
+		os.replace(temp_path, path)
+		return True
+	except OSError:
+		if (temp_path is not None and os.path.exists(temp_path)):
+			try:
+				os.remove(temp_path)
+			except OSError:
+				pass
+		return False
\ No newline at end of file
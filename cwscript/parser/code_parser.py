@@ -1,16 +1,37 @@
 from cwscript.constants import *
 from cwscript.errors import *
 from cwscript.lexer import code_lexer
-from cwscript.lexer.token import Token
+from cwscript.lexer.token import Token, TokenTable
 from cwscript.parser.ast import *
 from cwscript import rules
 
-def parse(code):
+# Groups can be nested up to `max_depth` levels deep before a CWParseError is raised
 
-	# Start by splitting the code into tokens
+def parse(code, max_depth = MAX_NESTING_DEPTH):
 
-	tokens = code_lexer.lex(code)
-	return _parse_block(0, tokens)
+	# The lexer hands over one statement at a time, each in its own `TokenTable`,
+	# so the code can either be a string or a text file object that is read while parsing
+
+	statements = []
+	for table in code_lexer.Lexer(code).lex_statements():
+		statements.append(parse_statement(table, max_depth))
+	return ASTValue(0, ASTNode.TYPE_BLOCK, statements)
+
+# Parses one top-level statement, as handed over by `Lexer.lex_statements()`
+
+def parse_statement(table, max_depth = MAX_NESTING_DEPTH):
+
+	return _parse_statement(0, table, 0, len(table), True, max_depth)
+
+# Parses tokens that have already been lexed
+# `tokens` can be a `TokenTable`, or a list (or any other iterable) of tokens,
+# which is stored in a table first
+
+def parse_tokens(tokens, max_depth = MAX_NESTING_DEPTH):
+
+	if (not isinstance(tokens, TokenTable)):
+		tokens = TokenTable.from_tokens(tokens)
+	return _parse_block(0, tokens, 0, len(tokens), max_depth)
 
 # At their core, blocks and lists are composed of
 # expressions delimited by separators (; or ,)
@@ -18,234 +39,427 @@ def parse(code):
 # One important difference: list expressions need not have a trailing comma,
 # but statements in blocks must always end with semicolons
 
-def _parse_block(line, tokens):
+# Tokens are read by index from the columns of a `TokenTable`, and never copied into token objects
+# Each statement's grouping symbols are matched up front, and every
+# method works on a range [start, end) of its tokens
+# Units that are still tokens (see `_GroupFrame`) are kept as their index
+# This keeps parsing linear in the number of tokens
+
+def _parse_block(line, table, start, end, max_depth = MAX_NESTING_DEPTH):
 
-	return _parse_block_or_list(line, tokens, True)
+	return _parse_block_or_list(line, table, start, end, True, max_depth)
 
-def _parse_list(line, tokens):
+def _parse_list(line, table, start, end, max_depth = MAX_NESTING_DEPTH):
 
-	return _parse_block_or_list(line, tokens, False)
+	return _parse_block_or_list(line, table, start, end, False, max_depth)
 
-def _parse_block_or_list(line, tokens, is_block):
+def _parse_block_or_list(line, table, start, end, is_block, max_depth):
 
 	# Parse tokens statement-by-statement
 
 	separator = Token.SEMICOLON if is_block else Token.COMMA
 	statements = []
-	while (tokens):
-
-		statement = []
-		stack = []
-		while (tokens):
-			token = tokens.pop(0)
-			statement.append(token)
-			if (token.type == Token.GROUP_OPEN):
-				stack.append(token.body)
-			elif (token.type == Token.GROUP_CLOSE):
-				if (not stack):
-					raise CWParseError(f"Unbalanced closing symbol '{token.body}'", token.get_line())
-				elif (not rules.check_group_symbols(stack[-1], token.body)):
-					raise CWParseError(f"Unexpected closing symbol '{token.body}'", token.get_line())
-				else:
-					stack.pop()
-			elif (token.type == separator):
-				if (not stack):
-					break
-
-		# Make sure block statements end with semicolon
-		# List values may or may not have trailing comma
-		# In either case, the separator is removed
-
-		if (statement[-1].type != separator):
-			if (is_block):
-				raise CWParseError("Statement does not end with semicolon", statement[-1].get_line())
-		else:
-			statement = statement[:-1]
-		if (len(statement) == 0):
-			if (is_block):
-				raise CWParseError("Empty statement", line)
-			else:
-				raise CWParseError("Empty list value", line)
-		statements.append(_parse_group(statement[0].get_line(), statement))
+	for statement_start, statement_end in _split_statements(table, start, end, separator):
+		statements.append(_parse_statement(line, table, statement_start, statement_end, is_block, max_depth))
 
 	if (is_block):
 		return ASTValue(line, ASTNode.TYPE_BLOCK, statements)
 	else:
 		return ASTValue(line, ASTNode.TYPE_LIST, statements)
 
-def _parse_group(line, tokens):
+# Parses the tokens in [start, end) of a table as a single statement or list value, including its separator
+
+def _parse_statement(line, table, start, end, is_block, max_depth = MAX_NESTING_DEPTH):
+
+	tokens = _StatementTokens(table, start, end)
+	frame = _statement_frame(tokens, _match_groups(tokens), 0, end - start, line, is_block, 0)
+	return _parse_range(frame, max_depth)
 
-	# Step 1. Parse groups within this group
+# The type, body, and line columns of a single statement, read out of its table at once
+# Almost every body is needed while parsing, so they're sliced out of the source only once
+# Indexes start from the statement's first token
 
-	# Process:
-	# Move the start pointer through the group until an opening token is found
-	# Pop the token at the start pointer, modifying the stack if it's a group token
-	# Once the group is closed, parse it
-	# Insert the parsed expression at the start pointer
-	# Continue incrementing the start pointer as before
+class _StatementTokens:
 
-	pos = 0
+	__slots__ = ('types', 'bodies', 'lines')
+
+	def __init__(self, table, start, end):
+
+		self.types = table.get_types()[start:end]
+		self.bodies = table.get_bodies(start, end)
+		self.lines = table.get_lines()[start:end]
+
+# Yields the range of each statement ending at the separator of the current level
+# Ranges are yielded as they're found, so a statement is parsed before
+# any errors in the grouping symbols of the ones after it are found
+
+def _split_statements(table, start, end, separator):
+
+	types = table.get_types()
+	statement_start = start
 	stack = []
-	while (pos < len(tokens)):
+	for i, token_type in enumerate(types[start:end], start):
+		if (token_type == Token.GROUP_OPEN):
+			stack.append(table.get_body(i))
+		elif (token_type == Token.GROUP_CLOSE):
+			if (not stack):
+				raise CWParseError(f"Unbalanced closing symbol '{table.get_body(i)}'", table.get_line(i))
+			elif (not rules.check_group_symbols(stack[-1], table.get_body(i))):
+				raise CWParseError(f"Unexpected closing symbol '{table.get_body(i)}'", table.get_line(i))
+			else:
+				stack.pop()
+		elif (token_type == separator):
+			if (not stack):
+				yield (statement_start, i + 1)
+				statement_start = i + 1
+	if (statement_start < end):
+		yield (statement_start, end)
+
+# Returns a list where each opening symbol's index holds the index of its closing symbol
+# Groups that are never closed are left as None
 
-		token = tokens[pos]
+def _match_groups(tokens):
+
+	types = tokens.types
+	matches = [None] * len(types)
+	stack = []
+	for i, token_type in enumerate(types):
+		if (token_type == Token.GROUP_OPEN):
+			stack.append(i)
+		elif (token_type == Token.GROUP_CLOSE):
+			if (not stack):
+				raise CWParseError(f"Unbalanced closing symbol '{tokens.bodies[i]}'", tokens.lines[i])
+			elif (not rules.check_group_symbols(tokens.bodies[stack[-1]], tokens.bodies[i])):
+				raise CWParseError(f"Unexpected closing symbol '{tokens.bodies[i]}'", tokens.lines[i])
+			matches[stack.pop()] = i
+	return matches
+
+# Nested groups are parsed with an explicit stack of frames instead of recursion,
+# so deeply nested code only costs memory, up to a nesting depth of `max_depth`
+# A frame hands out the ranges nested inside of it one at a time,
+# and gets back each range's parsed node before handing out the next one
+
+def _parse_range(frame, max_depth):
+
+	stack = [frame]
+	node = None
+	while (True):
+
+		frame = stack[-1]
+		if (node is not None):
+			frame.add(node)
+		child = frame.next_child()
+
+		# Once a frame has no nested ranges left, its node goes to the frame below it
+
+		if (child is None):
+			node = frame.finish()
+			stack.pop()
+			if (not stack):
+				return node
+		else:
+			if (child.depth > max_depth):
+				raise CWParseError(f"Groups are nested more than {max_depth} levels deep", child.line)
+			stack.append(child)
+			node = None
+
+# Splits a block or list at separators outside of any nested group
+# Each statement or list value is then parsed by its own frame
+
+class _BlockOrListFrame:
+
+	def __init__(self, tokens, matches, start, end, line, is_block, depth):
+
+		self.tokens = tokens
+		self.types = tokens.types
+		self.matches = matches
+		self.pos = start
+		self.end = end
+		self.line = line
+		self.is_block = is_block
+		self.depth = depth
+		self.separator = Token.SEMICOLON if is_block else Token.COMMA
+		self.statement_start = start
+		self.statements = []
+
+	def add(self, node):
+
+		self.statements.append(node)
+
+	# Nested groups are skipped over entirely using their matching symbol,
+	# since they're parsed along with the statement they're in
+
+	def next_child(self):
+
+		types = self.types
+		while (self.pos < self.end):
+			token_type = types[self.pos]
+			if (token_type == Token.GROUP_OPEN):
+				close = self.matches[self.pos]
+				self.pos = self.end if (close is None) else close + 1
+				continue
+			self.pos += 1
+			if (token_type == self.separator):
+				start = self.statement_start
+				self.statement_start = self.pos
+				return _statement_frame(self.tokens, self.matches, start, self.pos, self.line, self.is_block, self.depth)
+		if (self.statement_start < self.end):
+			start = self.statement_start
+			self.statement_start = self.end
+			return _statement_frame(self.tokens, self.matches, start, self.end, self.line, self.is_block, self.depth)
+		return None
+
+	def finish(self):
+
+		if (self.is_block):
+			return ASTValue(self.line, ASTNode.TYPE_BLOCK, self.statements)
+		else:
+			return ASTValue(self.line, ASTNode.TYPE_LIST, self.statements)
+
+def _statement_frame(tokens, matches, start, end, line, is_block, depth):
+
+	# Make sure block statements end with semicolon
+	# List values may or may not have trailing comma
+	# In either case, the separator is removed
+
+	separator = Token.SEMICOLON if is_block else Token.COMMA
+	if (tokens.types[end - 1] != separator):
+		if (is_block):
+			raise CWParseError("Statement does not end with semicolon", tokens.lines[end - 1])
+	else:
+		end -= 1
+	if (start == end):
+		if (is_block):
+			raise CWParseError("Empty statement", line)
+		else:
+			raise CWParseError("Empty list value", line)
+	return _GroupFrame(tokens, matches, start, end, tokens.lines[start], depth)
 
-		# Start reading group
+def _parse_group(line, table, start, end, max_depth = MAX_NESTING_DEPTH):
 
-		if (_is_token(token, Token.GROUP_OPEN)):
-			stack.append(token.body)
-			tokens.pop(pos)
-			group = [token]
-			while (tokens[pos:]):
+	tokens = _StatementTokens(table, start, end)
+	return _parse_range(_GroupFrame(tokens, _match_groups(tokens), 0, end - start, line, 0), max_depth)
 
-				token = tokens.pop(pos)
-				group.append(token)
+# Step 1. Parse groups within this group
+# Each group is parsed into a single expression, which takes its place
+# in the list of operands and operators for this group
+# A group that is never closed swallows the rest of the tokens
 
-				# Monitor opening/closing groups
+class _GroupFrame:
 
-				if (_is_token(token, Token.GROUP_OPEN)):
-					stack.append(token.body)
-				elif (_is_token(token, Token.GROUP_CLOSE)):
+	def __init__(self, tokens, matches, start, end, line, depth):
 
-					# Close group and push expression
+		self.tokens = tokens
+		self.types = tokens.types
+		self.matches = matches
+		self.pos = start
+		self.end = end
+		self.line = line
+		self.depth = depth
+		self.units = []
 
-					if (not rules.check_group_symbols(stack[-1], token.body)):
-						raise CWParseError(f"Unexpected closing symbol '{token.body}'", token.get_line())
-					else:
-						stack.pop()
-						if (not stack):
-							if (group[0].body == '('):
-								tokens.insert(pos, _parse_group(group[0].get_line(), group[1:-1]))
-							elif (group[0].body == '{'):
-								tokens.insert(pos, _parse_block(group[0].get_line(), group[1:-1]))
-							elif (group[0].body == '['):
-								tokens.insert(pos, _parse_list(group[0].get_line(), group[1:-1]))
-							else:
-								raise RuntimeError("Invalid grouping type")
-							break
+	def add(self, node):
 
-		elif (_is_token(token, Token.GROUP_CLOSE)):
-			raise CWParseError(f"Unbalanced closing symbol '{token.body}'", token.get_line())
-		pos += 1
+		self.units.append(node)
+
+	def next_child(self):
+
+		tokens = self.tokens
+		types = self.types
+		units = self.units
+		pos = self.pos
+		while (pos < self.end):
+
+			token_type = types[pos]
+			if (token_type == Token.GROUP_OPEN):
+				close = self.matches[pos]
+				if (close is None):
+					break
+				self.pos = close + 1
+				symbol = tokens.bodies[pos]
+				if (symbol == '('):
+					return _GroupFrame(tokens, self.matches, pos + 1, close, tokens.lines[pos], self.depth + 1)
+				elif (symbol == '{'):
+					return _BlockOrListFrame(tokens, self.matches, pos + 1, close, tokens.lines[pos], True, self.depth + 1)
+				elif (symbol == '['):
+					return _BlockOrListFrame(tokens, self.matches, pos + 1, close, tokens.lines[pos], False, self.depth + 1)
+				else:
+					raise RuntimeError("Invalid grouping type")
+			elif (token_type == Token.GROUP_CLOSE):
+				raise CWParseError(f"Unbalanced closing symbol '{tokens.bodies[pos]}'", tokens.lines[pos])
+			else:
+				units.append(pos)
+				pos += 1
+
+		self.pos = self.end
+		return None
+
+	def finish(self):
+
+		return _parse_units(self.tokens, self.units, self.line)
+
+# Parses the units of a single group into one expression
+# Each unit is either a parsed group, or the index of a token
+
+def _parse_units(tokens, units, line):
+
+	types = tokens.types
 
 	# Step 2. Parse statements and prefix operators from right to left
 	# Free type operands are parsed if necessary
+	# Everything to the right of the current position has already been parsed,
+	# and is kept on a stack with the leftmost item on top
+
+	parsed = []
+	for unit in reversed(units):
 
-	pos = len(tokens) - 1
-	while (pos >= 0):
+		# Groups have already been parsed
 
-		token = tokens[pos]
+		if (type(unit) is not int):
+			parsed.append(unit)
+			continue
+
+		token_type = types[unit]
 
 		# Start reading statement
 
-		if (_is_token(token, Token.EXPR_ROOT)):
+		if (token_type == Token.EXPR_ROOT):
 
+			body = tokens.bodies[unit]
 			arguments = {}
-			tokens.pop(pos)
-			for i in range(rules.get_arg_count(token.body)):
+			for i in range(rules.get_arg_count(body)):
 
-				try:
-					argument = tokens.pop(pos)
-				except IndexError:
-					raise CWParseError(f"Statement '{token.body}' is missing argument(s)", token.get_line())
+				if (not parsed):
+					raise CWParseError(f"Statement '{body}' is missing argument(s)", tokens.lines[unit])
+				argument = parsed.pop()
 
 				# Attempt to parse into one of the three expression types
 				# At this point, `argument` can be a free type token or an expression
 
-				arg_name, is_keyword = rules.get_arg(token.body, i)
+				arg_name, is_keyword = rules.get_arg(body, i)
 				if (is_keyword):
-					if (not _is_token(argument, Token.FREE_TYPE) or argument.body != arg_name):
-						raise CWParseError(f"Expected keyword '{arg_name}' in statement '{token.body}'", token.get_line())
+					if (not (type(argument) is int and types[argument] == Token.FREE_TYPE) or tokens.bodies[argument] != arg_name):
+						raise CWParseError(f"Expected keyword '{arg_name}' in statement '{body}'", tokens.lines[unit])
 				else:
-					if (_is_token(argument, Token.FREE_TYPE)):
-						argument = _parse_free_type(argument)
+					if (type(argument) is int and types[argument] == Token.FREE_TYPE):
+						argument = _parse_free_type(tokens, argument)
 					if (not isinstance(argument, ASTNode)):
-						raise CWParseError(f"Invalid dynamic expression in statement '{token.body}'", token.get_line())
+						raise CWParseError(f"Invalid dynamic expression in statement '{body}'", tokens.lines[unit])
 					arguments[arg_name] = argument
 
-			statement_class = rules.get_statement_class(token.body)
-			tokens.insert(pos, ASTOperation(token.get_line(), statement_class, arguments))
+			statement_class = rules.get_statement_class(body)
+			parsed.append(ASTOperation(tokens.lines[unit], statement_class, arguments))
 
 		# Group prefix operator with successive operand
 
-		elif (_is_token(token, Token.PREFIX_OP)):
+		elif (token_type == Token.PREFIX_OP):
 
-			operator = token
-			tokens.pop(pos)
-			try:
-				operand = tokens.pop(pos)
-			except IndexError:
-				raise CWParseError(f"Prefix operator '{token.body}' is missing operand", token.get_line())
-			if (_is_token(operand, Token.FREE_TYPE)):
-				operand = _parse_free_type(operand)
+			if (not parsed):
+				raise CWParseError(f"Prefix operator '{tokens.bodies[unit]}' is missing operand", tokens.lines[unit])
+			operand = parsed.pop()
+			if (type(operand) is int and types[operand] == Token.FREE_TYPE):
+				operand = _parse_free_type(tokens, operand)
 			if (not isinstance(operand, ASTNode)):
-				raise CWParseError(f"Invalid operand for operator '{token.body}'", token.get_line())
+				raise CWParseError(f"Invalid operand for operator '{tokens.bodies[unit]}'", tokens.lines[unit])
+			parsed.append(_make_prefix_op(tokens, unit, operand))
+
+		else:
+			parsed.append(unit)
 
-			# Special case: negation applied to an int or float will just be applied
-			# here instead of grouping it under an operation
+	# Step 3. Parse binary operators in a single left-to-right pass
+	# Operands and operators are kept on separate stacks
+	# Before an operator is pushed, every operator on the stack that binds at
+	# least as tightly is combined with its operands
+	# Right-to-left operators (assignment) only give way to operators that bind
+	# more tightly, so a chain of them is combined starting from the right
 
-			operator_class = rules.get_prefix_op_class(token.body)
-			if (operator_class is OperatorNegative and (isinstance(operand, ASTValue))):
-				if (operand.try_negate()):
-					token_to_insert = operand
-			else:
-				token_to_insert = ASTOperation(token.get_line(), operator_class, {'op': operand})
-			tokens.insert(pos, token_to_insert)
-
-		pos -= 1
-
-	# Step 3. Parse binary operators
-	# Done group-by-group, starting with highest precedence
-	# Must take associativity into account when choosing direction to iterate
-
-	for op_group in rules.get_op_groups():
-		l_to_r, current_ops = op_group
-		pos = 0 if l_to_r else (len(tokens) - 1)
-		while ((pos < len(tokens)) if l_to_r else (pos >= 0)):
-
-			token = tokens[pos]
-
-			# Group operator with surrounding operands
-
-			if (_is_token(token, Token.BINARY_OP) and token.body in current_ops):
-				try:
-					operand_2 = tokens.pop(pos + 1)
-					tokens.pop(pos)
-					operand_1 = tokens.pop(pos - 1)
-				except IndexError:
-					raise CWParseError(f"Binary operator '{token.body}' is missing operand(s)", token.get_line())
-				if (_is_token(operand_1, Token.FREE_TYPE)):
-					operand_1 = _parse_free_type(operand_1)
-				if (_is_token(operand_2, Token.FREE_TYPE)):
-					operand_2 = _parse_free_type(operand_2)
-				if not (isinstance(operand_1, ASTNode) and isinstance(operand_2, ASTNode)):
-					raise CWParseError(f"Invalid operand for operator '{token.body}'", token.get_line())
-				pos -= 1
-				operator_class = rules.get_binary_op_class(token.body)
-				tokens.insert(pos, ASTOperation(token.get_line(), operator_class, {'op_1': operand_1, 'op_2': operand_2}))
-
-			pos += 1 if l_to_r else -1
+	operands = []
+	operators = []
+	for unit in reversed(parsed):
+
+		if (type(unit) is int and types[unit] == Token.BINARY_OP):
+			body = tokens.bodies[unit]
+			precedence, l_to_r = rules.get_binary_op_precedence(body)
+
+			# An operator where an operand should be is reported for whichever
+			# of the two operators would have been combined first
+
+			if (len(operands) == len(operators)):
+				if (not operators):
+					raise CWParseError(f"Binary operator '{tokens.bodies[unit]}' is missing operand(s)", tokens.lines[unit])
+				if (_binds_before(operators[-1][0], precedence, l_to_r)):
+					unit = operators[-1][1]
+				raise CWParseError(f"Invalid operand for operator '{tokens.bodies[unit]}'", tokens.lines[unit])
+
+			while (operators and _binds_before(operators[-1][0], precedence, l_to_r)):
+				_combine_binary_op(tokens, operands, operators)
+			operators.append((precedence, unit, body))
+
+		# Two operands in a row can't be joined by anything
+
+		elif (len(operands) > len(operators)):
+			raise CWParseError("Could not resolve group operation", line)
+		else:
+			operands.append(unit)
+
+	if (operators and len(operands) == len(operators)):
+		unit = operators[-1][1]
+		raise CWParseError(f"Binary operator '{tokens.bodies[unit]}' is missing operand(s)", tokens.lines[unit])
+	while (operators):
+		_combine_binary_op(tokens, operands, operators)
 
 	# Free types should've been parsed along with their respective operators/statements
 	# The other possiblity is this group contained a single free type by itself
 	# In this case, parse the free type
 	# At this point, we should only have 1 remaining element, the tree root
+	# The only other token that can be left is a separator by itself
 
-	if (len(tokens) == 0):
+	if (len(operands) == 0):
 		raise CWParseError("Empty group", line)
-	elif (len(tokens) >= 2):
-		raise CWParseError("Could not resolve group operation", line)
-	if (_is_token(tokens[0], Token.FREE_TYPE)):
-		tokens[0] = _parse_free_type(tokens[0])
+	if (type(operands[0]) is int and types[operands[0]] == Token.FREE_TYPE):
+		operands[0] = _parse_free_type(tokens, operands[0])
+	elif (type(operands[0]) is int):
+		raise CWParseError(f"Unexpected separator '{tokens.bodies[operands[0]]}'", tokens.lines[operands[0]])
+
+	return operands[0]
+
+# Special case: negation applied to an int or float will just be applied
+# here instead of grouping it under an operation
+
+def _make_prefix_op(tokens, index, operand):
+
+	operator_class = rules.get_prefix_op_class(tokens.bodies[index])
+	if (operator_class is OperatorNegative and isinstance(operand, ASTValue) and operand.try_negate()):
+		return operand
+	return ASTOperation(tokens.lines[index], operator_class, {'op': operand})
+
+# Checks if an operator to the left of another is combined before it
+
+def _binds_before(left_precedence, precedence, l_to_r):
+
+	return left_precedence < precedence or (left_precedence == precedence and l_to_r)
+
+# Pops the top operator and its two operands, and pushes them back as one operation
 
-	return tokens[0]
+def _combine_binary_op(tokens, operands, operators):
 
-def _parse_free_type(token):
+	_, index, body = operators.pop()
+	operand_2 = operands.pop()
+	operand_1 = operands.pop()
+	operands.append(_make_binary_op(tokens, index, body, operand_1, operand_2))
 
-	return ASTValue.parse(token.get_line(), token.body)
+def _make_binary_op(tokens, index, body, operand_1, operand_2):
 
-# Type-safe method for checking if a value is a specific token
+	types = tokens.types
+	if (type(operand_1) is int and types[operand_1] == Token.FREE_TYPE):
+		operand_1 = _parse_free_type(tokens, operand_1)
+	if (type(operand_2) is int and types[operand_2] == Token.FREE_TYPE):
+		operand_2 = _parse_free_type(tokens, operand_2)
+	if not (isinstance(operand_1, ASTNode) and isinstance(operand_2, ASTNode)):
+		raise CWParseError(f"Invalid operand for operator '{body}'", tokens.lines[index])
+	operator_class = rules.get_binary_op_class(body)
+	return ASTOperation(tokens.lines[index], operator_class, {'op_1': operand_1, 'op_2': operand_2})
 
-def _is_token(value, token_type):
+def _parse_free_type(tokens, index):
 
-	return isinstance(value, Token) and value.type == token_type
\ No newline at end of file
+	return ASTValue.parse(tokens.lines[index], tokens.bodies[index])
\ No newline at end of file
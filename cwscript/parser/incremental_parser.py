@@ -0,0 +1,143 @@
+from cwscript.constants import *
+from cwscript.errors import *
+from cwscript.lexer import code_lexer
+from cwscript.lexer.token import Token
+from cwscript.parser.ast import *
+from cwscript.parser import code_parser
+
+# Parses the same script over and over as it is edited
+# Top-level statements are cached along with the range of the source they
+# were lexed from, and on each edit only the statements touching the edited
+# range are lexed and parsed again
+# Every other statement keeps its ASTNode, which is copied to its new line if needed,
+# so ASTs returned earlier keep their own line numbers
+
+# A top-level statement always ends with a semicolon, after which the lexer
+# is never in the middle of a token, string, or comment
+# This makes the end of each statement a safe point to start or stop lexing
+# The exception is a statement with a group that is never closed, which runs on
+# to the end of the code, so any edit after its start is also an edit to it
+
+class _CachedStatement:
+
+	def __init__(self, node, end, end_line, is_open):
+
+		self.node = node
+		self.end = end
+		self.end_line = end_line
+		self.is_open = is_open
+
+class IncrementalParser:
+
+	def __init__(self):
+
+		self._code = ""
+		self._statements = []
+
+	# Parses new code, reusing as much of the previous parse as possible
+	# The edited range is found by comparing the code to the previous version
+	# If parsing fails, the previous version stays cached
+
+	def parse(self, code):
+
+		start = _common_prefix(self._code, code)
+		suffix = _common_suffix(self._code[start:], code[start:])
+		return self.edit(start, len(self._code) - suffix, code[start:len(code) - suffix])
+
+	# Replaces the code in [start, end) with `text` and returns the new AST
+
+	def edit(self, start, end, text):
+
+		old_code = self._code
+		code = old_code[:start] + text + old_code[end:]
+		delta = len(text) - (end - start)
+		line_delta = text.count('\n') - old_code.count('\n', start, end)
+
+		# Statements that end before the edit are kept as they are
+		# Lexing restarts at the end of the last of them
+
+		first = 0
+		while (first < len(self._statements) and self._statements[first].end <= start):
+			first += 1
+		if (first > 0 and self._statements[first - 1].is_open):
+			first -= 1
+		if (first > 0):
+			lex_start = self._statements[first - 1].end
+			lex_line = self._statements[first - 1].end_line
+		else:
+			lex_start = 0
+			lex_line = 0
+
+		# Statements that end after the edit can be reused as soon as a new statement
+		# ends in the same place, since the code after that point hasn't changed
+
+		resync = {}
+		for i in range(first, len(self._statements)):
+			if (self._statements[i].end >= end):
+				resync[self._statements[i].end + delta] = i
+
+		new_statements = []
+		reuse_from = len(self._statements)
+		for table in code_lexer.Lexer(code, start = lex_start, line = lex_line).lex_statements():
+			node = code_parser.parse_statement(table)
+			statement_end = table.get_end(len(table) - 1)
+			types = table.get_types()
+			is_open = types.count(Token.GROUP_OPEN) > types.count(Token.GROUP_CLOSE)
+			new_statements.append(_CachedStatement(node, statement_end, table.get_line(len(table) - 1), is_open))
+			if (statement_end in resync):
+				reuse_from = resync[statement_end] + 1
+				break
+
+		# Statements after the resync point only need to be moved
+
+		kept = self._statements[reuse_from:]
+		for cached in kept:
+			cached.end += delta
+			cached.end_line += line_delta
+			if (line_delta != 0):
+				cached.node = cached.node.shifted(line_delta)
+
+		self._code = code
+		self._statements = self._statements[:first] + new_statements + kept
+		return self.get_ast()
+
+	def get_ast(self):
+
+		return ASTValue(0, ASTNode.TYPE_BLOCK, [cached.node for cached in self._statements])
+
+	def get_code(self):
+
+		return self._code
+
+# Lengths of the matching start/end of two strings
+# Compared in slices so that most of the work is done by string comparison
+
+def _common_prefix(a, b):
+
+	size = min(len(a), len(b))
+	pos = 0
+	step = 4096
+	while (pos < size):
+		step = min(step, size - pos)
+		if (a[pos:pos + step] == b[pos:pos + step]):
+			pos += step
+		elif (step > 1):
+			step //= 2
+		else:
+			break
+	return pos
+
+def _common_suffix(a, b):
+
+	size = min(len(a), len(b))
+	pos = 0
+	step = 4096
+	while (pos < size):
+		step = min(step, size - pos)
+		if (a[len(a) - pos - step:len(a) - pos] == b[len(b) - pos - step:len(b) - pos]):
+			pos += step
+		elif (step > 1):
+			step //= 2
+		else:
+			break
+	return pos
\ No newline at end of file
@@ -1,23 +1,111 @@
+import linecache
+
 from cwscript.constants import *
 from cwscript.errors import *
 from cwscript import rules
 from cwscript.parser import code_parser
+from cwscript.parser import ast_cache
+from cwscript.optimizer import constant_folder
+from cwscript.optimizer import operation_fuser
 from cwscript.evaluator.code_evaluator import *
+from cwscript.evaluator.closure_evaluator import ClosureEvaluator
+from cwscript.evaluator.bytecode_evaluator import BytecodeEvaluator
+from cwscript.evaluator.tiered_evaluator import TieredEvaluator
+from cwscript.evaluator.unboxed_evaluator import UnboxedEvaluator
+from cwscript.evaluator.transpiled_evaluator import create_transpiled_evaluator
 
 # Runs the evaluator and keeps track of basic debug info
+# `code` can either be a string or a text file object
+# Files are parsed as they're read, so the whole source is never held in memory
+# Error context is then looked up from the file by name (if it has one)
+
+# With `cache` enabled, the parsed AST is saved to disk and reused
+# the next time the same code is run (see `ast_cache`)
+# Cache files go in `cache_dir` if it's given, or next to the source file otherwise
+
+# `engine` picks the evaluator: 'stack' runs the AST on an evaluation stack,
+# 'closure' compiles it into Python closures first, which is much faster
+# but uses Python's own stack for nested code, and 'bytecode' compiles it into
+# flat instructions for a virtual machine with its own call stack,
+# and 'python' translates it into Python source and compiles that,
+# falling back to 'stack' for code it can't translate
+# 'tiered' works like 'stack', but compiles loops into closures once they get hot,
+# so a single step can run the rest of a long loop
+# 'unboxed' works like 'closure', but represents values as native Python values
+# instead of `ScriptValue`s, so arithmetic doesn't create a new object for every result
+# With `cache` enabled, the 'python' engine also caches its compiled code
+# `engine_options` are passed on to the engine as keyword arguments,
+# like {'hot_loop_threshold': 100} for 'tiered'
+
+ENGINES = {
+	'stack': CodeEvaluator,
+	'closure': ClosureEvaluator,
+	'bytecode': BytecodeEvaluator,
+	'python': create_transpiled_evaluator,
+	'tiered': TieredEvaluator,
+	'unboxed': UnboxedEvaluator
+}
 
 class Program:
 
-	def __init__(self, code, debug):
+	def __init__(self, code, debug, cache = False, cache_dir = None, engine = 'stack', engine_options = None):
 
+		self._evaluator = None
 		try:
-			self._code = code
+			if (isinstance(code, str)):
+				self._code = code
+				self._path = None
+			else:
+				self._code = None
+				self._path = getattr(code, 'name', None)
 			self._debug = debug
 			self._exit_code = 0
-			self._evaluator = CodeEvaluator(code_parser.parse(self._code))
+			if (cache):
+				ast = self._parse_cached(code, cache_dir)
+			else:
+				ast = self._parse(code)
+
+			# Fused operations are only run by the stack engines, so they're added after caching
+			# Tail calls are run by every engine, so the same functions can recurse just as deep on all of them
+
+			if (engine in ('stack', 'tiered')):
+				ast = operation_fuser.fuse_operations(ast)
+			else:
+				operation_fuser.fuse_tail_calls(ast)
+			options = {} if (engine_options is None) else engine_options
+			if (cache and engine == 'python'):
+				self._evaluator = create_transpiled_evaluator(ast, self._path, cache_dir, **options)
+			else:
+				self._evaluator = ENGINES[engine](ast, **options)
 		except CWError as error:
 			self._handle_error(error)
 
+	# Parses the code and runs optimization passes over the AST
+
+	def _parse(self, code):
+
+		return constant_folder.fold_constants(code_parser.parse(code))
+
+	# Loads the AST from the cache if it's up to date, or parses and caches it otherwise
+	# Files that can't be rewound after hashing (like pipes) are always parsed
+
+	def _parse_cached(self, code, cache_dir):
+
+		if (not isinstance(code, str) and not code.seekable()):
+			return self._parse(code)
+		key = ast_cache.get_key(code)
+		path = ast_cache.get_cache_path(key, self._path, cache_dir)
+		if (path is None):
+			return self._parse(code)
+		ast = ast_cache.load(path, key)
+		if (ast is None):
+			ast = self._parse(code)
+			ast_cache.store(path, key, ast)
+		return ast
+
+	# Runs a single step, which is useful for debugging
+	# Returns false once the program has finished
+
 	def run_next(self):
 
 		if (self._exit_code == 1):
@@ -27,6 +115,29 @@ class Program:
 		except CWError as error:
 			self._handle_error(error)
 
+	# Runs up to `steps` steps at once, and returns false once the program has finished
+
+	def run_steps(self, steps):
+
+		if (self._exit_code == 1):
+			return False
+		try:
+			return self._evaluator.run_steps(steps)
+		except CWError as error:
+			self._handle_error(error)
+			return False
+
+	# Runs the rest of the program, and returns the exit code
+
+	def run(self):
+
+		if (self._exit_code == 0):
+			try:
+				self._evaluator.run()
+			except CWError as error:
+				self._handle_error(error)
+		return self._exit_code
+
 	# A CWException will only propogate past here if in debug mode
 	# After an exception is handled, no more code will be run,
 	# signaled by setting exit code to != 0
@@ -35,13 +146,29 @@ class Program:
 
 		error_line = error.get_line()
 		if (error_line is not None):
-			error.set_context(self._code.split('\n')[error_line])
+			error.set_context(self._get_context(error_line))
 		self._exit_code = 1
 		if (self._debug):
 			raise error
 		else:
 			print(error.str())
 
+	def _get_context(self, line):
+
+		if (self._code is not None):
+			return self._code.split('\n')[line]
+		elif (self._path is not None):
+			return linecache.getline(self._path, line + 1).rstrip('\n')
+		else:
+			return ""
+
+	# Returns how many loops the evaluator has compiled, or None if it doesn't compile loops
+	# (see `TieredEvaluator`)
+
+	def get_tiering_stats(self):
+
+		return None if (self._evaluator is None) else self._evaluator.get_tiering_stats()
+
 	def get_exit_code(self):
 
 		return self._exit_code
\ No newline at end of file
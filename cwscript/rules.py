@@ -194,14 +194,29 @@ def _define_op_group(l_to_r, operators, operator_classes):
 
 	global _op_groups
 	global _binary_ops
-	_op_groups.append([l_to_r, operators.split(' ')])
+	global _binary_op_precedence
 	for i, op_string in enumerate(operators.split(' ')):
 		_binary_ops[op_string] = operator_classes[i]
+		_binary_op_precedence[op_string] = (len(_op_groups), l_to_r)
+		_add_to_op_trie(op_string)
+	_op_groups.append([l_to_r, operators.split(' ')])
 
 def _define_prefix_op(operator, operator_class):
 
 	global _prefix_ops
 	_prefix_ops[operator] = operator_class
+	_add_to_op_trie(operator)
+
+# Every operator string is also stored in a trie, which lets the lexer
+# match operators one character at a time without building any lists
+# Each node maps a character to the node for the string continued by it
+# The trie is updated in place, so references to it never go stale
+
+def _add_to_op_trie(op_string):
+
+	node = _op_trie
+	for c in op_string:
+		node = node.setdefault(c, {})
 
 # Returns series of (l_to_r, operators)
 
@@ -209,6 +224,17 @@ def get_op_groups():
 
 	return _op_groups
 
+# Returns (precedence, l_to_r) for a binary operator
+# Precedence is the index of the operator's group, so lower values bind more tightly
+
+def get_binary_op_precedence(op_string):
+
+	return _binary_op_precedence[op_string]
+
+def get_op_trie():
+
+	return _op_trie
+
 def get_op_strings():
 
 	return list(_binary_ops.keys()) + list(_prefix_ops.keys())
@@ -229,7 +255,9 @@ def get_prefix_op_class(op_string):
 
 	return _prefix_ops[op_string]
 
+_op_trie = {}
 _binary_ops = {}
+_binary_op_precedence = {}
 _op_groups = []
 _define_op_group(True, ':', [OperatorIndex])
 _define_op_group(True, '**', [OperatorExponent])
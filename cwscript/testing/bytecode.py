@@ -0,0 +1,24 @@
+from cwscript.evaluator.value import *
+from cwscript.evaluator.bytecode_compiler import *
+
+def print_bytecode(code):
+
+	for index, (opcode, arg, line) in enumerate(code.instructions):
+		print(f"{index:>5}  line {line:<5} {OPCODE_NAMES[opcode]:<20} {_format_arg(arg)}")
+	for start, end, target, depth, objects in code.handlers:
+		print(f"handler [{start}, {end}) -> {target} (depth {depth}, objects {objects})")
+
+def _format_arg(arg):
+
+	if (arg is None):
+		return ""
+	elif (isinstance(arg, ScriptValue)):
+		return f"{type(arg).__name__}({arg.to_string(None)})"
+	elif (isinstance(arg, type)):
+		return arg.__name__
+	elif (isinstance(arg, tuple)):
+		return ", ".join([_format_arg(item) for item in arg])
+	elif (callable(arg)):
+		return getattr(arg, '__qualname__', type(arg).__name__)
+	else:
+		return repr(arg)
\ No newline at end of file
@@ -0,0 +1,66 @@
+import io
+import sys
+import time
+import contextlib
+from cwscript.program import Program, ENGINES
+
+# Times each evaluator on a few small loop and function heavy scripts
+# Parsing is done before timing starts, so only evaluation is measured
+# Usage: python -m cwscript.testing.engine_benchmark [repeats] [engines...]
+
+BENCHMARKS = {
+	'while': """
+		.i = 0;
+		.x = 0;
+		while (.i < 20000)
+		{
+			.x = .x + .i * 2;
+			.i += 1;
+		};
+		print .x;
+	""",
+	'for': """
+		.total = 0;
+		for .v in (range 20000)
+		{
+			if (.v % 3 == 0) { continue; };
+			.total += .v;
+		};
+		print .total;
+	""",
+	'calls': """
+		function .fib [.n]
+		{
+			if (.n < 2) { return .n; };
+			return ((call global.fib [.n - 1]) + (call global.fib [.n - 2]));
+		};
+		print (call .fib [16]);
+	"""
+}
+
+def run_benchmark(code, engine, repeats):
+
+	best = None
+	output = None
+	for i in range(repeats):
+		program = Program(code, True, engine = engine)
+		buffer = io.StringIO()
+		start = time.perf_counter()
+		with contextlib.redirect_stdout(buffer):
+			program.run()
+		elapsed = time.perf_counter() - start
+		best = elapsed if (best is None) else min(best, elapsed)
+		output = buffer.getvalue()
+	return output, best
+
+if (__name__ == '__main__'):
+	repeats = int(sys.argv[1]) if (len(sys.argv) > 1) else 3
+	engines = sys.argv[2:] if (len(sys.argv) > 2) else list(ENGINES)
+	for name, code in BENCHMARKS.items():
+		times = {}
+		for engine in engines:
+			output, times[engine] = run_benchmark(code, engine, repeats)
+		baseline = times[engines[0]]
+		print(f"{name}: " + ", ".join(
+			[f"{engine} {elapsed * 1000:.1f} ms ({baseline / elapsed:.1f}x)" for engine, elapsed in times.items()]
+		))
\ No newline at end of file
@@ -0,0 +1,91 @@
+import sys
+import random
+from cwscript.errors import *
+from cwscript.lexer.token import Token
+from cwscript.parser.ast import *
+from cwscript.parser import code_parser
+from cwscript.parser.incremental_parser import IncrementalParser
+
+# Checks that the incremental parser gives the same result as a full parse
+# Each case is a source and a list of (start, end, text) edits applied to it in order
+# Random edits of short sources are checked after the fixed cases
+# Usage: python -m cwscript.testing.incremental_check [trials] [seed]
+
+CASES = [
+
+	# A group left open at the end of the code runs on through any edit after it
+
+	('.a(;\n', [(4, 5, 'print .a;# c\n')]),
+	('if true{if true 3;}(;\n', [(21, 22, ';')]),
+	('print .a.a{.a;', [(14, 14, '{print .a;')]),
+
+	('.a = 1;\nprint .a;\n', [(5, 6, '2'), (0, 0, '\n\n'), (9, 9, ' + 3')]),
+	('print "a;b";\nprint 2;', [(8, 9, '"'), (8, 9, ';')])
+]
+
+_PIECES = ['(', ')', '{', '}', '[', ']', ';', ',', '\n', '# c\n', '"', ' ', ' + ', '.a', '3', 'else', 'if true', 'print .a;']
+
+def check_edits(code, edits):
+
+	parser = IncrementalParser()
+	_try_parse(parser.parse, code)
+	for start, end, text in edits:
+		error = _check_edit(parser, start, end, text)
+		if (error is not None):
+			return error
+	return None
+
+# Makes each edit somewhere in the code as it is after the previous ones
+
+def check_random_edits(rng, count):
+
+	parser = IncrementalParser()
+	for i in range(count):
+		length = len(parser.get_code())
+		start = rng.randint(0, length)
+		end = min(length, start + rng.randrange(4))
+		text = "".join([rng.choice(_PIECES) for j in range(rng.randrange(4))])
+		error = _check_edit(parser, start, end, text)
+		if (error is not None):
+			return error
+	return None
+
+def _check_edit(parser, start, end, text):
+
+	code = parser.get_code()
+	new_code = code[:start] + text + code[end:]
+	expected = _try_parse(code_parser.parse, new_code)
+	result = _try_parse(lambda new_code: parser.edit(start, end, text), new_code)
+	if (result != expected):
+		return f"{code!r} edited at [{start}, {end}) with {text!r}: expected {expected}, got {result}"
+	return None
+
+# Failed parses compare by their error, and leave the previous code in place
+
+def _try_parse(function, code):
+
+	try:
+		return _dump(function(code))
+	except CWError as e:
+		return type(e).__name__
+
+def _dump(node):
+
+	if (isinstance(node, Token)):
+		return ('token', node.type, node.body, node.get_line())
+	elif (isinstance(node, ASTOperation)):
+		return (node.get_operation().__name__, node.get_line(), [(name, _dump(arg)) for name, arg in node.get_args().items()])
+	elif (node.get_dtype() in (ASTNode.TYPE_BLOCK, ASTNode.TYPE_LIST)):
+		return (node.get_dtype(), node.get_line(), [_dump(child) for child in node.get_value()])
+	else:
+		return (node.get_dtype(), node.get_line(), repr(node.get_value()))
+
+if (__name__ == '__main__'):
+	trials = int(sys.argv[1]) if (len(sys.argv) > 1) else 1000
+	rng = random.Random(int(sys.argv[2]) if (len(sys.argv) > 2) else 0)
+	errors = [check_edits(code, edits) for code, edits in CASES]
+	errors += [check_random_edits(rng, 12) for i in range(trials)]
+	failures = [error for error in errors if (error is not None)]
+	for error in failures:
+		print(error)
+	print(f"{len(errors) - len(failures)} of {len(errors)} cases match a full parse")
\ No newline at end of file
@@ -0,0 +1,61 @@
+import io
+import sys
+import gc
+import tracemalloc
+import contextlib
+from cwscript.program import Program
+
+# Measures how much memory the values a few data-heavy scripts leave behind take up
+# Each script builds something with `N` entries and keeps it in a global variable,
+# so the memory still held once it's finished is divided by `N` to get the size of one entry
+# Parsing is done before measuring starts, so only values created while running are counted
+# Usage: python -m cwscript.testing.memory_benchmark [entries] [engine]
+
+BENCHMARKS = {
+	'list of floats': """
+		.l = [];
+		for .i in (range N) { append .l (.i * 0.5); };
+	""",
+	'range': """
+		.l = range N;
+	""",
+	'list of objects': """
+		.l = [];
+		for .i in (range N) { append .l (new { .x = global.i * 0.5; .y = global.i + 1000; }); };
+	""",
+	'object fields': """
+		.o = new {};
+		for .i in (range N) { setd .o (str .i) (.i * 0.5); };
+	""",
+	'list copies': """
+		.source = range 100;
+		.l = [];
+		for .i in (range N) { append .l (copy .source); };
+	""",
+	'unpacked list copies': """
+		.source = range 100;
+		(.source : 0) = "unpacked";
+		(.source : 0) = 0;
+		.l = [];
+		for .i in (range N) { append .l (copy .source); };
+	"""
+}
+
+def run_benchmark(code, entries, engine):
+
+	program = Program(code.replace('N', str(entries)), True, engine = engine)
+	gc.collect()
+	tracemalloc.start()
+	start = tracemalloc.get_traced_memory()[0]
+	with contextlib.redirect_stdout(io.StringIO()):
+		program.run()
+	gc.collect()
+	used = tracemalloc.get_traced_memory()[0] - start
+	tracemalloc.stop()
+	return used / entries
+
+if (__name__ == '__main__'):
+	entries = int(sys.argv[1]) if (len(sys.argv) > 1) else 100000
+	engine = sys.argv[2] if (len(sys.argv) > 2) else 'stack'
+	for name, code in BENCHMARKS.items():
+		print(f"{name}: {run_benchmark(code, entries, engine):.1f} bytes per entry")
\ No newline at end of file
@@ -0,0 +1,91 @@
+import sys
+import time
+import random
+import subprocess
+from cwscript.lexer import code_lexer
+from cwscript.parser import code_parser
+
+# Times the parser on generated expression-heavy code
+# The code is lexed once up front, so only parsing is measured
+# Usage: python -m cwscript.testing.parse_benchmark [statements] [repeats] [--compare path]
+
+# With --compare, the same code is also parsed by the checkout of this repository at `path`,
+# in a separate process, so a change can be timed against the commit before it:
+#   git worktree add /tmp/before <commit>~1
+#   python -m cwscript.testing.parse_benchmark 2000 5 --compare /tmp/before
+# Both sides are timed with `code_parser.parse_tokens(code_lexer.lex(code))`,
+# so the other checkout must be from after parse_tokens() was added
+
+_COMPARE_SCRIPT = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from cwscript.lexer import code_lexer
+from cwscript.parser import code_parser
+tokens = code_lexer.lex(sys.stdin.read())
+best = None
+for i in range(int(sys.argv[2])):
+	start = time.perf_counter()
+	code_parser.parse_tokens(tokens)
+	elapsed = time.perf_counter() - start
+	best = elapsed if (best is None) else min(best, elapsed)
+print(best)
+"""
+
+_BINARY_OPS = ['+', '-', '*', '/', '//', '%', '**', '>', '<', '>=', '<=', '==', '!=', '&&', '||']
+_ASSIGN_OPS = ['=', '+=', '-=', '*=']
+
+def generate_code(statements, seed = 0):
+
+	rng = random.Random(seed)
+	lines = []
+	for i in range(statements):
+		lines.append(f".v{i % 10} {rng.choice(_ASSIGN_OPS)} {_generate_expression(rng, 3)};")
+	return '\n'.join(lines)
+
+def _generate_expression(rng, depth):
+
+	if (depth == 0 or rng.random() < 0.2):
+		return rng.choice(['1', '2.5', '.a', '.b', '-.c', '!.d', 'true', '(len [1, 2])'])
+	parts = [_generate_expression(rng, depth - 1)]
+	for i in range(rng.randint(1, 4)):
+		parts.append(rng.choice(_BINARY_OPS))
+		parts.append(_generate_expression(rng, depth - 1))
+	return '(' + ' '.join(parts) + ')'
+
+def run_benchmark(statements, repeats):
+
+	code = generate_code(statements)
+	tokens = code_lexer.lex(code)
+	best = None
+	for i in range(repeats):
+		start = time.perf_counter()
+		code_parser.parse_tokens(tokens)
+		elapsed = time.perf_counter() - start
+		best = elapsed if (best is None) else min(best, elapsed)
+	return len(tokens), best
+
+# Times the same code with the parser of another checkout
+
+def run_compare(path, statements, repeats):
+
+	result = subprocess.run(
+		[sys.executable, '-c', _COMPARE_SCRIPT, path, str(repeats)],
+		input = generate_code(statements), capture_output = True, text = True, check = True
+	)
+	return float(result.stdout)
+
+if (__name__ == '__main__'):
+	args = sys.argv[1:]
+	compare = None
+	if ('--compare' in args):
+		index = args.index('--compare')
+		compare = args[index + 1]
+		del args[index:index + 2]
+	statements = int(args[0]) if (len(args) > 0) else 2000
+	repeats = int(args[1]) if (len(args) > 1) else 5
+	token_count, best = run_benchmark(statements, repeats)
+	print(f"Parsed {statements} statements ({token_count} tokens)")
+	print(f"Best of {repeats}: {best * 1000:.1f} ms ({token_count / best:,.0f} tokens/s)")
+	if (compare is not None):
+		other = run_compare(compare, statements, repeats)
+		print(f"{compare}: {other * 1000:.1f} ms ({token_count / other:,.0f} tokens/s), {other / best:.2f}x the time of this checkout")
\ No newline at end of file
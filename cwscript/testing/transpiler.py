@@ -0,0 +1,13 @@
+from cwscript.evaluator.transpiler import *
+
+# Prints the source generated by `PythonTranspiler`, with the CWScript line of each line
+# `evaluator` is only used to create constants, so any evaluator will do
+
+def print_transpiled(root, evaluator):
+
+	transpiler = PythonTranspiler(evaluator)
+	transpiler.transpile(root)
+	line_table = transpiler.get_line_table()
+	for index, text in enumerate(transpiler.get_source().split("\n")[:-1]):
+		line = line_table[index + 1]
+		print(f"{index + 1:>5}  {'' if (line is None) else line:<5} {text.expandtabs(4)}")
\ No newline at end of file
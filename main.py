@@ -9,15 +9,19 @@ if (__name__ == '__main__'):
 	# Otherwise, use test file
 
 	if (len(sys.argv) < 2):
-		code = open('test.cw').read()
+		path = 'test.cw'
 		debug = True
 	else:
-		code = open(sys.argv[1]).read()
+		path = sys.argv[1]
 		debug = False
 
-	# Continue execution until evaluator runs out of expressions
+	# The file is streamed into the parser instead of being read up front
+	# Its AST is cached in `__cwcache__` next to it, so later runs can skip parsing
 
-	program = Program(code, debug)
-	while (program.run_next()):
-		pass
+	with open(path) as source:
+		program = Program(source, debug, cache = True)
+
+	# Run until the evaluator runs out of expressions
+
+	program.run()
 	print("[Program finished with exit code %s]" % program.get_exit_code())
\ No newline at end of file